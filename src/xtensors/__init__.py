@@ -1,8 +1,68 @@
-from .base import *
+from types import ModuleType as _ModuleType
 
 from .tensor import *
 
-from .version import __version__
+from .instrument import profile, Profiler, OpEvent, add_hook, remove_hook
+
+
+# Submodules and the functions of .base are loaded on first attribute access
+# (PEP 562), so that `import xtensors` only pays for numpy and the tensor core.
+_LAZY_SUBMODULES = ('base', 'functionals', 'learn', 'bench')
+
+# public names of .base, listed here so that star-imports resolve them
+# through __getattr__ without importing .base up front
+_BASE_NAMES = (
+    'where', 'get_rank',
+    'softmax', 'log_softmax', 'logsumexp', 'cross_entropy',
+    'add', 'divide', 'multiply',
+    'greater', 'greater_equal', 'less', 'less_equal', 'equal',
+    'logical_or', 'logical_and',
+    'all', 'any', 'max', 'min', 'nanmax', 'nanmin',
+    'mean', 'nanmean', 'nanstd', 'nansum', 'std', 'sum',
+    'argmax', 'argmin', 'nanargmax', 'nanargmin',
+    'coordmax', 'coordmin', 'nancoordmax', 'nancoordmin',
+    'argsmin', 'argsmax', 'nanargsmax', 'nanargsmin', 'ArgsFunction',
+    'coordsmin', 'coordsmax', 'nancoordsmax', 'nancoordsmin', 'CoordsFunction',
+    'diagonal',
+    'describe',
+    'topk', 'nantopk', 'TopK',
+    'sort', 'argsort',
+    'cumsum', 'cumprod', 'cummax', 'cummin', 'nancumsum', 'ScanFunction',
+    'compile', 'CompiledOp',
+    'quantile', 'nanquantile', 'median', 'nanmedian', 'QuantileSketch',
+    'cos', 'cosh', 'exp', 'log', 'log2', 'log10', 'sigmoid', 'sin', 'sinh', 'tan', 'tanh',
+)
+
+__all__ = [name for name, value in globals().items()
+           if not name.startswith('_') and not isinstance(value, _ModuleType)]
+__all__ += ['__version__', 'base', 'functionals', *_BASE_NAMES]
+
+
+def __getattr__(name: str):
+    import importlib
+
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+
+    if name == '__version__':
+        from .version import __version__
+        globals()['__version__'] = __version__
+        return __version__
+
+    if not name.startswith('__'):
+        base = importlib.import_module('.base', __name__)
+        try:
+            value = getattr(base, name)
+        except AttributeError: pass
+        else:
+            globals()[name] = value
+            return value
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_SUBMODULES))
 
 
 
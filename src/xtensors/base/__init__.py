@@ -1,5 +1,7 @@
 
-from ._misc import where, softmax, get_rank
+from ._misc import where, get_rank
+
+from ._activations import softmax, log_softmax, logsumexp, cross_entropy
 
 from ._binary_op import (
     _add as add,
@@ -51,6 +53,18 @@ from ._coords import (coordsmin, coordsmax, nancoordsmax, nancoordsmin, CoordsFu
 
 from ._reduc_2to1 import diagonal
 
+from ._describe import describe
+
+from ._topk import topk, nantopk, TopK
+
+from ._sort import sort, argsort
+
+from ._scan import cumsum, cumprod, cummax, cummin, nancumsum, ScanFunction
+
+from ._compile import compile, CompiledOp
+
+from ._quantile import quantile, nanquantile, median, nanmedian, QuantileSketch
+
 from ._ufuncs import cos, cosh, exp, log, log2, log10, sigmoid, sin, sinh, tan, tanh 
 
 
@@ -0,0 +1,170 @@
+from __future__ import annotations
+'''
+Activations and losses over a named dimension, computed in place with the
+inputs shifted by their maximum along that dimension.
+'''
+import numpy as np
+import numpy.typing as npt
+
+from .. import tensor as xtt
+from ..tensor import _precision
+from ..tensor._out import check_out, wrap_out
+from ..instrument import instrumented, kernel
+
+
+def _floating(x: npt.NDArray) -> npt.NDArray:
+    if x.dtype.kind != 'f':
+        return x.astype(np.float64)
+    return x
+
+
+def _accumulator(dtype: np.dtype) -> np.dtype|None:
+    # sums of exponentials overflow float16 beyond 65504 elements
+    acc = _precision.accumulator(dtype)
+    if acc is None and dtype == np.float16: return np.dtype(np.float32)
+    return acc
+
+
+def _shift(x: npt.NDArray, axis: int) -> npt.NDArray:
+    m = x.max(axis=axis, keepdims=True)
+    # slices that are entirely -inf (or contain inf/nan) are not shifted
+    m[~np.isfinite(m)] = 0
+    return m
+
+
+def _logsumexp(x: npt.NDArray, axis: int, out: npt.NDArray|None=None) -> npt.NDArray:
+    x = _floating(x)
+    m = _shift(x, axis)
+
+    scratch = np.subtract(x, m)
+    np.exp(scratch, out=scratch)
+    s = scratch.sum(axis=axis, dtype=_accumulator(x.dtype))
+
+    with np.errstate(divide='ignore'):
+        np.log(s, out=s)
+    s += m.squeeze(axis)
+    if out is None: return s.astype(x.dtype, copy=False)
+    out[...] = s
+    return out
+
+
+def _log_softmax(x: npt.NDArray, axis: int, out: npt.NDArray|None=None) -> npt.NDArray:
+    if out is None: x = _floating(x)
+
+    y = np.subtract(x, _shift(x, axis), out=out)
+    s = np.exp(y).sum(axis=axis, keepdims=True, dtype=_accumulator(y.dtype))
+    np.log(s, out=s)
+    y -= s.astype(y.dtype, copy=False)
+    return y
+
+
+def _softmax(x: npt.NDArray, axis: int, out: npt.NDArray|None=None) -> npt.NDArray:
+    if out is None: x = _floating(x)
+
+    y = np.subtract(x, _shift(x, axis), out=out)
+    np.exp(y, out=y)
+    y /= y.sum(axis=axis, keepdims=True, dtype=_accumulator(y.dtype)).astype(y.dtype, copy=False)
+    return y
+
+
+def _cross_entropy(x: npt.NDArray, labels: npt.NDArray, axis: int, out: npt.NDArray|None=None) -> npt.NDArray:
+    # labels are broadcast against x without the class axis
+    index = np.expand_dims(labels, axis)
+    picked = np.take_along_axis(x, index, axis=axis).squeeze(axis)
+
+    lse = _logsumexp(x, axis)
+    return np.subtract(lse, picked, out=out)
+
+
+_np_logsumexp = kernel(_logsumexp)
+_np_log_softmax = kernel(_log_softmax)
+_np_softmax = kernel(_softmax)
+_np_cross_entropy = kernel(_cross_entropy)
+
+
+def _apply_along(_np_func, X: xtt.XTensor, dim: xtt.DimLike, out: xtt.XTensor|np.ndarray|None) -> xtt.XTensor:
+    axis = X.get_axis(dim)
+    _out = check_out(out, X.shape, X.dims, X.coords)
+
+    _y = _np_func(_precision.store(X.data), axis=axis, out=_out)
+
+    if out is not None:
+        return wrap_out(out, _out, X.dims, X.coords)
+    return xtt.XTensor._derive(_y, X.dims, X.coords)
+
+
+@instrumented('softmax')
+@xtt.generalize_at_0
+def softmax(X: xtt.XTensor, /, dim: xtt.DimLike, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+    r'''
+    :return: :math:`\exp(x_i) / \sum_\mathrm{dim} \exp(x_j)`
+    '''
+    return _apply_along(_np_softmax, X, dim, out)
+
+
+@instrumented('log_softmax')
+@xtt.generalize_at_0
+def log_softmax(X: xtt.XTensor, /, dim: xtt.DimLike, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+    r'''
+    :return: :math:`x_i - \ln \sum_\mathrm{dim} \exp(x_j)`, computed without
+            evaluating the softmax itself
+    '''
+    return _apply_along(_np_log_softmax, X, dim, out)
+
+
+@instrumented('logsumexp')
+@xtt.generalize_at_0
+def logsumexp(X: xtt.XTensor, /, dim: xtt.DimLike, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+    r'''
+    :return: :math:`\ln \sum_\mathrm{dim} \exp(x)`, with :code:`dim` reduced
+    '''
+    axis = X.get_axis(dim)
+    dims, coords = xtt.strip(X.dims, [axis]), xtt.strip(X.coords, [axis])
+    _out = check_out(out, xtt.strip(X.shape, [axis]), dims, coords)
+
+    _y = _np_logsumexp(_precision.store(X.data), axis=axis, out=_out)
+
+    if out is not None:
+        return wrap_out(out, _out, dims, coords)
+    return xtt.XTensor._derive(_y, dims, coords)
+
+
+@instrumented('cross_entropy')
+@xtt.generalize_at_1
+@xtt.generalize_at_0
+def cross_entropy(logits: xtt.XTensor, labels: xtt.XTensor, /, dim: xtt.DimLike, *,
+        out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+    r'''
+    Cross entropy between the softmax of :code:`logits` over :code:`dim` and
+    integer class labels, :math:`\ln \sum_\mathrm{dim} \exp(x_j) - x_\mathrm{label}`.
+
+    :param logits: unnormalized log-probabilities
+    :param labels: integer tensor of class indices, broadcast against
+            :code:`logits` without :code:`dim`
+    :param dim: the class dimension
+
+    :return: the loss for each sample, with :code:`dim` reduced
+
+    '''
+    if labels.data.dtype.kind not in 'iu':
+        raise TypeError(f'Labels should be integers, but received {labels.data.dtype}')
+
+    axis = logits.get_axis(dim)
+
+    # samples without the class dimension, a view of the logits
+    samples = logits.get(axis, 0)
+    _labels = xtt.cast(xtt.unilateral_broadcaster, samples, labels)
+
+    l = _labels.data
+    if l.size and (l.min() < 0 or l.max() >= logits.shape[axis]):
+        raise ValueError(f'Labels should be in [0, {logits.shape[axis]}), '
+                         f'but received values in [{l.min()}, {l.max()}]')
+
+    dims, coords = samples.dims, samples.coords
+    _out = check_out(out, samples.shape, dims, coords)
+
+    _y = _np_cross_entropy(_precision.store(logits.data), l, axis=axis, out=_out)
+
+    if out is not None:
+        return wrap_out(out, _out, dims, coords)
+    return xtt.XTensor._derive(_y, dims, coords)
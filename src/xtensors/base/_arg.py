@@ -8,6 +8,9 @@ import numpy as np
 import numpy.typing as npt
 from .. import tensor as xtt
 from ..tensor import XTensor
+from ..tensor._out import check_out, wrap_out
+from ..tensor._categorical import take_coord
+from ..instrument import instrumented, kernel
 
 '''
 Arg functions:
@@ -17,10 +20,11 @@ Arg functions:
 '''
 
 class _np_arg_func(Protocol):
-    def __call__(self, a: np.ndarray, axis: int) -> npt.NDArray[np.int_]: ...
+    def __call__(self, a: np.ndarray, axis: int, out: np.ndarray|None=None) -> npt.NDArray[np.int_]: ...
 
 class ArgFunction(Protocol):
-    def __call__(self, x: xtt.TensorLike, /, dim: xtt.DimLike) -> xtt.XTensor: ...
+    def __call__(self, x: xtt.TensorLike, /, dim: xtt.DimLike, *,
+                 out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor: ...
 
 class CoordFunction(Protocol):
     def __call__(self, x: xtt.TensorLike, /, dim: xtt.DimLike, *, 
@@ -28,13 +32,27 @@ class CoordFunction(Protocol):
 
 
 def _reduction_factory(_np_func: _np_arg_func) -> ArgFunction:
+    _kernel = kernel(_np_func)
+
+    @instrumented(_np_func.__name__)
     @xtt.generalize_at_0
-    def _reduce(X: xtt.XTensor, /, dim: xtt.DimLike) -> xtt.XTensor:
+    def _reduce(X: xtt.XTensor, /, dim: xtt.DimLike, *,
+                out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
         axis = X.get_axis(dim)
-        return xtt.XTensor(
-                _np_func(X.data, axis=axis),
-                dims=xtt.strip(X.dims, [axis]),
-                coords=xtt.strip(X.coords, [axis]))
+
+        if isinstance(X, xtt.MaskedXTensor):
+            if out is not None:
+                raise NotImplementedError('out= is not supported for MaskedXTensor')
+            return X.arg(_np_func, axis)
+
+        dims, coords = xtt.strip(X.dims, [axis]), xtt.strip(X.coords, [axis])
+        _out = check_out(out, xtt.strip(X.shape, [axis]), dims, coords)
+
+        _y = _kernel(X.data, axis=axis, out=_out)
+
+        if out is not None:
+            return wrap_out(out, _out, dims, coords)
+        return xtt.XTensor._derive(_y, dims, coords)
     return _reduce
 
 
@@ -43,7 +61,8 @@ def _inject_docs(r: ArgFunction, doc: str):
     return r
 
 def _inject_sig(r: ArgFunction):
-    def _dummy(x: xtt.TensorLike, /, dim: xtt.DimLike|xtt.DimsLike|None) -> XTensor:
+    def _dummy(x: xtt.TensorLike, /, dim: xtt.DimLike, *,
+               out: XTensor|np.ndarray|None=None) -> XTensor:
         ...
     _dummy.__doc__ = r.__doc__
     return wraps(_dummy)(r)
@@ -65,7 +84,8 @@ _nanargmax = _reduction_factory(np.nanargmax)
 _nanargmin = _reduction_factory(np.nanargmin)
 
 
-def _coord_reduc_factory(_func: ArgFunction) -> CoordFunction:
+def _coord_reduc_factory(_func: ArgFunction, name: str) -> CoordFunction:
+    @instrumented(name)
     @xtt.generalize_at_0
     def _reduce(X: xtt.XTensor, /, dim: xtt.DimLike, *, use_index_if_no_coord: bool=False) -> xtt.XTensor:
         '''
@@ -78,20 +98,21 @@ def _coord_reduc_factory(_func: ArgFunction) -> CoordFunction:
 
         if coord is None: 
             if use_index_if_no_coord:
-                coord_r = np.arange(X.shape[axis])[args]
+                coord = np.arange(X.shape[axis])
             else:
                 raise ValueError(f'Tensor has no coordinates on axis {axis}')
-        else:
-            coord_r = coord[args]
 
-        return xtt.XTensor(coord_r, dims=xtt.strip(X.dims, [axis]), coords=xtt.strip(X.coords, [axis]))
+        Y = take_coord(coord, args.data, xtt.strip(X.dims, [axis]), xtt.strip(X.coords, [axis]))
+        if isinstance(args, xtt.MaskedXTensor):
+            return xtt.MaskedXTensor._wrap(Y, args.mask)
+        return Y
     return _reduce
 
 
-_coordmax = _coord_reduc_factory(_argmax)
-_coordmin = _coord_reduc_factory(_argmin)
+_coordmax = _coord_reduc_factory(_argmax, 'coordmax')
+_coordmin = _coord_reduc_factory(_argmin, 'coordmin')
 
-_nancoordmax = _coord_reduc_factory(_nanargmax)
-_nancoordmin = _coord_reduc_factory(_nanargmin)
+_nancoordmax = _coord_reduc_factory(_nanargmax, 'nancoordmax')
+_nancoordmin = _coord_reduc_factory(_nanargmin, 'nancoordmin')
 
 
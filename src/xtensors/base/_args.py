@@ -17,6 +17,7 @@ from .. import numpy as xtnp
 from .. import tensor as xtt
 
 from ..tensor import XTensor, TensorLike, DimLike, DimsLike
+from ..instrument import instrumented, kernel
 
 
 ARGS_DIM = 'ARGS_DIM'
@@ -41,6 +42,9 @@ class ArgsFunction(Protocol):
 
 
 def _reduction_factory(_func: _args_func) -> ArgsFunction:
+    _kernel = kernel(_func)
+
+    @instrumented(_func.__name__)
     @xtt.generalize_at_0
     def _reduce(X: xtt.XTensor, /, dim: xtt.DimsLike) -> xtt.XTensor:
         '''
@@ -54,7 +58,7 @@ def _reduction_factory(_func: _args_func) -> ArgsFunction:
         new_dims = r_dims + [ARGS_DIM]
         new_coords = r_coords + [[dim for dim in s_dims]]
 
-        args = _func(X.data, axes=axes)
+        args = _kernel(X.data, axes=axes)
         return xtt.XTensor(args, dims=new_dims, coords=new_coords)
     return _reduce
 
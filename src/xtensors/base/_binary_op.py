@@ -3,6 +3,7 @@ from functools import wraps
 from textwrap import dedent
 
 from .. import tensor as xtt
+from ..instrument import instrumented
 
 from ..tensor import XTensor, TensorLike
 
@@ -33,7 +34,8 @@ def _apply_operation(X: xtt.XTensor, Y: xtt.XTensor, binop: str, rbinop: Optiona
     return Z
 
 
-def _binop_factory(_bin_op: str, _rbin_op: str) -> BinaryOperation:
+def _binop_factory(name: str, _bin_op: str, _rbin_op: str) -> BinaryOperation:
+    @instrumented(name)
     @xtt.generalize_at_1
     @xtt.generalize_at_0
     def _op(X: xtt.XTensor, Y: xtt.XTensor, /) -> xtt.XTensor:
@@ -69,21 +71,21 @@ def postproc(operation: str):
 
     return _postproc
 
-_add = postproc('x + y')(_binop_factory('__add__', '__radd__'))
+_add = postproc('x + y')(_binop_factory('add', '__add__', '__radd__'))
 
-_divide = postproc('x / y')(_binop_factory('__truediv__', '__rtruediv__'))
+_divide = postproc('x / y')(_binop_factory('divide', '__truediv__', '__rtruediv__'))
 
-_multiply = postproc('xy')(_binop_factory('__mul__', '__rmul__'))
+_multiply = postproc('xy')(_binop_factory('multiply', '__mul__', '__rmul__'))
 
-_greater = postproc('x > y')(_binop_factory('__gt__', '__lt__'))
+_greater = postproc('x > y')(_binop_factory('greater', '__gt__', '__lt__'))
 
-_greater_equal = postproc(r'x \ge y')(_binop_factory('__ge__', '__le__'))
+_greater_equal = postproc(r'x \ge y')(_binop_factory('greater_equal', '__ge__', '__le__'))
 
-_less = postproc(r'x < y')(_binop_factory('__lt__', '__gt__'))
+_less = postproc(r'x < y')(_binop_factory('less', '__lt__', '__gt__'))
 
-_less_equal = postproc(r'x \le y')(_binop_factory('__le__', '__ge__'))
+_less_equal = postproc(r'x \le y')(_binop_factory('less_equal', '__le__', '__ge__'))
 
-_equal = postproc(r'x = y')(_binop_factory('__eq__', '__eq__'))
+_equal = postproc(r'x = y')(_binop_factory('equal', '__eq__', '__eq__'))
 
 
 def _np_or(X: npt.NDArray, Y: npt.NDArray) -> npt.NDArray:
@@ -96,18 +98,20 @@ def _np_and(X: npt.NDArray, Y: npt.NDArray) -> npt.NDArray:
 
 
 _or = postproc(r'x\;\mathrm{or}\;y')(
+        instrumented('logical_or')(
         xtt.generalize_at_0(
         xtt.generalize_at_1(
         xtt.promote_binary_operator(xtt.vanilla_broadcaster)(
             _np_or
-))))
+)))))
 
 
 _and = postproc(r'x\;\mathrm{and}\;y')(
+        instrumented('logical_and')(
         xtt.generalize_at_0(
         xtt.generalize_at_1(
         xtt.promote_binary_operator(xtt.vanilla_broadcaster)(
             _np_and
-))))
+)))))
 
 
@@ -0,0 +1,167 @@
+from __future__ import annotations
+'''
+Compiled operations:
+    compile resolves the axes, output dims and result metadata of an
+    operation once for a given input layout. The returned callable checks
+    that its input has that layout and calls the NumPy kernel, building the
+    result without going through get_axis, strip and the generalization
+    decorators on every call.
+'''
+from typing import Any, Callable, Dict, NamedTuple, Protocol, Sequence
+
+import numpy as np
+
+from .. import tensor as xtt
+from ..tensor import _memory, _precision
+from ..tensor._out import check_out, wrap_out
+from ..instrument import instrumented
+
+from . import _arg, _reduc, _scan
+
+
+class CompiledOp(Protocol):
+    def __call__(self, x: xtt.XTensor, /, *,
+                 out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor: ...
+
+
+class _Spec(NamedTuple):
+    name: str
+    kind: str
+    """:code:`reduction` (over several dims), :code:`arg` (over one dim) or :code:`scan`"""
+    func: Callable[..., Any]
+    acc_func: Callable[..., Any]|None=None
+    """called with the accumulator dtype of the precision policy, if set"""
+
+
+_SPECS: Dict[Callable[..., Any], _Spec] = {
+    _reduc._sum: _Spec('sum', 'reduction', np.sum, np.sum),
+    _reduc._mean: _Spec('mean', 'reduction', np.mean, np.mean),
+    _reduc._std: _Spec('std', 'reduction', np.std, _reduc._blocked_std),
+    _reduc._nansum: _Spec('nansum', 'reduction', np.nansum, np.nansum),
+    _reduc._nanmean: _Spec('nanmean', 'reduction', np.nanmean, np.nanmean),
+    _reduc._nanstd: _Spec('nanstd', 'reduction', np.nanstd, _reduc._nanblocked_std),
+    _reduc._max: _Spec('max', 'reduction', np.max),
+    _reduc._min: _Spec('min', 'reduction', np.min),
+    _reduc._nanmax: _Spec('nanmax', 'reduction', np.nanmax),
+    _reduc._nanmin: _Spec('nanmin', 'reduction', np.nanmin),
+    _reduc._all: _Spec('all', 'reduction', np.all),
+    _reduc._any: _Spec('any', 'reduction', np.any),
+
+    _arg._argmax: _Spec('argmax', 'arg', np.argmax),
+    _arg._argmin: _Spec('argmin', 'arg', np.argmin),
+    _arg._nanargmax: _Spec('nanargmax', 'arg', np.nanargmax),
+    _arg._nanargmin: _Spec('nanargmin', 'arg', np.nanargmin),
+
+    _scan.cumsum: _Spec('cumsum', 'scan', np.cumsum, np.cumsum),
+    _scan.cumprod: _Spec('cumprod', 'scan', np.cumprod, np.cumprod),
+    _scan.cummax: _Spec('cummax', 'scan', np.maximum.accumulate),
+    _scan.cummin: _Spec('cummin', 'scan', np.minimum.accumulate),
+    _scan.nancumsum: _Spec('nancumsum', 'scan', np.nancumsum, np.nancumsum),
+}
+
+_SPECS_BY_NAME = {spec.name: spec for spec in _SPECS.values()}
+
+
+def _spec(op: Callable[..., Any]|str) -> _Spec:
+    try:
+        return _SPECS_BY_NAME[op] if isinstance(op, str) else _SPECS[op]
+    except (KeyError, TypeError):
+        raise ValueError(f'Cannot compile {getattr(op, "__name__", op)}, expected one of '
+                         f'{sorted(_SPECS_BY_NAME)}') from None
+
+
+def compile(op: Callable[..., Any]|str, /, input_dims: Sequence[str|None], *,
+        dim: xtt.DimLike|xtt.DimsLike|None=None, reverse: bool=False) -> CompiledOp:
+    r"""
+    Resolve :code:`op` once for inputs with dimensions :code:`input_dims`,
+    e.g. in a loop over small tensors:
+
+    .. code-block:: python
+
+        total = xt.compile(xt.sum, ['batch', 'H', 'W'], dim='H')
+        for X in batches:
+            Y = total(X)
+
+    The returned callable only checks that the dims of its input are
+    :code:`input_dims` before calling NumPy. Its results are the same as
+    those of :code:`op`, but their metadata are not validated again, as with
+    the validation level :code:`boundary`.
+
+    :param op: a reduction (e.g. :py:func:`xtensors.sum`), an arg function
+            (e.g. :py:func:`xtensors.argmax`) or a scan (e.g.
+            :py:func:`xtensors.cumsum`), or its name
+    :param input_dims: dimension names of the inputs
+    :param dim: dimension(s) of the operation, all of them by default for
+            reductions
+    :param reverse: for scans, same as in :py:func:`xtensors.cumsum`
+
+    :return: a callable taking an :py:class:`xtensors.XTensor` and an
+            optional :code:`out` buffer
+
+    """
+    spec = _spec(op)
+    input_dims = list(input_dims)
+    rank = len(input_dims)
+
+    # a template of the layout, so that dims are resolved as by the op itself
+    template = xtt.XTensor(np.empty((0,) * rank), input_dims)
+
+    if spec.kind == 'reduction':
+        axes = tuple(template.get_axes(dim))
+    else:
+        if dim is None:
+            raise ValueError(f'{spec.name} needs a dimension')
+        axes = (template.get_axis(dim),)
+
+    if spec.kind == 'scan':
+        kept = list(range(rank))
+    else:
+        kept = [axis for axis in range(rank) if axis not in axes]
+    out_dims = [input_dims[axis] for axis in kept]
+    dim_axis_dict = {d: axis for axis, d in enumerate(out_dims) if d is not None}
+
+    func, acc_func = spec.func, spec.acc_func
+    axis: Any = axes if spec.kind == 'reduction' else axes[0]
+    flip = spec.kind == 'scan' and reverse
+    store = spec.kind != 'arg'
+
+    def _wrap(data: Any, coords: list) -> xtt.XTensor:
+        Y = xtt.XTensor.__new__(xtt.XTensor)
+        Y.data = data if type(data) is np.ndarray else np.asarray(data)
+        Y._dims = out_dims.copy()
+        Y._coords = coords
+        Y._dim_axis_dict = dim_axis_dict.copy()
+        if _memory._registry is not None: _memory._register(Y)
+        return Y
+
+    def compiled(X: xtt.XTensor, /, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+        if type(X) is not xtt.XTensor or X._dims != input_dims:
+            raise ValueError(f'Compiled {spec.name} expects an XTensor with dims {tuple(input_dims)}, '
+                             f'received {getattr(X, "dims", type(X))}')
+
+        a = X.data
+        coords = [X._coords[axis] for axis in kept]
+        buffer = None
+        if out is not None:
+            buffer = check_out(out, [a.shape[axis] for axis in kept], out_dims, coords)
+
+        _out = buffer
+        if flip:
+            a = np.flip(a, axis=axis)
+            if buffer is not None: _out = np.flip(buffer, axis=axis)
+
+        acc = _precision.accumulator(a.dtype) if acc_func is not None else None
+        if acc is None:
+            y = func(a, axis=axis, out=_out)
+        else:
+            y = acc_func(a, axis=axis, dtype=acc, out=_out)
+
+        if out is not None:
+            return wrap_out(out, buffer, out_dims, coords)
+
+        if flip: y = np.flip(y, axis=axis)
+        return _wrap(_precision.store(y, X.data.dtype) if store else y, coords)
+
+    compiled.__name__ = f'compiled_{spec.name}'
+    compiled.__doc__ = f'{spec.name} compiled for dims {tuple(input_dims)}'
+    return instrumented(f'compiled.{spec.name}')(compiled)
@@ -17,6 +17,7 @@ from .. import numpy as xtnp
 from .. import tensor as xtt
 
 from ..tensor import XTensor, TensorLike, DimLike, DimsLike
+from ..instrument import instrumented
 
 
 from ._args import ArgsFunction, argsmin, argsmax, nanargsmin, nanargsmax
@@ -39,7 +40,8 @@ class CoordsFunction(Protocol):
         ...
 
 
-def _coord_reduc_factory(_func: ArgsFunction) -> CoordsFunction:
+def _coord_reduc_factory(_func: ArgsFunction, name: str) -> CoordsFunction:
+    @instrumented(name)
     @xtt.generalize_at_0
     def _reduce(X: xtt.XTensor, /, dim: xtt.DimsLike, *, use_index_if_no_coord: bool=False) -> xtt.XTensor:
         '''
@@ -63,10 +65,17 @@ def _coord_reduc_factory(_func: ArgsFunction) -> CoordsFunction:
                 coord_ = coord
 
 
-            coords_r.append(coord_[args.data[...,i]])
+            coords_r.append(coord_)
+
+        # categorical coordinates stay codes, in the union of their tables
+        if all(isinstance(coord, xtt.CategoricalCoord) for coord in coords_r):
+            categories = xtt.CategoricalCoord.union(coords_r)
+            codes = [coord.recode(categories)[args.data[...,i]] for i, coord in enumerate(coords_r)]
+            return xtt.CategoricalXTensor(np.stack(codes, axis=-1), categories,
+                    dims=args.dims, coords=args.coords)
 
         return xtt.XTensor(
-                np.stack(coords_r, axis=-1),
+                np.stack([coord[args.data[...,i]] for i, coord in enumerate(coords_r)], axis=-1),
                 dims=args.dims, 
                 coords=args.coords)
 
@@ -93,18 +102,18 @@ def postproc(doc: str):
 
 coordsmin = postproc("""
                      Return the coordinates where minima occur
-                     """)(_coord_reduc_factory(argsmin))
+                     """)(_coord_reduc_factory(argsmin, 'coordsmin'))
 
 coordsmax = postproc("""
                      Return the coordinates where maxima occur
-                     """)(_coord_reduc_factory(argsmax))
+                     """)(_coord_reduc_factory(argsmax, 'coordsmax'))
 
 nancoordsmin = postproc("""
                         Similar to :py:func:`coordsmin`, but with :code:`nan` ignored
-                        """)(_coord_reduc_factory(nanargsmin))
+                        """)(_coord_reduc_factory(nanargsmin, 'nancoordsmin'))
 
 nancoordsmax = postproc("""
                         Similar to :py:func:`coordsmax`, but with :code:`nan` ignored
-                        """)(_coord_reduc_factory(nanargsmax))
+                        """)(_coord_reduc_factory(nanargsmax, 'nancoordsmax'))
 
 
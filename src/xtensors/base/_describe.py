@@ -0,0 +1,202 @@
+from __future__ import annotations
+'''
+Several summary statistics over the same dims, computed in a single pass:
+the input is visited in blocks of about _BLOCK elements, each block is
+reduced while it is still in cache, and the partial moments of blocks along
+a reduced axis are merged with the pairwise update of Chan et al.
+'''
+from math import prod
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .. import tensor as xtt
+from ..tensor import _precision
+from ..tensor._masked import _extreme
+from ..instrument import instrumented, kernel
+
+
+STATS = ('mean', 'std', 'var', 'min', 'max', 'count', 'sum')
+
+_BLOCK = 2**14
+
+
+def _describe(a: npt.NDArray, axes: Tuple[int,...], stats: Sequence[str], nan: bool=False,
+        where: npt.NDArray[np.bool_]|None=None, stack: bool=False) -> Dict[str, npt.NDArray]|npt.NDArray:
+    """
+    :param where: entries to include, in addition to non-NaN entries if :code:`nan`
+    :param stack: return a single array with the statistics along a new first axis
+    :return: the requested statistics, with the reduced axes kept as length 1
+    """
+    kept = [axis for axis in range(a.ndim) if axis not in axes]
+
+    # blocks along the longest kept axis are reduced independently
+    axis = max(kept, key=lambda axis: a.shape[axis]) if kept else None
+    length = a.shape[axis] if kept else 1
+    step = max(1, _BLOCK * length // max(a.size, 1))
+
+    if step >= length:
+        res = _describe_block(a, axes, stats, nan, where)
+        if not stack: return res
+        dtype = np.result_type(*res.values())
+        return np.stack([r.astype(dtype, copy=False) for r in res.values()])
+
+    shape = tuple(1 if i in axes else l for i, l in enumerate(a.shape))
+    res = dict()
+    for start in range(0, length, step):
+        key = tuple(slice(start, start+step) if i == axis else slice(None) for i in range(a.ndim))
+        res_b = _describe_block(a[key], axes, stats, nan, None if where is None else where[key])
+
+        if not res:
+            # the results are written block by block into preallocated arrays
+            if stack:
+                buffer = np.empty((len(stats),) + shape, dtype=np.result_type(*res_b.values()))
+                res = {stat: buffer[i] for i, stat in enumerate(stats)}
+            else:
+                res = {stat: np.empty(shape, dtype=r.dtype) for stat, r in res_b.items()}
+
+        for stat, r in res_b.items():
+            res[stat][key] = r
+
+    return buffer if stack else res
+
+
+def _describe_block(a: npt.NDArray, axes: Tuple[int,...], stats: Sequence[str], nan: bool,
+        where: npt.NDArray[np.bool_]|None) -> Dict[str, npt.NDArray]:
+    acc = _precision.accumulator(a.dtype) or (a.dtype if a.dtype.kind in 'fc' else np.dtype(np.float64))
+    # integer sums stay exact, as with np.sum
+    sum_dtype = acc if a.dtype.kind in 'fc' else None
+    masked = where is not None or (nan and a.dtype.kind in 'fc')
+
+    moments = {'mean', 'std', 'var'} & set(stats)
+    total = 'sum' in stats or bool(moments)
+
+    # blocks along the longest reduced axis, of about _BLOCK elements
+    axis = max(axes, key=lambda axis: a.shape[axis])
+    length = a.shape[axis]
+    step = max(1, _BLOCK * length // max(a.size, 1))
+
+    n = s = mean = m2 = lo = hi = None
+    for start in range(0, max(length, 1), step):
+        key = tuple(slice(start, start+step) if i == axis else slice(None) for i in range(a.ndim))
+        b = a[key]
+
+        if masked:
+            valid = np.ones(b.shape, dtype=bool) if where is None else np.array(where[key])
+            if nan and a.dtype.kind in 'fc': valid &= ~np.isnan(b)
+            n_b = np.count_nonzero(valid, axis=axes, keepdims=True)
+        else:
+            valid = True
+            n_b = prod(b.shape[i] for i in axes)
+
+        if total:
+            s_b = np.sum(b, axis=axes, keepdims=True, dtype=sum_dtype, where=valid)
+        if moments:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean_b = s_b / np.maximum(n_b, 1)
+            d = np.subtract(b, mean_b, dtype=acc)
+            if masked: np.copyto(d, 0, where=~valid)
+            d *= d
+            m2_b = d.sum(axis=axes, keepdims=True)
+        if 'min' in stats:
+            lo_b = np.minimum.reduce(b, axis=axes, keepdims=True, where=valid,
+                                     initial=_extreme(a.dtype, largest=True))
+        if 'max' in stats:
+            hi_b = np.maximum.reduce(b, axis=axes, keepdims=True, where=valid,
+                                     initial=_extreme(a.dtype, largest=False))
+
+        if n is None:
+            n = n_b
+            if total: s = s_b
+            if moments: mean, m2 = mean_b, m2_b
+            if 'min' in stats: lo = lo_b
+            if 'max' in stats: hi = hi_b
+            continue
+
+        if moments:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                merged = n + n_b
+                delta = mean_b - mean
+                ratio = np.where(merged > 0, n_b / np.maximum(merged, 1), 0)
+                mean += delta * ratio
+                m2 += m2_b + delta**2 * n * ratio
+        n = n + n_b
+        if total: s += s_b
+        if 'min' in stats: np.minimum(lo, lo_b, out=lo)
+        if 'max' in stats: np.maximum(hi, hi_b, out=hi)
+
+    shape = tuple(1 if i in axes else l for i, l in enumerate(a.shape))
+    count = np.broadcast_to(np.asarray(n, dtype=np.intp), shape)
+
+    # without any entry, float statistics are NaN; the min and max of
+    # integers are left at the extremes of their dtype
+    empty = count == 0
+    res: Dict[str, npt.NDArray] = dict()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for stat in stats:
+            if stat == 'count': res[stat] = _precision.count(np.array(count))
+            elif stat == 'sum': res[stat] = s
+            elif stat == 'min': res[stat] = lo
+            elif stat == 'max': res[stat] = hi
+            elif stat == 'mean': res[stat] = mean
+            elif stat == 'var': res[stat] = m2 / count
+            elif stat == 'std': res[stat] = np.sqrt(m2 / count)
+
+            if stat in ('mean', 'min', 'max') and res[stat].dtype.kind == 'f' and empty.any():
+                res[stat] = np.where(empty, np.nan, res[stat])
+    return res
+
+
+_np_describe = kernel(_describe)
+
+
+@instrumented('describe')
+@xtt.generalize_at_0
+def describe(X: xtt.XTensor, /,
+        dim: xtt.DimLike|xtt.DimsLike|None=None,
+        stats: Sequence[str]=('mean', 'std', 'min', 'max', 'count'), *,
+        nan: bool=False, as_dict: bool=False, stat_dim: str='stat',
+        ) -> xtt.XTensor|Dict[str, xtt.XTensor]:
+    r"""
+    Compute several statistics over the same dims in one pass over the data,
+    instead of one pass per statistic.
+
+    :param X: target tensor, a :py:class:`xtensors.MaskedXTensor` skips its
+            invalid entries
+    :param dim: dimension(s) to reduce, all of them by default
+    :param stats: any of :code:`mean`, :code:`std`, :code:`var`, :code:`min`,
+            :code:`max`, :code:`count` and :code:`sum`
+    :param nan: if :code:`True`, NaN entries are skipped as in
+            :py:func:`xtensors.nanmean`
+    :param as_dict: if :code:`True`, return a dict of tensors, each with its
+            own dtype
+    :param stat_dim: name of the dimension indexing the statistics
+
+    :return: an :py:class:`xtensors.XTensor` with the dimension
+            :code:`stat_dim` on the left, whose coordinates are :code:`stats`,
+            or a dict mapping each statistic to an :py:class:`xtensors.XTensor`
+
+    """
+    stats = list(stats)
+    unknown = [stat for stat in stats if stat not in STATS]
+    if unknown:
+        raise ValueError(f'Unknown statistics {unknown}, expected any of {STATS}')
+
+    if isinstance(X, xtt.SparseXTensor):
+        raise NotImplementedError('describe is not supported for SparseXTensor, call todense() first')
+
+    axes = tuple(X.get_axes(dim))
+    if not axes:
+        raise ValueError('describe needs at least one dimension to reduce')
+    dims, coords = xtt.strip(X.dims, axes), xtt.strip(X.coords, axes)
+    where = X.mask if isinstance(X, xtt.MaskedXTensor) else None
+
+    if as_dict:
+        res = _np_describe(X.data, axes, stats, nan=nan, where=where)
+        return {stat: xtt.XTensor._derive(_precision.store(r.squeeze(axis=axes), X.data.dtype), dims, coords)
+                for stat, r in res.items()}
+
+    data = _np_describe(X.data, axes, stats, nan=nan, where=where, stack=True)
+    data = _precision.store(data.squeeze(axis=tuple(axis + 1 for axis in axes)), X.data.dtype)
+    return xtt.XTensor(data, [stat_dim] + list(dims), [np.array(stats)] + list(coords))
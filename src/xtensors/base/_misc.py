@@ -5,23 +5,55 @@ import numpy as np
 import numpy.typing as npt
 
 from .. import tensor as xtt
-from scipy import special
+from ..instrument import instrumented
 
 
 
+@xtt.promote_ternary_operator()
+def _where(X: npt.NDArray, Y: npt.NDArray, Z: npt.NDArray, out: npt.NDArray|None=None) -> npt.NDArray:
+    if out is None:
+        return np.where(X, Y, Z)
+    np.copyto(out, Z)
+    np.copyto(out, Y, where=X.astype(bool, copy=False))
+    return out
+
+
+def _valid(X: xtt.XTensor) -> xtt.XTensor:
+    if isinstance(X, xtt.MaskedXTensor): return X._mask_tensor()
+    return xtt.XTensor._derive(np.broadcast_to(True, X.shape), X.dims, X.coords)
+
+
+@instrumented('where')
 @xtt.generalize_at_2
 @xtt.generalize_at_1
 @xtt.generalize_at_0
-@xtt.promote_ternary_operator()
-def where(X: npt.NDArray, Y: npt.NDArray, Z: npt.NDArray) -> npt.NDArray:
-    return np.where(X, Y, Z)
+def where(X: xtt.XTensor, Y: xtt.XTensor, Z: xtt.XTensor, *, out: xtt.XTensor|npt.NDArray|None=None) -> xtt.XTensor:
+    r"""
+    Elementwise :code:`Y if X else Z`, broadcast by dimension names.
 
+    If any operand is a :py:class:`xtensors.MaskedXTensor`, the result is
+    masked: an entry is valid when the condition is valid and the selected
+    branch is valid. If both branches are
+    :py:class:`xtensors.CategoricalXTensor` with the same categories, the
+    result is categorical too; otherwise categorical operands take part
+    through their codes.
+    """
+    if isinstance(Y, xtt.CategoricalXTensor) and isinstance(Z, xtt.CategoricalXTensor) \
+            and np.array_equal(Y.categories, Z.categories):
+        res = _where(X, Y._codes(), Z._codes(), out=out)
+        return xtt.CategoricalXTensor._wrap(res, Y.categories) if out is None else res
 
-@xtt.generalize_at_0
-def softmax(X: xtt.XTensor, /, dim: xtt.DimLike) -> xtt.XTensor:
-    axis = X.get_axis(dim)
-    _y = special.softmax(X.data, axis=axis)
-    return xtt.XTensor(_y, dims=X.dims, coords=X.coords)
+    operands = (X, Y, Z)
+    if not any(isinstance(A, xtt.MaskedXTensor) for A in operands):
+        return _where(X, Y, Z, out=out)
+
+    if out is not None:
+        raise NotImplementedError('where with out= is not supported for MaskedXTensor, call filled() first')
+
+    X1, Y1, Z1 = (A._unmasked() if isinstance(A, xtt.MaskedXTensor) else A for A in operands)
+    res = _where(X1, Y1, Z1)
+    mask = _where(_valid(X), _where(X1, _valid(Y), _valid(Z)), xtt.to_xtensor(False))
+    return xtt.MaskedXTensor(res.data, mask, res.dims, res.coords)
 
 
 def get_rank(x: Any) -> int:
@@ -0,0 +1,272 @@
+from __future__ import annotations
+'''
+Quantiles over named dims:
+    quantile selects the order statistics it needs with np.partition instead
+    of sorting, and QuantileSketch accumulates approximate quantiles of
+    batches streamed along a dim in bounded memory.
+'''
+from math import prod
+from typing import Any, List, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .. import numpy as xtnp
+from .. import tensor as xtt
+from ..instrument import instrumented, kernel
+
+
+def _as_q(q: float|Sequence[float]) -> npt.NDArray[np.float64]:
+    _q = np.asarray(q, dtype=np.float64)
+    if _q.ndim > 1:
+        raise ValueError(f'q should be a scalar or 1D, but received shape {_q.shape}')
+    if np.any((_q < 0) | (_q > 1)):
+        raise ValueError(f'Quantiles should be within [0, 1], received {q}')
+    return _q
+
+
+def _quantile(a: npt.NDArray, q: npt.NDArray[np.float64], axes: Sequence[int]) -> npt.NDArray:
+    """
+    Linear interpolation between order statistics, as :code:`np.quantile`.
+
+    :param q: 1D array of quantiles
+    :return: an array with the quantiles on the first axis and :code:`axes` removed
+    """
+    x = xtnp.flatten(a, list(axes), position='right')
+    n = x.shape[-1]
+    if n == 0:
+        raise ValueError('Cannot compute quantiles over an empty dimension')
+
+    pos = q * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+
+    if np.shares_memory(x, a):
+        x = x.copy()
+
+    # one selection per order statistic, each on the part of the slice
+    # right of the previous one; selecting several kth at once is slower
+    start = 0
+    for k in np.unique(np.concatenate([lo, hi])):
+        x[..., start:].partition(k - start, axis=-1)
+        start = k + 1
+
+    v_lo = x[..., lo].astype(np.result_type(x.dtype, np.float64), copy=False)
+    res = v_lo + (x[..., hi] - v_lo) * (pos - lo)
+    if x.dtype.kind in 'fc':
+        res[np.isnan(x).any(axis=-1)] = np.nan
+    return np.moveaxis(res, -1, 0)
+
+
+_np_quantile = kernel(_quantile)
+_np_nanquantile = kernel(np.nanquantile)
+
+
+def _wrap(res: npt.NDArray, q: npt.NDArray, scalar: bool, X: xtt.XTensor, axes: Sequence[int],
+        qdim: str) -> xtt.XTensor:
+    dims, coords = xtt.strip(X.dims, axes), xtt.strip(X.coords, axes)
+    if scalar:
+        return xtt.XTensor._derive(res[0], dims, coords)
+    return xtt.XTensor(res, [qdim] + list(dims), [q] + list(coords))
+
+
+@instrumented('quantile')
+@xtt.generalize_at_0
+def quantile(X: xtt.XTensor, /, q: float|Sequence[float],
+        dim: xtt.DimLike|xtt.DimsLike|None=None, *, qdim: str='quantile') -> xtt.XTensor:
+    r"""
+    Exact quantiles, interpolated linearly between order statistics as with
+    :code:`np.quantile`. Only the needed order statistics are selected, with
+    :code:`np.partition`, in a single copy of the data.
+
+    :param X: target tensor
+    :param q: a quantile or a sequence of quantiles, within :math:`[0, 1]`
+    :param dim: dimension(s) to reduce, all of them by default
+    :param qdim: name of the dimension indexing the quantiles, added on the
+            left with :code:`q` as coordinates when :code:`q` is a sequence
+
+    """
+    _q = _as_q(q)
+    axes = X.get_axes(dim)
+    return _wrap(_np_quantile(X.data, _q.reshape(-1), axes), _q, _q.ndim == 0, X, axes, qdim)
+
+
+@instrumented('nanquantile')
+@xtt.generalize_at_0
+def nanquantile(X: xtt.XTensor, /, q: float|Sequence[float],
+        dim: xtt.DimLike|xtt.DimsLike|None=None, *, qdim: str='quantile') -> xtt.XTensor:
+    r"""
+    Same as :py:func:`xtensors.quantile`, but :code:`nan` is ignored
+    """
+    _q = _as_q(q)
+    axes = X.get_axes(dim)
+    res = _np_nanquantile(X.data, _q.reshape(-1), axis=tuple(axes))
+    return _wrap(res, _q, _q.ndim == 0, X, axes, qdim)
+
+
+def median(X: xtt.TensorLike, /, dim: xtt.DimLike|xtt.DimsLike|None=None) -> xtt.XTensor:
+    r"""
+    :return: :code:`quantile(X, 0.5, dim)`
+    """
+    return quantile(X, 0.5, dim)
+
+
+def nanmedian(X: xtt.TensorLike, /, dim: xtt.DimLike|xtt.DimsLike|None=None) -> xtt.XTensor:
+    r"""
+    :return: :code:`nanquantile(X, 0.5, dim)`
+    """
+    return nanquantile(X, 0.5, dim)
+
+
+class QuantileSketch:
+    r"""
+    Mergeable approximate quantiles of tensors streamed along :code:`dim`,
+    kept separately for every index of the other dims.
+
+    Items are stored in levels of compactors: level :math:`h` holds items of
+    weight :math:`2^h`. When a level holds :code:`k` items or more, they are
+    sorted and every other one is promoted to the next level, so that at most
+    about :math:`k \log_2(n/k)` items are kept per index instead of :math:`n`.
+
+    Each compaction at level :math:`h` shifts the rank of any value by at most
+    :math:`2^h`, and level :math:`h` is compacted at most :math:`n / (k 2^h)`
+    times, so the rank of a returned quantile is within
+    :math:`n (\log_2(n/k) + 1) / k` of :math:`q n`. :py:attr:`rank_error`
+    gives the bound for the items seen so far, as a fraction of :code:`n`;
+    it adds up when sketches are merged.
+
+    NaN entries are counted as the largest values.
+
+    :param dim: dimension along which tensors are streamed
+    :param k: compactor capacity, trading memory for accuracy
+
+    """
+    def __init__(self, dim: xtt.DimLike, k: int=256) -> None:
+        if k < 2:
+            raise ValueError(f'k should be at least 2, received {k}')
+        self.dim = dim
+        self.k = k
+        self.n = 0
+        self.dims: List[str|None]|None = None
+        self.coords: List[Any]|None = None
+        self.shape: tuple|None = None
+        self._levels: List[npt.NDArray] = []
+        self._compactions: List[int] = []
+
+    def _rows(self, X: xtt.XTensor) -> npt.NDArray:
+        axis = X.get_axis(self.dim)
+        kept = [a for a in range(X.rank) if a != axis]
+
+        if self.dims is None:
+            self.dims = [X.dims[a] for a in kept]
+            self.coords = [X.coords[a] for a in kept]
+            self.shape = tuple(X.shape[a] for a in kept)
+        else:
+            if [X.dims[a] for a in kept] != self.dims or tuple(X.shape[a] for a in kept) != self.shape:
+                raise ValueError(f'Expected dims {self.dims} and shape {self.shape} besides {self.dim}, '
+                                 f'received {X.dims} and {X.shape}')
+
+        x = np.moveaxis(X.data, axis, -1)
+        return x.reshape(prod(self.shape), X.shape[axis])
+
+    def _push(self, level: int, items: npt.NDArray) -> None:
+        if level == len(self._levels):
+            self._levels.append(items)
+            self._compactions.append(0)
+        else:
+            self._levels[level] = np.concatenate([self._levels[level], items], axis=1)
+
+    def _compact(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            m = items.shape[1]
+            if m >= self.k:
+                items = np.sort(items, axis=1)
+                # alternate the promoted half so that errors do not drift one way
+                offset = self._compactions[level] % 2
+                self._compactions[level] += 1
+                even = m - m % 2
+                self._levels[level] = items[:, even:]
+                self._push(level + 1, items[:, offset:even:2])
+            level += 1
+
+    @instrumented('QuantileSketch.update')
+    def update(self, X: xtt.TensorLike) -> QuantileSketch:
+        """
+        Add the entries of :code:`X` along :code:`dim`; the other dims should
+        match the previous updates.
+
+        :return: the sketch itself
+        """
+        X = xtt.to_xtensor(X)
+        rows = self._rows(X)
+        self.n += rows.shape[1]
+        self._push(0, rows.copy())
+        self._compact()
+        return self
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """
+        Add the items of another sketch over the same dims.
+
+        :return: the sketch itself
+        """
+        if other.dims is None: return self
+        if self.dims is None:
+            self.dims, self.coords, self.shape = other.dims, other.coords, other.shape
+        elif other.dims != self.dims or other.shape != self.shape:
+            raise ValueError(f'Cannot merge sketches over dims {self.dims} and {other.dims}')
+
+        for level, items in enumerate(other._levels):
+            self._push(level, items)
+            self._compactions[level] += other._compactions[level]
+        self.n += other.n
+        self._compact()
+        return self
+
+    @property
+    def rank_error(self) -> float:
+        """
+        Bound on the rank error of :py:meth:`quantile`, as a fraction of the
+        number of items
+        """
+        if self.n == 0: return 0.
+        error = sum(c * 2**h for h, c in enumerate(self._compactions)) + 2**(len(self._levels) - 1)
+        return min(error / self.n, 1.)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of items kept for each index of the other dims
+        """
+        return sum(items.shape[1] for items in self._levels)
+
+    def quantile(self, q: float|Sequence[float], *, qdim: str='quantile') -> xtt.XTensor:
+        r"""
+        :return: for each quantile, the smallest kept item whose weighted rank
+                reaches :math:`q n`, with the same dims as
+                :py:func:`xtensors.quantile`
+
+        """
+        if self.n == 0:
+            raise ValueError('Cannot compute quantiles of an empty sketch')
+        _q = _as_q(q)
+
+        items = np.concatenate(self._levels, axis=1)
+        weights = np.concatenate([np.full(l.shape[1], 2**h, dtype=np.int64)
+                                  for h, l in enumerate(self._levels)])
+
+        order = np.argsort(items, axis=1, kind='stable')
+        ranks = np.cumsum(weights[order], axis=1)
+        total = ranks[:, -1:]
+
+        target = np.maximum(_q.reshape(-1, 1, 1) * total[None], 1)
+        index = np.argmax(ranks[None] >= target, axis=-1)
+        res = np.take_along_axis(np.take_along_axis(items, order, axis=1)[None],
+                                 index[..., None], axis=-1)[..., 0]
+
+        res = res.reshape((-1,) + self.shape)
+        if _q.ndim == 0:
+            return xtt.XTensor._derive(res[0], self.dims, self.coords)
+        return xtt.XTensor(res, [qdim] + self.dims, [_q] + self.coords)
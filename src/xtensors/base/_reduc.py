@@ -5,7 +5,11 @@ from typing import Protocol, Tuple
 import numpy as np
 
 from .. import tensor as xtt
+from .. import numpy as xtnp
 from ..tensor import XTensor, TensorLike, DimLike, DimsLike
+from ..tensor import _precision
+from ..tensor._out import check_out, wrap_out
+from ..instrument import instrumented, kernel
 
 
 '''
@@ -13,30 +17,126 @@ For reduction functions that can act over multiple axes/dims.
 '''
 
 class _np_reduction_func(Protocol):
-    def __call__(self, a: np.ndarray, axis: int|Tuple[int,...]) -> np.ndarray: ...
+    def __call__(self, a: np.ndarray, axis: int|Tuple[int,...], out: np.ndarray|None=None) -> np.ndarray: ...
 
 
 class ReductionFunc(Protocol):
-    def __call__(self, x: xtt.TensorLike,/, dim: xtt.DimLike|xtt.DimsLike|None) -> xtt.XTensor: ...
+    def __call__(self, x: xtt.TensorLike,/, dim: xtt.DimLike|xtt.DimsLike|None, *,
+                 out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor: ...
 
 
-def _reduction_factory(_np_func: _np_reduction_func) -> ReductionFunc:
+def _reduction_factory(_np_func: _np_reduction_func, _acc_func: _np_reduction_func|None=None) -> ReductionFunc:
+    """
+    :param _acc_func: called with an additional :code:`dtype` argument when
+            the precision policy sets an accumulator dtype
+    """
+    _kernel = kernel(_np_func)
+    _acc_kernel = kernel(_acc_func) if _acc_func is not None else None
+
+    @instrumented(_np_func.__name__)
     @xtt.generalize_at_0
-    def _reduce(X: xtt.XTensor, /, dim: xtt.DimLike|xtt.DimsLike|None=None) -> xtt.XTensor:
+    def _reduce(X: xtt.XTensor, /, dim: xtt.DimLike|xtt.DimsLike|None=None, *,
+                out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
         axes = X.get_axes(dim)
 
-        _y = _np_func(X.data, axis=tuple(axes))
-
-        return xtt.XTensor(_y, dims=xtt.strip(X.dims, axes), coords=xtt.strip(X.coords, axes))
+        if isinstance(X, xtt.SparseXTensor):
+            if out is not None:
+                raise NotImplementedError('out= is not supported for SparseXTensor')
+            return X.reduce(_np_func, axes)
+
+        if isinstance(X, xtt.MaskedXTensor):
+            if out is not None:
+                raise NotImplementedError('out= is not supported for MaskedXTensor')
+            acc = _precision.accumulator(X.data.dtype) if _acc_kernel is not None else None
+            return X.reduce(_np_func, axes, dtype=acc)
+
+        dims, coords = xtt.strip(X.dims, axes), xtt.strip(X.coords, axes)
+        _out = check_out(out, xtt.strip(X.shape, axes), dims, coords)
+
+        acc = _precision.accumulator(X.data.dtype) if _acc_kernel is not None else None
+        if acc is None:
+            _y = _kernel(X.data, axis=tuple(axes), out=_out)
+        else:
+            _y = _acc_kernel(X.data, axis=tuple(axes), dtype=acc, out=_out)
+
+        if out is not None:
+            return wrap_out(out, _out, dims, coords)
+        return xtt.XTensor._derive(_precision.store(_y, X.data.dtype), dims, coords)
     return _reduce
 
 
+_BLOCK = 2**14
+
+
+def _blocked_std(a: np.ndarray, axis: Tuple[int,...], dtype: np.dtype,
+        out: np.ndarray|None=None, nan: bool=False) -> np.ndarray:
+    """
+    Standard deviation accumulated in :code:`dtype`. The reduced elements are
+    visited in blocks of at most :code:`_BLOCK` elements, so that no temporary
+    of the full size is created in :code:`dtype`; the partial moments are
+    merged with the pairwise update of Chan et al.
+    """
+    if a.dtype == dtype or a.size == 0:
+        return (np.nanstd if nan else np.std)(a, axis=axis, dtype=dtype, out=out)
+
+    shape = [l for i, l in enumerate(a.shape) if i not in axis]
+    x = xtnp.flatten(a, list(axis), position='right')
+    N = x.shape[-1]
+    x = x.reshape(-1, N)
+    M = x.shape[0]
+
+    n = np.zeros(M, dtype=dtype)
+    mean = np.zeros(M, dtype=dtype)
+    m2 = np.zeros(M, dtype=dtype)
+
+    rows = max(1, _BLOCK // N)
+    cols = min(N, _BLOCK)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for r in range(0, M, rows):
+            _n, _mean, _m2 = n[r:r+rows], mean[r:r+rows], m2[r:r+rows]
+            for c in range(0, N, cols):
+                b = x[r:r+rows, c:c+cols].astype(dtype)
+
+                if nan:
+                    mask = ~np.isnan(b)
+                    n_b = mask.sum(axis=1).astype(dtype)
+                    np.copyto(b, 0, where=~mask)
+                    mean_b = b.sum(axis=1) / np.maximum(n_b, 1)
+                    b -= mean_b[:,None]
+                    np.copyto(b, 0, where=~mask)
+                else:
+                    n_b = np.full(b.shape[0], b.shape[1], dtype=dtype)
+                    mean_b = b.mean(axis=1)
+                    b -= mean_b[:,None]
+                m2_b = np.einsum('ij,ij->i', b, b)
+
+                total = _n + n_b
+                delta = mean_b - _mean
+                ratio = np.where(total > 0, n_b / total, 0)
+                _mean += delta * ratio
+                _m2 += m2_b + delta**2 * _n * ratio
+                _n[...] = total
+
+        std = np.sqrt(m2 / n).reshape(shape)
+
+    if out is None: return std
+    out[...] = std
+    return out
+
+
+def _nanblocked_std(a: np.ndarray, axis: Tuple[int,...], dtype: np.dtype,
+        out: np.ndarray|None=None) -> np.ndarray:
+    return _blocked_std(a, axis, dtype, out=out, nan=True)
+
+
 def _inject_docs(r: ReductionFunc, doc: str):
     r.__doc__ = dedent(doc)
     return r
 
 def _inject_sig(r: ReductionFunc):
-    def _dummy(x: TensorLike, /, dim: DimLike|DimsLike|None) -> XTensor:
+    def _dummy(x: TensorLike, /, dim: DimLike|DimsLike|None, *,
+               out: XTensor|np.ndarray|None=None) -> XTensor:
         ...
 
     _dummy.__doc__ = r.__doc__
@@ -53,28 +153,28 @@ def postproc(doc: str):
 _sum = postproc(r"""
                 :return: :math:`\sum_{\mathrm{dim}} x`
 
-                """)(_reduction_factory(np.sum))
+                """)(_reduction_factory(np.sum, np.sum))
 
 _mean = postproc(r"""
                 :return: :math:`\braket{x}_\mathrm{dim}`
-                 """)(_reduction_factory(np.mean))
+                 """)(_reduction_factory(np.mean, np.mean))
 
 
 _std = postproc(r"""
                 :return: :math:`\sqrt{\braket{x^2}_\mathrm{dim} - \braket{x}_\mathrm{dim}^2}`
-                """)(_reduction_factory(np.std))
+                """)(_reduction_factory(np.std, _blocked_std))
 
 _nanmean = postproc(r"""
                     Same as :py:meth:`xtensors.mean`, but :code:`nan` is ignored
-                    """)(_reduction_factory(np.nanmean))
+                    """)(_reduction_factory(np.nanmean, np.nanmean))
 
 _nanstd = postproc(r"""
                    Same as :py:meth:`xtensors.std`, but :code:`nan` is ignored
-                    """)(_reduction_factory(np.nanstd))
+                    """)(_reduction_factory(np.nanstd, _nanblocked_std))
 
 _nansum = postproc(r"""
                    Same as :py:meth:`xtensors.sum`, but :code:`nan` is ignored
-                    """)(_reduction_factory(np.nansum))
+                    """)(_reduction_factory(np.nansum, np.nansum))
 
 
 _max = postproc(r"""
@@ -3,8 +3,13 @@ from __future__ import annotations
 import numpy as np
 
 from .. import tensor as xtt
+from ..instrument import instrumented, kernel
 
 
+_np_diagonal = kernel(np.diagonal)
+
+
+@instrumented('diagonal')
 @xtt.generalize_at_0
 def diagonal(X: xtt.XTensor, /, dim1: xtt.DimLike, dim2: xtt.DimLike, dim_out: str|None) -> xtt.XTensor:
     '''
@@ -15,7 +20,7 @@ def diagonal(X: xtt.XTensor, /, dim1: xtt.DimLike, dim2: xtt.DimLike, dim_out: s
     axis1 = X.get_axis(dim1)
     axis2 = X.get_axis(dim2)
 
-    _y = np.diagonal(X.data, axis1=axis1, axis2=axis2)
+    _y = _np_diagonal(X.data, axis1=axis1, axis2=axis2)
 
     return xtt.XTensor(_y, 
             dims=xtt.strip(X.dims, [axis1, axis2]) + [dim_out],
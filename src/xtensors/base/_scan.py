@@ -0,0 +1,139 @@
+from __future__ import annotations
+'''
+Cumulative scans along a named dimension:
+    The result is written into a single preallocated array. Reverse scans run
+    on negative-stride views of the input and of the result, so nothing is
+    flipped or copied. Large tensors are split along the longest other axis
+    into blocks that are scanned on several threads, NumPy releasing the GIL
+    in its loops.
+'''
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Callable, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from .. import tensor as xtt
+from ..tensor import _precision
+from ..tensor._out import check_out, wrap_out
+from ..instrument import instrumented, kernel
+
+
+class ScanFunction(Protocol):
+    def __call__(self, x: xtt.TensorLike, /, dim: xtt.DimLike, *, reverse: bool=False,
+                 out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor: ...
+
+
+_THREADS = os.cpu_count() or 1
+"""number of threads scanning large tensors"""
+
+_PARALLEL = 2**20
+"""minimum size of a tensor scanned on several threads"""
+
+_BLOCK = 2**16
+"""size of the blocks of NaN-aware scans, which copy their input"""
+
+
+def _scan(func: Callable, a: npt.NDArray, axis: int, reverse: bool=False,
+        dtype: npt.DTypeLike=None, out: npt.NDArray|None=None, nan: bool=False) -> npt.NDArray:
+    """
+    :param func: a scan with the signature of :code:`np.cumsum`
+    :param nan: :code:`func` copies its input, so it is called block by block
+    """
+    if out is None:
+        # the dtype of the result, computed on a single element
+        res_dtype = func(a[(slice(0, 1),) * a.ndim], axis=axis, dtype=dtype).dtype
+        out = np.empty(a.shape, dtype=res_dtype)
+
+    src, dst = (np.flip(a, axis=axis), np.flip(out, axis=axis)) if reverse else (a, out)
+
+    kept = [i for i in range(a.ndim) if i != axis]
+    if not kept or a.size == 0:
+        func(src, axis=axis, dtype=dtype, out=dst)
+        return out
+
+    split = max(kept, key=lambda i: a.shape[i])
+    length = a.shape[split]
+    threads = min(_THREADS, length) if a.size >= _PARALLEL else 1
+    step = -(-length // threads)
+    if nan:
+        step = min(step, max(1, _BLOCK * length // a.size))
+
+    if step >= length:
+        func(src, axis=axis, dtype=dtype, out=dst)
+        return out
+
+    def _block(start: int) -> None:
+        key = tuple(slice(start, start + step) if i == split else slice(None) for i in range(a.ndim))
+        func(src[key], axis=axis, dtype=dtype, out=dst[key])
+
+    if threads == 1:
+        for start in range(0, length, step): _block(start)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(_block, range(0, length, step)))
+    return out
+
+
+_np_scan = kernel(_scan)
+
+
+def _scan_factory(func: Callable, name: str, accumulate: bool=False, nan: bool=False) -> ScanFunction:
+    """
+    :param accumulate: :code:`func` accumulates in the dtype set by the
+            precision policy
+    """
+    @instrumented(name)
+    @xtt.generalize_at_0
+    def _scan_op(X: xtt.XTensor, /, dim: xtt.DimLike, *, reverse: bool=False,
+                out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+        if isinstance(X, (xtt.SparseXTensor, xtt.MaskedXTensor)):
+            raise NotImplementedError(f'{name} is not supported for {type(X).__name__}')
+
+        axis = X.get_axis(dim)
+        _out = check_out(out, X.shape, X.dims, X.coords)
+
+        acc = _precision.accumulator(X.data.dtype) if accumulate else None
+        _y = _np_scan(func, X.data, axis, reverse=reverse, dtype=acc, out=_out, nan=nan)
+
+        if out is not None:
+            return wrap_out(out, _out, X.dims, X.coords)
+        return xtt.XTensor._derive(_precision.store(_y, X.data.dtype), X.dims, X.coords)
+    return _scan_op
+
+
+def _inject_sig(r: ScanFunction, doc: str) -> ScanFunction:
+    def _dummy(x: xtt.TensorLike, /, dim: xtt.DimLike, *, reverse: bool=False,
+               out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+        ...
+    _dummy.__doc__ = doc
+    return wraps(_dummy)(r)
+
+
+_SCAN_DOC = r"""
+    Cumulative {what} along :code:`dim`, with the dims and coordinates of :code:`x`.
+
+    :param x: target tensor
+    :param dim: dimension to scan
+    :param reverse: scan from the last entry of :code:`dim`
+    :param out: buffer of the shape of :code:`x` to write the result into
+
+    """
+
+
+cumsum = _inject_sig(_scan_factory(np.cumsum, 'cumsum', accumulate=True),
+                     _SCAN_DOC.format(what='sum'))
+
+cumprod = _inject_sig(_scan_factory(np.cumprod, 'cumprod', accumulate=True),
+                      _SCAN_DOC.format(what='product'))
+
+cummax = _inject_sig(_scan_factory(np.maximum.accumulate, 'cummax'),
+                     _SCAN_DOC.format(what='maximum, NaN propagating'))
+
+cummin = _inject_sig(_scan_factory(np.minimum.accumulate, 'cummin'),
+                     _SCAN_DOC.format(what='minimum, NaN propagating'))
+
+nancumsum = _inject_sig(_scan_factory(np.nancumsum, 'nancumsum', accumulate=True, nan=True),
+                        _SCAN_DOC.format(what='sum, NaN counting as zero'))
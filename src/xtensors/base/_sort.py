@@ -0,0 +1,181 @@
+from __future__ import annotations
+'''
+Sorting along a named dimension:
+    When the sort key is 1D (a 1D tensor, or a separate key along the sorted
+    dim), every slice is reordered the same way and the coordinates of the
+    sorted dim are reordered with a single take. Otherwise each slice has its
+    own order, the coordinates of the sorted dim are dropped, and their
+    reordered values can be returned as a companion tensor.
+'''
+from typing import Literal, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .. import tensor as xtt
+from ..tensor._categorical import CategoricalXTensor, take_coord
+from ..instrument import instrumented, kernel
+
+
+SortKind = Literal['quicksort', 'stable', 'heapsort', 'mergesort']
+
+
+def _argsort(a: npt.NDArray, axis: int, kind: SortKind|None=None,
+        descending: bool=False) -> npt.NDArray[np.intp]:
+    """
+    :return: the sorting positions along :code:`axis`; in descending order,
+            ties keep their original order and NaN comes first
+    """
+    if not descending:
+        return np.argsort(a, axis=axis, kind=kind)
+    n = a.shape[axis]
+    order = np.argsort(np.flip(a, axis=axis), axis=axis, kind=kind)
+    return np.flip(n - 1 - order, axis=axis)
+
+
+def _sort(a: npt.NDArray, axis: int, kind: SortKind|None=None, descending: bool=False,
+        inplace: bool=False) -> npt.NDArray:
+    if inplace:
+        a.sort(axis=axis, kind=kind)
+    else:
+        a = np.sort(a, axis=axis, kind=kind)
+    if descending:
+        # a reversed view, which only copies if the result has to be in place
+        if inplace: a[...] = np.flip(a, axis=axis)
+        else: a = np.flip(a, axis=axis)
+    return a
+
+
+_np_argsort = kernel(_argsort)
+_np_sort = kernel(_sort)
+
+
+def _check(X: xtt.XTensor, kind: SortKind|None) -> None:
+    if isinstance(X, (xtt.SparseXTensor, xtt.MaskedXTensor)):
+        raise NotImplementedError(f'Sorting is not supported for {type(X).__name__}')
+    if kind not in (None, 'quicksort', 'stable', 'heapsort', 'mergesort'):
+        raise ValueError(f'Unknown sort kind {kind}')
+
+
+def _key(X: xtt.XTensor, by: xtt.TensorLike|None, axis: int) -> npt.NDArray|None:
+    """
+    :return: the 1D key of the sort, :code:`None` if every slice is sorted on its own
+    """
+    if by is None:
+        return X.data if X.rank == 1 else None
+
+    if isinstance(by, xtt.XTensor):
+        if by.rank != 1 or by.dims[0] not in (None, X.dims[axis]):
+            raise ValueError(f'by should be 1D along {X.dims[axis]}, received dims {by.dims}')
+        key = by.data
+    else:
+        key = np.asarray(by)
+        if key.ndim != 1:
+            raise ValueError(f'by should be 1D, received shape {key.shape}')
+
+    if len(key) != X.shape[axis]:
+        raise ValueError(f'by has {len(key)} elements for dimension of length {X.shape[axis]}')
+    return key
+
+
+@instrumented('sort')
+@xtt.generalize_at_0
+def sort(X: xtt.XTensor, /, dim: xtt.DimLike, *,
+        by: xtt.TensorLike|None=None, kind: SortKind|None=None, descending: bool=False,
+        inplace: bool=False, return_coords: bool=False,
+        ) -> xtt.XTensor|Tuple[xtt.XTensor, xtt.XTensor]:
+    r"""
+    Sort :code:`X` along :code:`dim`.
+
+    If :code:`X` is 1D, or if a 1D key :code:`by` is given, every slice is
+    reordered by the same permutation and so are the coordinates of
+    :code:`dim`. Otherwise each slice is sorted on its own, and the
+    coordinates of :code:`dim` are dropped.
+
+    :param X: target tensor
+    :param dim: target dimension
+    :param by: 1D key along :code:`dim` to sort by, instead of :code:`X`
+    :param kind: sorting algorithm, as in :code:`np.sort`; :code:`stable`
+            keeps ties in their original order
+    :param descending: sort from the largest value, NaN first
+    :param inplace: sort the data of :code:`X` and return :code:`X`, which
+            avoids a copy when each slice is sorted on its own
+    :param return_coords: also return, with the same dims as the result, the
+            original coordinates of :code:`dim` (their positions if there
+            are none) at each sorted entry
+
+    :return: the sorted tensor, and the tensor of original coordinates if
+            :code:`return_coords`
+
+    """
+    _check(X, kind)
+    axis = X.get_axis(dim)
+    key = _key(X, by, axis)
+    coord = X.coords[axis]
+
+    if key is not None:
+        order = _np_argsort(key, 0, kind=kind, descending=descending)
+        new_coord = None if coord is None else coord[order]
+
+        if inplace:
+            # np.take buffers its output, so the permutation is still copied once
+            np.take(X.data, order, axis=axis, out=X.data)
+            X.set_coord(axis, new_coord)
+            Y = X
+        else:
+            coords = list(X.coords)
+            coords[axis] = new_coord
+            Y = xtt.XTensor._derive(X.data.take(order, axis=axis), X.dims, coords)
+
+        if not return_coords: return Y
+        # the same along the other dims, so a broadcast of the reordered coordinates
+        shape = [-1 if a == axis else 1 for a in range(X.rank)]
+        def _broadcast(C: xtt.XTensor) -> xtt.XTensor:
+            return xtt.XTensor._derive(np.broadcast_to(np.reshape(C.data, shape), Y.shape), Y.dims, Y.coords)
+
+        if coord is None:
+            return Y, _broadcast(xtt.XTensor._derive(order))
+        C = take_coord(coord, order, [X.dims[axis]], [None])
+        return Y, C._map(_broadcast) if isinstance(C, CategoricalXTensor) else _broadcast(C)
+
+    coords = list(X.coords)
+    coords[axis] = None
+
+    if not return_coords:
+        _y = _np_sort(X.data, axis, kind=kind, descending=descending, inplace=inplace)
+        if not inplace: return xtt.XTensor._derive(_y, X.dims, coords)
+        X.set_coord(axis, None)
+        return X
+
+    order = _np_argsort(X.data, axis, kind=kind, descending=descending)
+    if inplace:
+        X.data[...] = np.take_along_axis(X.data, order, axis=axis)
+        X.set_coord(axis, None)
+        Y = X
+    else:
+        Y = xtt.XTensor._derive(np.take_along_axis(X.data, order, axis=axis), X.dims, coords)
+    if coord is None:
+        return Y, xtt.XTensor._derive(order, Y.dims, Y.coords)
+    return Y, take_coord(coord, order, Y.dims, Y.coords)
+
+
+@instrumented('argsort')
+@xtt.generalize_at_0
+def argsort(X: xtt.XTensor, /, dim: xtt.DimLike, *,
+        kind: SortKind|None=None, descending: bool=False) -> xtt.XTensor:
+    r"""
+    :param X: target tensor
+    :param dim: target dimension
+    :param kind: sorting algorithm, as in :code:`np.argsort`
+    :param descending: sort from the largest value, NaN first, ties keeping
+            their original order
+
+    :return: the positions along :code:`dim` that sort :code:`X`, with the
+            dims of :code:`X` and no coordinates on :code:`dim`
+
+    """
+    _check(X, kind)
+    axis = X.get_axis(dim)
+    coords = list(X.coords)
+    coords[axis] = None
+    return xtt.XTensor._derive(_np_argsort(X.data, axis, kind=kind, descending=descending), X.dims, coords)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+'''
+Top-k along a named dimension:
+    The k selected entries are found with np.argpartition in O(n), block by
+    block along long axes, and only those k entries are sorted.
+'''
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .. import tensor as xtt
+from ..tensor._categorical import take_coord
+from ..instrument import instrumented, kernel
+
+
+class TopK(NamedTuple):
+    """
+    Result of :py:func:`xtensors.topk`
+    """
+    values: xtt.XTensor
+    """the selected values"""
+    indices: xtt.XTensor
+    """their positions along the reduced dimension"""
+    coords: xtt.XTensor|None
+    """their coordinates along the reduced dimension, :code:`None` if it has none"""
+
+
+_BLOCK = 2**16
+
+
+def _take(x: npt.NDArray, key: slice, axis: int) -> npt.NDArray:
+    return x[tuple(key if a == axis else slice(None) for a in range(x.ndim))]
+
+
+def _select(x: npt.NDArray, k: int, axis: int, largest: bool) -> npt.NDArray[np.intp]:
+    n = x.shape[axis]
+    if k == n:
+        return np.broadcast_to(np.arange(n).reshape([-1 if a == axis else 1 for a in range(x.ndim)]),
+                               x.shape).copy()
+    if largest:
+        return _take(np.argpartition(x, n - k, axis=axis), slice(n - k, None), axis)
+    return _take(np.argpartition(x, k - 1, axis=axis), slice(None, k), axis)
+
+
+def _topk(x: npt.NDArray, k: int, axis: int, largest: bool=True, sorted: bool=True,
+        nan: bool=False) -> npt.NDArray[np.intp]:
+    """
+    :return: the positions of the :code:`k` largest (or smallest) entries
+            along :code:`axis`, NaN being ordered as the largest value, or
+            as the smallest value if :code:`nan` and :code:`largest`
+    """
+    n = x.shape[axis]
+    nan = nan and largest and x.dtype.kind in 'fc'
+
+    # long axes are visited in blocks, keeping the k best entries so far,
+    # so that no index array of the size of x is allocated
+    step = max(2 * k, _BLOCK * n // max(x.size, 1))
+
+    index = values = None
+    for start in range(0, n, step):
+        block = _take(x, slice(start, start + step), axis)
+        if nan: block = np.where(np.isnan(block), -np.inf, block)
+
+        index_b = _select(block, min(k, block.shape[axis]), axis, largest)
+        values_b = np.take_along_axis(block, index_b, axis=axis)
+        index_b += start
+
+        if index is None:
+            index, values = index_b, values_b
+            continue
+
+        index = np.concatenate([index, index_b], axis=axis)
+        values = np.concatenate([values, values_b], axis=axis)
+        if index.shape[axis] > k:
+            best = _select(values, k, axis, largest)
+            index = np.take_along_axis(index, best, axis=axis)
+            values = np.take_along_axis(values, best, axis=axis)
+
+    if sorted:
+        order = np.argsort(values, axis=axis, kind='stable')
+        if largest: order = np.flip(order, axis=axis)
+        index = np.take_along_axis(index, order, axis=axis)
+    return index
+
+
+_np_topk = kernel(_topk)
+
+
+def _wrap(X: xtt.XTensor, index: npt.NDArray[np.intp], axis: int, kdim: str) -> TopK:
+    dims = list(X.dims)
+    dims[axis] = kdim
+    coords = list(X.coords)
+    coords[axis] = None
+
+    values = xtt.XTensor._derive(np.take_along_axis(X.data, index, axis=axis), dims, coords)
+    indices = xtt.XTensor._derive(index, dims, coords)
+
+    coord = X.coords[axis]
+    if coord is None:
+        return TopK(values, indices, None)
+    return TopK(values, indices, take_coord(coord, index, dims, coords))
+
+
+def _check(X: xtt.XTensor, k: int, axis: int, kdim: str) -> None:
+    if not 0 < k <= X.shape[axis]:
+        raise ValueError(f'k should be within [1, {X.shape[axis]}], received {k}')
+    if kdim in X.dims and X.get_axis(kdim) != axis:
+        raise ValueError(f'Tensor already has a dimension named {kdim}')
+
+
+@instrumented('topk')
+@xtt.generalize_at_0
+def topk(X: xtt.XTensor, /, k: int, dim: xtt.DimLike, *,
+        largest: bool=True, sorted: bool=True, kdim: str='k') -> TopK:
+    r"""
+    The :code:`k` largest (or smallest) entries along :code:`dim`, found by
+    partial selection instead of a full sort. NaN is ordered as the largest
+    value, as in :code:`np.sort`.
+
+    :param X: target tensor
+    :param k: number of entries to select
+    :param dim: target dimension
+    :param largest: select the largest entries, else the smallest
+    :param sorted: order the selected entries from the best one, else their
+            order is unspecified
+    :param kdim: name of the dimension replacing :code:`dim`
+
+    :return: a :py:class:`xtensors.TopK` of tensors whose :code:`dim` is
+            replaced by :code:`kdim` of length :code:`k`
+
+    """
+    axis = X.get_axis(dim)
+    _check(X, k, axis, kdim)
+    return _wrap(X, _np_topk(X.data, k, axis, largest=largest, sorted=sorted), axis, kdim)
+
+
+@instrumented('nantopk')
+@xtt.generalize_at_0
+def nantopk(X: xtt.XTensor, /, k: int, dim: xtt.DimLike, *,
+        largest: bool=True, sorted: bool=True, kdim: str='k') -> TopK:
+    r"""
+    Same as :py:func:`xtensors.topk`, but :code:`nan` is ordered after every
+    number, so that it is selected only if fewer than :code:`k` entries are
+    not NaN
+    """
+    axis = X.get_axis(dim)
+    _check(X, k, axis, kdim)
+    return _wrap(X, _np_topk(X.data, k, axis, largest=largest, sorted=sorted, nan=True), axis, kdim)
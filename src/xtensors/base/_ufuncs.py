@@ -9,21 +9,44 @@ import numpy as np
 from .. import tensor as xtt
 
 from ..tensor import XTensor, TensorLike
+from ..tensor import _precision
+from ..tensor._out import check_out, wrap_out
+from ..instrument import instrumented, kernel
 
 
 
 class _ufunc(Protocol):
-    def __call__(self, __x1: np.ndarray, /, *args) -> np.ndarray: ...
+    def __call__(self, __x1: np.ndarray, /, *args, **kwargs) -> np.ndarray: ...
 
 
 class UFunc(Protocol):
-    def __call__(self, x: xtt.TensorLike, /) -> xtt.XTensor: ...
+    def __call__(self, x: xtt.TensorLike, /, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor: ...
 
 
 def _ufunc_factory(_np_func: _ufunc) -> UFunc:
+    _kernel = kernel(_np_func)
+
+    @instrumented(_np_func.__name__.lstrip('_'))
     @xtt.generalize_at_0
-    def _f(X: xtt.XTensor, /) -> xtt.XTensor:
-        return xtt.XTensor(_np_func(X.data), X.dims, X.coords)
+    def _f(X: xtt.XTensor, /, *, out: xtt.XTensor|np.ndarray|None=None) -> xtt.XTensor:
+        mask = None
+        if isinstance(X, xtt.MaskedXTensor):
+            if out is not None:
+                raise NotImplementedError('out= is not supported for MaskedXTensor')
+            mask, X = X.mask, X._unmasked()
+
+        _out = check_out(out, X.shape, X.dims, X.coords)
+
+        dtype = _precision.storage_dtype(X.data.dtype)
+        if dtype is None:
+            _y = _kernel(X.data, out=_out)
+        else:
+            _y = _kernel(X.data, dtype=dtype, out=_out)
+
+        if out is not None:
+            return wrap_out(out, _out, X.dims, X.coords)
+        Y = xtt.XTensor._derive(_y, X.dims, X.coords)
+        return Y if mask is None else xtt.MaskedXTensor._wrap(Y, mask)
     return _f
 
 
@@ -39,15 +62,20 @@ def _inject_docs(ufunc: UFunc, func_name: str) -> UFunc:
 
 
 def _inject_sig(ufunc: UFunc) -> UFunc:
-    def _dummy(x: TensorLike, /) -> XTensor:
+    def _dummy(x: TensorLike, /, *, out: XTensor|np.ndarray|None=None) -> XTensor:
         ...
     _dummy.__doc__ = ufunc.__doc__
 
     return wraps(_dummy)(ufunc)
 
 
-def _sigmoid(__x1: np.ndarray):
-    return .5 * (1. + np.tanh(__x1/2))
+def _sigmoid(__x1: np.ndarray, dtype: np.dtype|None=None, out: np.ndarray|None=None):
+    # computed in place to avoid temporaries
+    y = np.multiply(__x1, .5, dtype=dtype, out=out)
+    np.tanh(y, out=y)
+    y += 1.
+    y *= .5
+    return y
 
 
 def postproc(*args):
@@ -0,0 +1,10 @@
+'''
+Benchmarks for metadata overhead and scaling of xtensors operations.
+
+Run with :code:`python -m xtensors.bench`; results are stored as JSON so that
+two runs can be compared with :code:`python -m xtensors.bench compare`.
+'''
+from ._runner import Case, CASES, case, measure, run, compare, save, load
+from ._importtime import importtime, check_importtime
+from ._sketch import check_sketch
+from ._interop import check_interop
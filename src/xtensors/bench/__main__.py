@@ -0,0 +1,82 @@
+'''
+python -m xtensors.bench run -o results.json
+python -m xtensors.bench compare base.json results.json --threshold 0.1
+python -m xtensors.bench importtime --budget 0.2
+python -m xtensors.bench sketch
+python -m xtensors.bench interop
+'''
+import argparse
+import sys
+
+from ._runner import run, compare, save, load
+from ._importtime import check_importtime
+from ._sketch import check_sketch
+from ._interop import check_interop
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m xtensors.bench')
+    sub = parser.add_subparsers(dest='command')
+
+    p_run = sub.add_parser('run', help='run benchmarks')
+    p_run.add_argument('-k', '--pattern', default='*', help='glob pattern selecting cases')
+    p_run.add_argument('-o', '--output', default=None, help='JSON file to write results to')
+    p_run.add_argument('--max-size', type=float, default=1e6, help='skip cases with a larger size parameter')
+    p_run.add_argument('--min-time', type=float, default=0.05, help='minimum duration of each repeat in seconds')
+    p_run.add_argument('--repeat', type=int, default=5)
+
+    p_cmp = sub.add_parser('compare', help='compare two result files')
+    p_cmp.add_argument('base')
+    p_cmp.add_argument('new')
+    p_cmp.add_argument('--threshold', type=float, default=0.1,
+                       help='relative slowdown or memory increase reported as a regression')
+
+    p_imp = sub.add_parser('importtime', help='check the import time of xtensors')
+    p_imp.add_argument('--budget', type=float, default=0.2, help='maximum import time in seconds')
+    p_imp.add_argument('--forbid', nargs='*', default=['scipy'],
+                       help='packages that must not be imported by `import xtensors`')
+
+    p_sk = sub.add_parser('sketch', help='check the rank error bound of QuantileSketch')
+    p_sk.add_argument('--sizes', type=int, nargs='*', default=[1_000, 20_000, 100_000])
+    p_sk.add_argument('-k', type=int, nargs='*', default=[16, 64, 256], help='compactor capacities')
+
+    p_io = sub.add_parser('interop', help='check that xarray and pandas conversions share memory')
+    p_io.add_argument('-n', type=int, default=10_000, help='length of the converted inputs')
+
+    if argv is None: argv = sys.argv[1:]
+    if not argv or argv[0] not in ('run', 'compare', 'importtime', 'sketch', 'interop', '-h', '--help'):
+        argv = ['run'] + list(argv)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        lines, regressions = compare(load(args.base), load(args.new), args.threshold)
+        print('\n'.join(lines))
+        if regressions:
+            print(f'{len(regressions)} regression(s) above threshold {args.threshold}')
+            return 1
+        return 0
+
+    if args.command == 'importtime':
+        lines, passed = check_importtime('xtensors', args.budget, args.forbid)
+        print('\n'.join(lines))
+        return 0 if passed else 1
+
+    if args.command == 'sketch':
+        lines, passed = check_sketch(args.sizes, args.k)
+        print('\n'.join(lines))
+        return 0 if passed else 1
+
+    if args.command == 'interop':
+        lines, passed = check_interop(args.n)
+        print('\n'.join(lines))
+        return 0 if passed else 1
+
+    results = run(args.pattern, max_size=int(args.max_size), min_time=args.min_time, repeat=args.repeat)
+    if args.output is not None:
+        save(results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,463 @@
+'''
+Benchmark cases. Each setup function builds its inputs and returns the
+callable being measured.
+'''
+import asyncio
+import pickle
+import time
+import weakref
+
+import numpy as np
+
+import xtensors as xt
+from .. import numpy as xtnp
+from ..functionals import Max, Mean, Pipe
+from ..learn import get_confmat_function
+
+from ._runner import case
+
+
+RANKS = [1, 2, 4, 8]
+SIZES = [10**k for k in range(1, 9)]
+
+
+def _dims(rank: int):
+    return [f'd{i}' for i in range(rank)]
+
+
+def _tensor(shape, dims=None, coords: bool=False, seed: int=0) -> xt.XTensor:
+    rng = np.random.default_rng(seed)
+    return xt.XTensor(rng.random(shape), dims,
+                      [np.arange(n) for n in shape] if coords else None)
+
+
+def _shape2(size: int):
+    return (max(size // 10, 1), 10)
+
+
+@case('construct', rank=RANKS, coords=[False, True])
+def construct(rank: int, coords: bool):
+    data = np.zeros([2] * rank)
+    dims = _dims(rank)
+    _coords = [np.arange(2) for _ in range(rank)] if coords else None
+    return lambda: xt.XTensor(data, dims, _coords)
+
+
+@case('get_axis', kind=['str', 'int', 'tuple'])
+def get_axis(kind: str):
+    X = _tensor([2] * 4, _dims(4))
+    dim = {'str': 'd2', 'int': 2, 'tuple': ('d2', 2)}[kind]
+    return lambda: X.get_axis(dim)
+
+
+@case('broadcast.vanilla', rank=RANKS)
+def broadcast_vanilla(rank: int):
+    X = _tensor([2] * rank, _dims(rank), coords=True)
+    Y = _tensor([2] * rank, _dims(rank), coords=True)
+    return lambda: xt.vanilla_broadcaster(X, Y)
+
+
+@case('broadcast.unilateral', rank=RANKS)
+def broadcast_unilateral(rank: int):
+    X = _tensor([2] * rank, _dims(rank), coords=True)
+    Y = _tensor([2] * rank, _dims(rank)[::-1], coords=True)
+    return lambda: xt.unilateral_broadcaster(X, Y)
+
+
+@case('broadcast.template', rank=RANKS)
+def broadcast_template(rank: int):
+    X = _tensor([2] * rank, _dims(rank), coords=True)
+    Y = _tensor([2] * rank, _dims(rank)[::-1], coords=True)
+    broadcaster = xt.template_broadcaster(_dims(rank), [None] * rank)
+    return lambda: broadcaster(X, Y)
+
+
+@case('binop', impl=['xtensors', 'numpy'], size=SIZES)
+def binop(impl: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+    Y = _tensor(_shape2(size), ['a', 'b'], seed=1)
+    if impl == 'numpy':
+        x, y = X.data, Y.data
+        return lambda: x * y
+    return lambda: X * Y
+
+
+@case('reduc', func=['sum', 'mean', 'nanmax'], size=SIZES)
+def reduc(func: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+    f = getattr(xt, func)
+    return lambda: f(X, 'a')
+
+
+@case('arg', func=['argmax', 'nanargmin'], size=SIZES)
+def arg(func: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+    f = getattr(xt, func)
+    return lambda: f(X, 'a')
+
+
+@case('args', func=['argsmax', 'nanargsmin'], size=SIZES)
+def args(func: str, size: int):
+    X = _tensor(_shape2(size) + (2,), ['a', 'b', 'c'])
+    f = getattr(xt, func)
+    return lambda: f(X, ['a', 'c'])
+
+
+@case('coords', func=['coordsmax', 'coordmax'], size=SIZES)
+def coords(func: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'], coords=True)
+    f = getattr(xt, func)
+    dim = ['a'] if func == 'coordsmax' else 'a'
+    return lambda: f(X, dim)
+
+
+@case('stack', n=[2, 16, 128], size=[10**2, 10**4, 10**6])
+def stack(n: int, size: int):
+    x = [_tensor(_shape2(size // n), ['a', 'b'], coords=True, seed=i) for i in range(n)]
+    return lambda: xt.stack(x, 'n')
+
+
+@case('flatten', size=SIZES)
+def flatten(size: int):
+    X = _tensor(_shape2(size) + (2,), ['a', 'b', 'c'])
+    return lambda: xt.flatten(X, ['a', 'c'], 'ac')
+
+
+@case('unflatten', coords=[False, True], size=SIZES)
+def unflatten(coords: bool, size: int):
+    # the multi-index coordinate is never materialized
+    shape = _shape2(size)
+    X = xt.flatten(_tensor(shape + (2,), ['a', 'b', 'c'], coords=coords), ['a', 'b'], 'ab')
+    if coords: return lambda: xt.unflatten(X, 'ab')
+    return lambda: xt.unflatten(X, 'ab', ['a', 'b'], shape)
+
+
+@case('permute', rank=RANKS)
+def permute(rank: int):
+    X = _tensor([2] * rank, _dims(rank), coords=True)
+    axes = list(range(rank))[::-1]
+    return lambda: xt.permute(X, axes)
+
+
+@case('bincount', bins=[4, 256], size=SIZES)
+def bincount(bins: int, size: int):
+    x = np.random.default_rng(0).integers(0, bins, _shape2(size))
+    return lambda: xtnp.bincount(x, bins)
+
+
+@case('confmat', n_classes=[2, 20], size=SIZES)
+def confmat(n_classes: int, size: int):
+    rng = np.random.default_rng(0)
+    truth = xt.XTensor(rng.integers(0, n_classes, _shape2(size)), ['batch', 'n'])
+    pred = xt.XTensor(rng.integers(0, n_classes, _shape2(size)), ['batch', 'n'])
+    f = get_confmat_function('n', 'truth', 'pred', n_classes)
+    return lambda: f(truth, pred)
+
+
+@case('sparse.sum', storage=['dense', 'sparse'], density=[0.001, 0.01, 0.1], size=SIZES)
+def sparse_sum(storage: str, density: float, size: int):
+    rng = np.random.default_rng(0)
+    data = rng.random(_shape2(size))
+    data[data > density] = 0
+    X = xt.XTensor(data, ['a', 'b'])
+    if storage == 'sparse':
+        X = X.tosparse()
+    return lambda: xt.sum(X * 2., 'a')
+
+
+@case('sparse.convert', direction=['tosparse', 'todense'], density=[0.001, 0.01], size=SIZES)
+def sparse_convert(direction: str, density: float, size: int):
+    rng = np.random.default_rng(0)
+    data = rng.random(_shape2(size))
+    data[data > density] = 0
+    X = xt.XTensor(data, ['a', 'b'])
+    if direction == 'tosparse':
+        return lambda: X.tosparse()
+    S = X.tosparse()
+    return lambda: S.todense()
+
+
+@case('masked', func=['mean', 'argmax'], method=['nan', 'masked'], size=SIZES)
+def masked(func: str, method: str, size: int):
+    data = np.random.default_rng(0).integers(0, 100, _shape2(size))
+    valid = np.arange(data.size).reshape(data.shape) % 10 != 3
+    f = getattr(xt, f'nan{func}')
+    if method == 'masked':
+        X = xt.MaskedXTensor(data, valid, ['a', 'b'])
+        return lambda: f(X, 'b')
+
+    # integers have to be cast to float to hold NaN sentinels
+    X = xt.XTensor(np.where(valid, data, np.nan), ['a', 'b'])
+    return lambda: f(X, 'b')
+
+
+@case('describe', method=['separate', 'describe'], dim=['a', 'b'], size=SIZES)
+def describe(method: str, dim: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+    if method == 'describe':
+        return lambda: xt.describe(X, dim, ['mean', 'std', 'min', 'max', 'count'])
+
+    def f():
+        return [xt.mean(X, dim), xt.std(X, dim), xt.min(X, dim), xt.max(X, dim), X.shape[X.get_axis(dim)]]
+    return f
+
+
+@case('quantile', method=['sort', 'quantile', 'sketch'], size=SIZES)
+def quantile(method: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+    q = [0.1, 0.5, 0.9]
+    if method == 'sort':
+        def f():
+            s = np.sort(X.data, axis=0)
+            n = s.shape[0] - 1
+            return xt.XTensor(s[[round(p * n) for p in q]], ['quantile', 'b'])
+        return f
+    if method == 'quantile':
+        return lambda: xt.quantile(X, q, 'a')
+
+    # the data arrives in 10 batches along 'a'
+    batches = [X.slc('a', slice(i, None, 10)) for i in range(10)]
+    def g():
+        sketch = xt.QuantileSketch('a')
+        for batch in batches: sketch.update(batch)
+        return sketch.quantile(q)
+    return g
+
+
+@case('topk', method=['argsort', 'topk'], k=[1, 5], size=SIZES)
+def topk(method: str, k: int, size: int):
+    X = _tensor((10, max(size // 10, k)), ['batch', 'class'])
+    if method == 'argsort':
+        return lambda: np.flip(np.argsort(X.data, axis=1), axis=1)[:, :k]
+    return lambda: xt.topk(X, k, 'class')
+
+
+@case('sort', method=['numpy', 'sort', 'inplace', 'by'], size=SIZES)
+def sort(method: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'], coords=True)
+    if method == 'numpy':
+        return lambda: np.sort(X.data, axis=0)
+    if method == 'sort':
+        return lambda: xt.sort(X, 'a')
+    if method == 'inplace':
+        return lambda: xt.sort(X, 'a', inplace=True)
+    key = X.data[:, 0].copy()
+    return lambda: xt.sort(X, 'a', by=key)
+
+
+@case('scan', method=['numpy', 'cumsum', 'reverse', 'nancumsum'], size=SIZES)
+def scan(method: str, size: int):
+    X = _tensor(_shape2(size), ['t', 'b'])
+    if method == 'numpy':
+        return lambda: np.flip(np.cumsum(np.flip(X.data, axis=0), axis=0), axis=0)
+    if method == 'cumsum':
+        return lambda: xt.cumsum(X, 't')
+    if method == 'reverse':
+        return lambda: xt.cumsum(X, 't', reverse=True)
+    return lambda: xt.nancumsum(X, 't')
+
+
+@case('pipe.stream', method=['sync', 'astream'], size=[10**4, 10**6])
+def pipe_stream(method: str, size: int):
+    # 8 inputs, each read with 5ms of simulated I/O
+    inputs = [_tensor(_shape2(size), ['a', 'b'], seed=i) for i in range(8)]
+    pipe = Pipe(Mean('b'), Max('a'))
+
+    def read():
+        for X in inputs:
+            time.sleep(0.005)
+            yield X
+
+    if method == 'sync':
+        return lambda: [pipe(X) for X in read()]
+
+    async def consume():
+        return [Y async for Y in pipe.astream(read())]
+    return lambda: asyncio.run(consume())
+
+
+@case('memory', tracking=[False, True], n=[16, 1024])
+def memory(tracking: bool, n: int):
+    X = _tensor((n, 4), ['a', 'b'])
+
+    def f():
+        with xt.memory_tracking(tracking):
+            views = [X.slc('a', slice(i, i + 1)) for i in range(n)]
+            return xt.resident_nbytes() if tracking else views
+    return f
+
+
+@case('rangecoord', coord=['array', 'range'], size=SIZES)
+def rangecoord(coord: str, size: int):
+    # two tensors with equal but distinct coordinates, compared when broadcast
+    def _coord():
+        if coord == 'array': return np.arange(size) * 0.5
+        return xt.RangeCoord(0., 0.5, size)
+
+    X = xt.XTensor(np.ones(size), ['t'], [_coord()])
+    Y = xt.XTensor(np.ones(size), ['t'], [_coord()])
+    return lambda: X + Y
+
+
+@case('categorical', coord=['object', 'categorical'], op=['binop', 'coordmax'], size=SIZES)
+def categorical(coord: str, op: str, size: int):
+    # binop compares coordinates along a long 'sensor' dim, coordmax looks up
+    # the label of the maximum for every entry of a long 't' dim
+    shape = (10, max(size // 10, 1)) if op == 'binop' else (max(size // 10, 1), 10)
+    names = np.array([f'sensor{i % 100}' for i in range(shape[1])], dtype=object)
+
+    def _coord():
+        if coord == 'object': return names.copy()
+        return xt.CategoricalCoord.from_values(names)
+
+    X = xt.XTensor(np.random.default_rng(0).random(shape), ['t', 'sensor'], [None, _coord()])
+    if op == 'coordmax':
+        return lambda: xt.coordmax(X, 'sensor')
+    Y = xt.XTensor(np.ones(shape), ['t', 'sensor'], [None, _coord()])
+    return lambda: X + Y
+
+
+@case('compile', method=['numpy', 'xtensors', 'compiled'], op=['sum', 'argmax', 'cumsum'], size=[100, 10_000])
+def compile_(method: str, op: str, size: int):
+    # small tensors, where resolving dims and metadata dominates the kernel
+    X = _tensor(_shape2(size), ['a', 'b'], coords=True)
+    if method == 'numpy':
+        func = {'sum': np.sum, 'argmax': np.argmax, 'cumsum': np.cumsum}[op]
+        return lambda: func(X.data, axis=0)
+    if method == 'xtensors':
+        func = getattr(xt, op)
+        return lambda: func(X, 'a')
+    compiled = xt.compile(op, X.dims, dim='a')
+    return lambda: compiled(X)
+
+
+@case('dataset', method=['tensors', 'dataset'], op=['mean', 'isel'], size=SIZES)
+def dataset(method: str, op: str, size: int):
+    # 24 variables of the same (batch, time, sensor) layout
+    shape = (4, max(size // 400, 1), 100)
+    dims = ['batch', 'time', 'sensor']
+    coords = [None, np.arange(shape[1]), np.arange(shape[2])]
+    tensors = {f'v{i}': _tensor(shape, dims, seed=i) for i in range(24)}
+    keys = {'time': slice(0, shape[1] // 2), 'sensor': np.arange(0, 100, 3)}
+
+    if method == 'dataset':
+        ds = xt.XDataset({name: X.data for name, X in tensors.items()}, dims, coords)
+        if op == 'mean': return lambda: ds.mean('time')
+        return lambda: ds.isel(keys)
+
+    tensors = {name: xt.XTensor(X.data, dims, coords) for name, X in tensors.items()}
+    if op == 'mean': return lambda: {name: xt.mean(X, 'time') for name, X in tensors.items()}
+    return lambda: {name: X.isel(keys) for name, X in tensors.items()}
+
+
+@case('validation', level=['full', 'boundary', 'off'], op=['binop', 'reduc', 'slice'], rank=[2, 4])
+def validation(level: str, op: str, rank: int):
+    X = _tensor([4] * rank, _dims(rank), coords=True)
+    with xt.validation(level):
+        # derived tensors share coordinates with X unless validation is full
+        Y = X * 2.
+    f = {
+        'binop': lambda: X * Y,
+        'reduc': lambda: xt.sum(X, 'd0'),
+        'slice': lambda: X.get('d0', 1),
+    }[op]
+
+    def g():
+        with xt.validation(level):
+            return f()
+    return g
+
+
+@case('precision', func=['sum', 'std', 'sigmoid'], policy=['default', 'float32/float64'], size=SIZES)
+def precision(func: str, policy: str, size: int):
+    X = xt.XTensor(_tensor(_shape2(size), ['a', 'b']).data.astype(np.float32), ['a', 'b'])
+    f = {
+        'sum': lambda: xt.sum(X, 'a'),
+        'std': lambda: xt.std(X, 'a'),
+        'sigmoid': lambda: xt.sigmoid(X),
+    }[func]
+    if policy == 'default':
+        return f
+
+    def g():
+        with xt.precision(storage=np.float32, accumulate=np.float64):
+            return f()
+    return g
+
+
+@case('out', buffer=['none', 'out'], size=[10**2, 10**4, 10**6])
+def out(buffer: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'], coords=True)
+    if buffer == 'none':
+        def f():
+            with xt.validation('boundary'):
+                return xt.sum(xt.exp(X), 'a')
+        return f
+
+    # steady state: the peak memory does not grow with size
+    tmp = xt.exp(X)
+    res = xt.sum(tmp, 'a')
+    def g():
+        with xt.validation('boundary'):
+            xt.exp(X, out=tmp)
+            return xt.sum(tmp, 'a', out=res)
+    return g
+
+
+@case('activation', func=['softmax', 'log_softmax', 'logsumexp', 'cross_entropy'], size=SIZES)
+def activation(func: str, size: int):
+    X = _tensor(_shape2(size), ['batch', 'class'])
+    if func == 'cross_entropy':
+        labels = xt.XTensor(np.random.default_rng(0).integers(0, 10, X.shape[0]), ['batch'])
+        return lambda: xt.cross_entropy(X, labels, 'class')
+    f = getattr(xt, func)
+    return lambda: f(X, 'class')
+
+
+@case('isel', method=['sequential', 'isel'], size=[10**2, 10**4, 10**6])
+def isel(method: str, size: int):
+    n = max(round(size ** .25), 2)
+    X = _tensor([n] * 4, _dims(4), coords=True)
+    indexers = dict(d0=slice(0, n // 2), d1=1, d2=np.arange(0, n, 2), d3=slice(1, None))
+    if method == 'isel':
+        return lambda: X.isel(indexers)
+
+    def f():
+        Y = X.slc('d0', indexers['d0'])
+        Y = Y.get('d1', indexers['d1'])
+        Y = Y.isel(d2=indexers['d2'])
+        return Y.slc('d3', indexers['d3'])
+    return f
+
+
+@case('transport', method=['pickle', 'pickle5', 'shared'], size=SIZES)
+def transport(method: str, size: int):
+    X = _tensor(_shape2(size), ['a', 'b'])
+
+    if method == 'pickle':
+        return lambda: pickle.loads(pickle.dumps(X, protocol=4))
+
+    if method == 'pickle5':
+        def f():
+            buffers = []
+            p = pickle.dumps(X, protocol=5, buffer_callback=buffers.append)
+            return pickle.loads(p, buffers=buffers)
+        return f
+
+    # the handle is sent instead of the tensor; the segment is released
+    # once the benchmark drops the callable
+    context = xt.shared(X)
+    handle = context.__enter__()
+    def g():
+        return pickle.loads(pickle.dumps(handle)).attach()
+    weakref.finalize(g, context.__exit__, None, None, None)
+    return g
+
+
+@case('concat', n=[16, 128], size=[10**4, 10**6])
+def concat(n: int, size: int):
+    coord = np.arange(10)
+    def pieces():
+        for i in range(n):
+            yield xt.XTensor(np.full(_shape2(size // n), i, dtype=float), ['a', 'b'], [None, coord])
+    return lambda: xt.concat(pieces(), 'a')
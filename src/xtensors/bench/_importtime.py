@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from typing import Dict, List, Sequence, Tuple
+
+
+def importtime(module: str='xtensors', python: str=sys.executable) -> Dict[str, int]:
+    """
+    Import :code:`module` in a fresh interpreter with :code:`-X importtime`.
+
+    :return: a dict mapping every imported module to its cumulative import
+            time in microseconds
+    """
+    proc = subprocess.run(
+            [python, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, check=True)
+
+    times: Dict[str, int] = dict()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'): continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return times
+
+
+def check_importtime(module: str='xtensors', budget: float=0.2,
+        forbidden: Sequence[str]=('scipy',)) -> Tuple[List[str], bool]:
+    """
+    Check that importing :code:`module` takes at most :code:`budget` seconds
+    and does not import any of the :code:`forbidden` packages.
+
+    :return: the report lines and whether the check passed
+    """
+    times = importtime(module)
+    total = times.get(module, 0) / 1e6
+
+    lines = [f'import {module}: {total*1e3:.1f}ms (budget {budget*1e3:.1f}ms)']
+    heaviest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+    lines += [f'    {name:50} {t/1e3:8.1f}ms' for name, t in heaviest]
+
+    passed = total <= budget
+    for name in forbidden:
+        if name in times:
+            lines.append(f'{name} is imported by {module}')
+            passed = False
+
+    return lines, passed
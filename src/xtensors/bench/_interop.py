@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+
+import numpy as np
+
+import xtensors as xt
+
+from typing import Any, Callable, List, Tuple
+
+
+def _inputs(n: int) -> List[Tuple[str, xt.XTensor]]:
+    """
+    :return: C-contiguous float inputs of rank 1 and 2, with and without
+            coordinates, including the lazy coordinate of a flattened dimension
+    """
+    rng = np.random.default_rng(0)
+    return [
+        ('1d', xt.XTensor(rng.normal(size=n), ['a'])),
+        ('1d-coords', xt.XTensor(rng.normal(size=n), ['a'], [np.arange(n) * 2])),
+        ('2d', xt.XTensor(rng.normal(size=(n, 4)), ['a', 'b'])),
+        ('2d-coords', xt.XTensor(rng.normal(size=(n, 4)), ['a', 'b'], [np.arange(n) * 2, np.arange(4)])),
+        ('2d-flat', xt.flatten(xt.XTensor(rng.normal(size=(n, 2, 2)), ['a', 'b', 'c'], [None, np.arange(2), None]),
+                               ['b', 'c'], 'bc')),
+    ]
+
+
+def _shares(X: xt.XTensor, export: Callable[[xt.XTensor], Any],
+        data: Callable[[Any], Any], back: Callable[[Any], xt.XTensor]) -> Tuple[bool, bool]:
+    obj = export(X)
+    return np.shares_memory(np.asarray(data(obj)), X.data), np.shares_memory(back(obj).data, X.data)
+
+
+def check_interop(n: int=10_000) -> Tuple[List[str], bool]:
+    """
+    Convert contiguous inputs to xarray and pandas and back, and check that
+    every step shares memory with the input. Libraries that are not installed
+    are reported and skipped.
+
+    :return: the report lines and whether the check passed
+    """
+    conversions = {
+        'xarray': (lambda X: X.to_xarray(), lambda da: da.data, xt.from_xarray),
+        'pandas': (lambda X: X.to_pandas(), lambda obj: obj.to_numpy(copy=False), xt.from_pandas),
+    }
+
+    lines = [f'{"library":>8} {"input":>10} {"to":>6} {"from":>6}']
+    passed = True
+
+    for library, (export, data, back) in conversions.items():
+        if find_spec(library) is None:
+            lines.append(f'{library:>8} {"":>10} not installed, skipped')
+            continue
+
+        for name, X in _inputs(n):
+            to, frm = _shares(X, export, data, back)
+            flag = ''
+            if not (to and frm):
+                passed = False
+                flag = '  FAILED'
+            lines.append(f'{library:>8} {name:>10} {str(to):>6} {str(frm):>6}{flag}')
+
+    return lines, passed
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from itertools import product
+from time import perf_counter
+import fnmatch
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    Setup = Callable[..., Callable[[], Any]]
+
+
+class Case:
+    """
+    A parametrized benchmark case. :code:`setup(**params)` prepares the inputs
+    and returns the zero-argument callable that is measured.
+    """
+    def __init__(self, name: str, setup: Setup, params: Dict[str, Sequence[Any]]) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = params
+
+    def expand(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        :return: a list of (key, params) pairs, one for each combination of parameters
+        """
+        names = list(self.params)
+        expanded = []
+        for values in product(*[self.params[name] for name in names]):
+            params = dict(zip(names, values))
+            args = ','.join(f'{k}={v}' for k, v in params.items())
+            expanded.append((f'{self.name}[{args}]' if args else self.name, params))
+        return expanded
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, **params: Sequence[Any]) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark case, parametrized by the cartesian product of
+    :code:`params`
+    """
+    def wrapper(setup: Setup) -> Setup:
+        CASES.append(Case(name, setup, params))
+        return setup
+    return wrapper
+
+
+def measure(f: Callable[[], Any], min_time: float=0.05, repeat: int=5) -> Dict[str, Any]:
+    """
+    Time :code:`f` and record the peak memory allocated during a single call.
+
+    The number of calls per repeat is chosen so that each repeat takes at least
+    :code:`min_time` seconds; the best per-call time over :code:`repeat` repeats
+    is reported.
+
+    """
+    number = 1
+    while True:
+        t0 = perf_counter()
+        for _ in range(number): f()
+        elapsed = perf_counter() - t0
+        if elapsed >= min_time: break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        t0 = perf_counter()
+        for _ in range(number): f()
+        times.append((perf_counter() - t0) / number)
+
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        f()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return dict(time=min(times), peak_bytes=peak - base, number=number, repeat=repeat)
+
+
+def run(pattern: str='*', max_size: int=10**6, min_time: float=0.05, repeat: int=5,
+        verbose: bool=True) -> Dict[str, Any]:
+    """
+    Run all registered cases whose key matches the glob :code:`pattern`.
+    Parameter combinations with a :code:`size` larger than :code:`max_size`
+    are skipped.
+
+    :return: a JSON-serializable dict with the environment and the results
+    """
+    from . import _cases
+    from ..version import __version__
+
+    results: Dict[str, Dict[str, Any]] = dict()
+    for c in CASES:
+        for key, params in c.expand():
+            if not fnmatch.fnmatch(key, pattern): continue
+            if params.get('size', 0) > max_size: continue
+
+            f = c.setup(**params)
+            results[key] = measure(f, min_time=min_time, repeat=repeat)
+            del f
+
+            if verbose:
+                r = results[key]
+                print(f'{key:60} {_fmt_time(r["time"]):>10} {_fmt_bytes(r["peak_bytes"]):>10}', flush=True)
+
+    return dict(
+        meta=dict(
+            xtensors=__version__, numpy=np.__version__,
+            python=platform.python_version(), platform=platform.platform(),
+            date=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        ),
+        results=results)
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float=0.1
+        ) -> Tuple[List[str], List[str]]:
+    """
+    Compare two results of :py:func:`run`.
+
+    :param threshold: relative increase of time or peak memory above which a
+            case is reported as a regression
+
+    :return: the report lines and the keys of regressed cases
+    """
+    lines = [f'{"case":60} {"time":>8} {"memory":>8}']
+    regressions = []
+
+    for key, r_new in new['results'].items():
+        try:
+            r_base = base['results'][key]
+        except KeyError:
+            continue
+
+        t = r_new['time'] / r_base['time']
+        m = (r_new['peak_bytes'] + 1) / (r_base['peak_bytes'] + 1)
+
+        flag = ''
+        if t > 1 + threshold or m > 1 + threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        lines.append(f'{key:60} {t:>8.3f} {m:>8.3f}{flag}')
+
+    return lines, regressions
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _fmt_time(t: float) -> str:
+    for unit, scale in [('s', 1.), ('ms', 1e-3), ('us', 1e-6)]:
+        if t >= scale: return f'{t/scale:.3g}{unit}'
+    return f'{t/1e-9:.3g}ns'
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit, scale in [('GB', 2**30), ('MB', 2**20), ('kB', 2**10)]:
+        if n >= scale: return f'{n/scale:.3g}{unit}'
+    return f'{n}B'
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+
+import xtensors as xt
+
+from typing import Dict, List, Sequence, Tuple
+
+
+QS = (0., 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.)
+
+
+def _streams(n: int, seed: int=0) -> Dict[str, np.ndarray]:
+    """
+    :return: inputs of length :code:`n` along their first axis
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'normal': rng.normal(size=(n, 4)),
+        'sorted': np.sort(rng.normal(size=(n, 4)), axis=0),
+        'reversed': np.sort(rng.normal(size=(n, 4)), axis=0)[::-1],
+        'ties': rng.integers(0, 10, size=(n, 4)).astype(np.float64),
+    }
+
+
+def _rank_distance(column: np.ndarray, value: float, target: float) -> float:
+    """
+    :return: the distance from :code:`target` to the interval of ranks of
+            :code:`value` in the sorted :code:`column`
+    """
+    low = np.searchsorted(column, value, side='left') + 1
+    high = np.searchsorted(column, value, side='right')
+    return max(low - target, target - high, 0.)
+
+
+def check_sketch(sizes: Sequence[int]=(1_000, 20_000, 100_000), ks: Sequence[int]=(16, 64, 256),
+        shards: int=4, batches: int=10) -> Tuple[List[str], bool]:
+    """
+    Stream every input in :code:`batches` batches into :code:`shards`
+    :py:class:`xtensors.QuantileSketch`, merge them, and check that the rank
+    of each returned quantile is within :py:attr:`rank_error` of :math:`q n`.
+
+    :return: the report lines and whether the check passed
+    """
+    lines = [f'{"input":>10} {"n":>8} {"k":>5} {"rank_error":>11} {"worst":>11}']
+    passed = True
+
+    for n in sizes:
+        for name, data in _streams(n).items():
+            exact = np.sort(data, axis=0)
+            for k in ks:
+                sketches = [xt.QuantileSketch('a', k=k) for _ in range(shards)]
+                for i, batch in enumerate(np.array_split(data, batches)):
+                    sketches[i % shards].update(xt.XTensor(batch, ['a', 'b']))
+                sketch = sketches[0]
+                for other in sketches[1:]: sketch.merge(other)
+
+                values = sketch.quantile(list(QS)).data
+                worst = max(_rank_distance(exact[:, j], values[i, j], q * n) / n
+                            for i, q in enumerate(QS) for j in range(data.shape[1]))
+
+                flag = ''
+                if worst > sketch.rank_error:
+                    passed = False
+                    flag = '  FAILED'
+                lines.append(f'{name:>10} {n:>8} {k:>5} {sketch.rank_error:>11.5f} {worst:>11.5f}{flag}')
+
+    return lines, passed
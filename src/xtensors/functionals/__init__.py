@@ -1,3 +1,3 @@
 from .base import Pipe, Functional, Identity
-from .reductions import Reduction, Mean, Sum, Std, Max, Min, ArgMax, ArgMin, CoordMax, CoordMin, Index
+from .reductions import Reduction, Mean, Sum, Std, Max, Min, ArgMax, ArgMin, CoordMax, CoordMin, Index, MultiStat
 
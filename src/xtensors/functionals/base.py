@@ -1,9 +1,15 @@
 from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
 
 
 from .. import tensor as xtt
 
 
+_END = object()
+
+
 class Functional:
     def __init__(self):
         self.name: str = 'NOTIMPLEMENTED_FUNCTIONAL'
@@ -11,6 +17,60 @@ class Functional:
     def __call__(self, x: xtt.TensorLike) -> xtt.XTensor:
         raise NotImplementedError
 
+    async def acall(self, x: xtt.TensorLike, *, executor: Executor|None=None) -> xtt.XTensor:
+        '''
+            Run the functional on a worker thread, so that the event loop is
+            free while NumPy computes. The result is that of the synchronous call.
+
+            :param executor: the loop's default executor if None
+        '''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self, x)
+
+    async def astream(self, source: AsyncIterable[xtt.TensorLike]|Iterable[xtt.TensorLike], *,
+            prefetch: int=2, executor: Executor|None=None) -> AsyncIterator[xtt.XTensor]:
+        '''
+            Apply the functional to each input of :code:`source`, in order.
+            Up to :code:`prefetch` inputs are read ahead while the current one
+            is computed; reading stops while the queue is full. A synchronous
+            :code:`source` is read on the executor, as its reads may block.
+
+            :param executor: the loop's default executor if None
+        '''
+        if prefetch < 1:
+            raise ValueError(f'prefetch should be at least 1, received {prefetch}')
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=prefetch)
+
+        async def _read() -> None:
+            try:
+                if isinstance(source, AsyncIterable):
+                    async for x in source:
+                        await queue.put(x)
+                else:
+                    it = iter(source)
+                    while (x := await loop.run_in_executor(executor, next, it, _END)) is not _END:
+                        await queue.put(x)
+            except Exception as e:
+                await queue.put(_Failure(e))
+            else:
+                await queue.put(_END)
+
+        reader = asyncio.create_task(_read())
+        try:
+            while (x := await queue.get()) is not _END:
+                if isinstance(x, _Failure): raise x.error
+                yield await loop.run_in_executor(executor, self, x)
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
 
 class Identity(Functional):
     def __init__(self, name='I'):
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Sequence
 
 from xtensors.functionals.base import Functional
 from xtensors import base
@@ -91,3 +92,18 @@ class CoordMin(Reduction):
         super().__init__(dim)
         self._reduce = base.nancoordmin if nan else base.coordmin
         self.name = f'CoordMin({dim})'
+
+
+class MultiStat(Reduction):
+    '''
+    Several statistics over the same dims in one pass, see :py:func:`xtensors.describe`
+    '''
+    def __init__(self, dim: xtt.DimLike|xtt.DimsLike,
+            stats: Sequence[str]=('mean', 'std', 'min', 'max', 'count'), nan: bool=False) -> None:
+        super().__init__(dim)
+        self.stats = list(stats)
+        self.nan = nan
+        self.name = f'MultiStat({dim})'
+
+    def __call__(self, x: xtt.TensorLike) -> xtt.XTensor:
+        return base.describe(x, self.dim, self.stats, nan=self.nan)
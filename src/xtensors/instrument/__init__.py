@@ -0,0 +1,6 @@
+'''
+Per-operation instrumentation: timing of public operations split into NumPy
+kernel time and broadcasting/metadata overhead, and bytes allocated by kernels.
+'''
+from ._hooks import OpEvent, Hook, add_hook, remove_hook, instrumented, kernel
+from ._profiler import Profiler, OpStats, profile
@@ -0,0 +1,171 @@
+from __future__ import annotations
+'''
+Instrumentation hooks:
+    Public operations are decorated with @instrumented(name) and the NumPy
+    calls inside them with @kernel. While no hook is registered, both
+    wrappers check the hook list and call through, at the cost of one extra
+    Python call. The wrapped functions are captured in closures and module
+    globals at import time, so the wrappers stay in place rather than being
+    swapped in and out when hooks are added.
+
+'''
+from functools import wraps
+from time import perf_counter
+import threading
+
+from typing import TYPE_CHECKING, Any, Callable, List, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from typing_extensions import ParamSpec
+    O = ParamSpec('O')
+    R = TypeVar('R')
+
+
+class OpEvent:
+    """
+    Emitted to every registered hook when an instrumented operation returns.
+    """
+    __slots__ = ('name', 'elapsed', 'kernel', 'nbytes', 'depth')
+
+    def __init__(self, name: str, elapsed: float, kernel: float, nbytes: int, depth: int) -> None:
+        self.name = name
+        '''name of the operation, e.g. :code:`sum` or :code:`broadcast.vanilla`'''
+        self.elapsed = elapsed
+        '''total wall time in seconds, including nested operations'''
+        self.kernel = kernel
+        '''time spent inside NumPy kernels'''
+        self.nbytes = nbytes
+        '''bytes of the arrays newly allocated by the kernels'''
+        self.depth = depth
+        '''nesting depth, 0 for operations called directly by the user'''
+
+    @property
+    def overhead(self) -> float:
+        """
+        Time spent outside NumPy kernels, i.e. in broadcasting and metadata handling
+        """
+        return self.elapsed - self.kernel
+
+    def __repr__(self) -> str:
+        return (f'OpEvent(name={self.name!r}, elapsed={self.elapsed:.3g}, '
+                f'kernel={self.kernel:.3g}, nbytes={self.nbytes}, depth={self.depth})')
+
+
+class Hook(Protocol):
+    """
+    Instrumentation hook protocol
+    """
+    def __call__(self, event: OpEvent, /) -> None: ...
+
+
+class _Frame:
+    __slots__ = ('kernel', 'nbytes')
+
+    def __init__(self) -> None:
+        self.kernel = 0.
+        self.nbytes = 0
+
+
+_hooks: List[Hook] = []
+
+_local = threading.local()
+
+
+def _frames() -> List[_Frame]:
+    try:
+        return _local.frames
+    except AttributeError:
+        _local.frames = []
+        return _local.frames
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Register a hook that is called with an :py:class:`OpEvent` after every
+    instrumented operation.
+
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Unregister a hook added with :py:func:`add_hook`
+    """
+    _hooks.remove(hook)
+
+
+def _root(a: Any) -> Any:
+    while True:
+        base = getattr(a, 'base', None)
+        if base is None or not hasattr(base, 'nbytes'): return a
+        a = base
+
+
+def _allocated(r: Any, inputs: tuple) -> int:
+    if isinstance(r, tuple):
+        return sum(_allocated(x, inputs) for x in r)
+    if not hasattr(r, 'nbytes'):
+        return 0
+
+    # results that are views of an input (or of an out= buffer) were not
+    # allocated by the kernel
+    root = _root(r)
+    for x in inputs:
+        if hasattr(x, 'nbytes') and _root(x) is root: return 0
+    return root.nbytes
+
+
+def instrumented(name: str) -> Callable[[Callable[O, R]], Callable[O, R]]:
+    """
+    Mark a function as a public operation reported to hooks under :code:`name`
+    """
+    def wrapper(f: Callable[O, R]) -> Callable[O, R]:
+        @wraps(f)
+        def wrapped(*args: O.args, **kwargs: O.kwargs) -> R:
+            if not _hooks:
+                return f(*args, **kwargs)
+
+            frames = _frames()
+            frame = _Frame()
+            frames.append(frame)
+            try:
+                t0 = perf_counter()
+                r = f(*args, **kwargs)
+                elapsed = perf_counter() - t0
+            finally:
+                frames.pop()
+
+            if frames:
+                frames[-1].kernel += frame.kernel
+                frames[-1].nbytes += frame.nbytes
+
+            event = OpEvent(name, elapsed, frame.kernel, frame.nbytes, len(frames))
+            for hook in list(_hooks):
+                hook(event)
+            return r
+        return wrapped
+    return wrapper
+
+
+def kernel(f: Callable[O, R]) -> Callable[O, R]:
+    """
+    Mark a function as a NumPy kernel. Its run time and the size of the
+    arrays it returns are attributed to the enclosing instrumented operation.
+
+    """
+    @wraps(f)
+    def wrapped(*args: O.args, **kwargs: O.kwargs) -> R:
+        if not _hooks:
+            return f(*args, **kwargs)
+
+        frames = _frames()
+        if not frames:
+            return f(*args, **kwargs)
+
+        t0 = perf_counter()
+        r = f(*args, **kwargs)
+        frames[-1].kernel += perf_counter() - t0
+        frames[-1].nbytes += _allocated(r, args + tuple(kwargs.values()))
+        return r
+    return wrapped
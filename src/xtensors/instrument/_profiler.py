@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from ._hooks import add_hook, remove_hook
+
+from typing import TYPE_CHECKING, Dict, Literal
+
+if TYPE_CHECKING:
+    from ._hooks import OpEvent
+
+    SortKey = Literal['calls', 'total', 'kernel', 'overhead', 'nbytes', 'name']
+
+
+class OpStats:
+    """
+    Accumulated statistics of a single operation
+    """
+    __slots__ = ('calls', 'total', 'kernel', 'nbytes')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.
+        self.kernel = 0.
+        self.nbytes = 0
+
+    @property
+    def overhead(self) -> float:
+        return self.total - self.kernel
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(calls=self.calls, total=self.total, kernel=self.kernel,
+                    overhead=self.overhead, nbytes=self.nbytes)
+
+
+class Profiler:
+    """
+    A hook that aggregates :py:class:`OpEvent` s per operation. Use as a context
+    manager to register it only within a block:
+
+    .. code::
+
+        with xt.profile() as p:
+            ...
+        print(p.report())
+
+    Times are inclusive: an operation calling other instrumented operations
+    (e.g. :code:`add` calling :code:`broadcast.vanilla`) includes their time.
+
+    """
+    def __init__(self) -> None:
+        self.stats: Dict[str, OpStats] = dict()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: OpEvent, /) -> None:
+        with self._lock:
+            try:
+                stats = self.stats[event.name]
+            except KeyError:
+                stats = self.stats[event.name] = OpStats()
+
+            stats.calls += 1
+            stats.total += event.elapsed
+            stats.kernel += event.kernel
+            stats.nbytes += event.nbytes
+
+    def __enter__(self) -> Profiler:
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        remove_hook(self)
+
+    def clear(self) -> None:
+        """
+        Discard all collected statistics
+        """
+        with self._lock:
+            self.stats.clear()
+
+    def to_dict(self, sort: SortKey='total') -> Dict[str, Dict[str, float]]:
+        """
+        :return: a dict mapping operation names to their statistics, ordered by :code:`sort`
+        """
+        if sort == 'name':
+            names = sorted(self.stats)
+        else:
+            names = sorted(self.stats, key=lambda name: getattr(self.stats[name], sort), reverse=True)
+        return {name: self.stats[name].to_dict() for name in names}
+
+    def report(self, sort: SortKey='total', fmt: Literal['text', 'json']='text') -> str:
+        """
+        :param sort: column to sort by, in descending order (ascending for :code:`name`)
+        :param fmt: :code:`text` for a table or :code:`json`
+
+        """
+        stats = self.to_dict(sort)
+        if fmt == 'json':
+            return json.dumps(stats, indent=2)
+
+        width = max([len(name) for name in stats] + [2])
+        lines = [f'{"op":{width}}  {"calls":>8}  {"total(s)":>10}  {"kernel(s)":>10}  {"overhead(s)":>11}  {"bytes":>12}']
+        for name, s in stats.items():
+            lines.append(
+                f'{name:{width}}  {s["calls"]:>8}  {s["total"]:>10.4g}  {s["kernel"]:>10.4g}  '
+                f'{s["overhead"]:>11.4g}  {s["nbytes"]:>12}')
+        return '\n'.join(lines)
+
+    def __repr__(self) -> str:
+        return self.report()
+
+
+def profile() -> Profiler:
+    """
+    :return: a new :py:class:`Profiler`, meant to be used as a context manager
+
+    """
+    return Profiler()
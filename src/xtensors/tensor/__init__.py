@@ -3,7 +3,28 @@ from ._base import XTensor
 
 from ._decors import promote_binary_operator, promote_ternary_operator
 
-from ._slice import TensorSlice, MetaTensorSlice
+from ._lazycoord import LazyCoord, MultiIndexCoord, RangeCoord, CategoricalCoord
+
+from ._slice import TensorSlice, MetaTensorSlice, SingleIndex, ArrayIndex
+
+from ._sparse import SparseXTensor, tosparse
+
+from ._masked import MaskedXTensor, masked
+
+from ._categorical import CategoricalXTensor
+
+from ._shared import SharedXTensor, shared
+
+from ._dataset import XDataset
+
+from ._interop import from_xarray, from_pandas
+
+from ._validation import validation, set_validation, get_validation
+
+from ._precision import Precision, precision, set_precision, get_precision
+
+from ._memory import (memory_report, MemoryReport, TensorMemory,
+        memory_tracking, set_memory_tracking, get_memory_tracking, resident_nbytes)
 
 from .broadcast import *
 
@@ -6,28 +6,42 @@ from .broadcast import vanilla_broadcaster
 
 from ._decors import promote_binary_operator
 
+from ..instrument import instrumented
+
 from .basic_utils._base import to_xtensor
 from .basic_utils._misc import strip
 
 from ._slice import TensorIndexer
 
+from ._lazycoord import LazyCoord
+
+from . import _validation
+
+from . import _memory
+
 from typing import TYPE_CHECKING
 
 from .typing import DimLike, DimsLike, TensorLike, Array
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
-    from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+    from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
     from .broadcast import Broadcaster
     from .typing import BinaryOperator
+    from ._sparse import SparseXTensor
 
 def inject_broadcast(broadcaster: Broadcaster):
     promote = promote_binary_operator(broadcaster)
     def wrapper(f: Callable[[XTensor], BinaryOperator[np.ndarray]]
         ):
+        @instrumented(f'XTensor.{f.__name__}')
         def wrapped(self: XTensor, other: TensorLike, /) -> XTensor:
             binop = promote(f(self))
             if isinstance(other, XTensor):
+                if type(other) is not type(self) and isinstance(other, type(self)):
+                    # let subclasses with their own storage (e.g. SparseXTensor)
+                    # handle mixed operands through the reflected operator
+                    return NotImplemented
                 return binop(self, other)
             try:
                 return binop(self, to_xtensor(other))
@@ -37,6 +51,29 @@ def inject_broadcast(broadcaster: Broadcaster):
     return wrapper
 
 
+def _rebuild(data: Array, dims: Sequence[str|None], coords: Sequence[NDArray[Any]|None]) -> XTensor:
+    return XTensor._derive(data, dims, coords)
+
+
+def _index_key(key: Any, size: int, axis: int) -> int|slice|NDArray[np.intp]:
+    if isinstance(key, (slice, int, np.integer)): return key
+
+    key = np.asarray(key)
+    if key.ndim != 1:
+        raise ValueError(f'Index arrays should be 1D, but received shape {key.shape} for axis {axis}')
+
+    if key.dtype == np.bool_:
+        if len(key) != size:
+            raise IndexError(f'Boolean index of length {len(key)} for axis {axis} with size {size}')
+        return np.flatnonzero(key)
+
+    if key.dtype.kind not in 'iu':
+        if len(key) > 0:
+            raise IndexError(f'Index arrays should be integers or booleans, but received {key.dtype}')
+        key = key.astype(np.intp)
+    return key
+
+
 class XTensor:
     r"""
     A wrapper class of :code:`np.ndarray` that attaches names to each axis.
@@ -66,13 +103,45 @@ class XTensor:
         self.set_dims(dims)
         self.set_coords(coords)
 
+        if _memory._registry is not None: _memory._register(self)
+
+    @staticmethod
+    def _derive(data: Array,
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[NDArray[Any]|None]]=None,
+    ) -> XTensor:
+        r"""
+        Construct an :code:`XTensor` from metadata taken from already validated
+        tensors. Unless the validation level is :code:`full`, the checks in
+        :py:meth:`set_dims` and :py:meth:`set_coords` are skipped and the
+        coordinate arrays are shared instead of copied.
+
+        """
+        if _validation._level == 'full':
+            return XTensor(data, dims, coords)
+
+        X = XTensor.__new__(XTensor)
+        X.data = data.__array__()
+        rank = X.data.ndim
+
+        X._dims = [None] * rank if dims is None else list(dims)
+        X._coords = [None] * rank if coords is None else list(coords)
+        X._dim_axis_dict = {dim: axis for axis, dim in enumerate(X._dims) if dim is not None}
+
+        # merging dimensions of two tensors may still produce duplicates
+        if len(X._dim_axis_dict) != rank - X._dims.count(None):
+            raise ValueError(f'Duplicate dimension names in {X._dims}')
+
+        if _memory._registry is not None: _memory._register(X)
+        return X
+
     def viewcopy(self) -> XTensor:
         r"""
         :return: a new :code:`XTensor` object with the *same* underlying :code:`data`. 
                 Useful when one wishes to attach different metadata to the same array.
 
         """
-        return XTensor(self.data, self.dims, self.coords)
+        return XTensor._derive(self.data, self._dims, self._coords)
     
     def item(self) -> float:
         r"""
@@ -109,12 +178,37 @@ class XTensor:
         """
         return self.data.shape
 
+    def _buffers(self) -> List[NDArray[Any]]:
+        """
+        :return: the arrays holding the entries of the tensor
+        """
+        return [self.data]
+
+    @property
+    def nbytes(self) -> int:
+        r"""
+        Bytes addressed by the entries of the tensor, as :code:`data.nbytes`.
+        Views count the bytes they address even if they share their buffer,
+        see :py:func:`xtensors.memory_report`.
+
+        """
+        return sum(a.nbytes for a in self._buffers())
+
+    @property
+    def coords_nbytes(self) -> int:
+        r"""
+        Bytes of the coordinate arrays; lazy coordinates count the arrays
+        they keep.
+
+        """
+        return sum(0 if coord is None else coord.nbytes for coord in self._coords)
+
     @property
     def rank(self) -> int:
         r"""
         Number of axes, same as :code:`data.ndim`
         """
-        return len(self.data.shape)
+        return len(self.shape)
 
     def get_axis(self, dim: DimLike) -> int:
         r"""
@@ -180,10 +274,10 @@ class XTensor:
 
         """
         if dims is None:
-            self._dims = [None for _ in self.data.shape]
+            self._dims = [None for _ in self.shape]
         else:
-            if len(dims) != len(self.data.shape):
-                raise ValueError(f'Invalid dimension names {dims} for tensor with shape {self.data.shape}')
+            if len(dims) != len(self.shape):
+                raise ValueError(f'Invalid dimension names {dims} for tensor with shape {self.shape}')
 
             if '' in dims:
                 raise ValueError(f'Invalid dimension names {dims}')
@@ -225,20 +319,20 @@ class XTensor:
         """
 
         if coords is None:
-            self._coords = [None for _ in self.data.shape]
+            self._coords = [None for _ in self.shape]
         else:
             coords_clean: List[NDArray[Any]|None] = []
-            if len(coords) != len(self.data.shape):
-                raise ValueError(f'Received {len(coords)} coordinates for tensor with shape {self.data.shape}')
+            if len(coords) != len(self.shape):
+                raise ValueError(f'Received {len(coords)} coordinates for tensor with shape {self.shape}')
 
             for axis, coord in enumerate(coords):
                 if coord is not None:
-                    if len(coord) != self.data.shape[axis]:
+                    if len(coord) != self.shape[axis]:
                         raise ValueError(
                                 f'Received coordinates with {len(coord)} elements at axis {axis} '+
-                                f'for tensor with shape {self.data.shape}')
+                                f'for tensor with shape {self.shape}')
 
-                    coords_clean.append(np.array(coords[axis]))
+                    coords_clean.append(coord if isinstance(coord, LazyCoord) else np.array(coord))
                 else:
                     coords_clean.append(None)
             self._coords = coords_clean
@@ -254,7 +348,7 @@ class XTensor:
         if coord is None:
             new_coords[axis] = None
         else:
-            new_coords[axis] = np.array(coord)
+            new_coords[axis] = coord if isinstance(coord, LazyCoord) else np.array(coord)
         self.set_coords(new_coords)
 
 
@@ -275,7 +369,7 @@ class XTensor:
         if coord is not None:
             coords[axis] = coord[slc]
 
-        return XTensor(data, dims=self.dims, coords=coords)
+        return XTensor._derive(data, self._dims, coords)
 
 
     def get(self, dim: DimLike, index: int) -> XTensor:
@@ -293,19 +387,126 @@ class XTensor:
         dims = strip(self.dims, [axis])
         coords = strip(self.coords, [axis])
         
-        return XTensor(data, dims=dims, coords=coords)
+        return XTensor._derive(data, dims, coords)
+
+    def isel(self, indexers: Optional[Mapping[DimLike, Any]]=None, /, **dim_indexers: Any) -> XTensor:
+        r"""
+        Index multiple dimensions at once, e.g.
+        :code:`X.isel(H=slice(0, 64), W=[0, 2, 4], batch=mask)`.
+
+        Each dimension is indexed with an integer (the dimension is removed), a
+        slice, a 1D array of integers, or a 1D boolean mask. Index arrays
+        select independently along their own dimension (outer indexing, like
+        :code:`np.ix_`).
+
+        Integers and slices are applied as a single view of :code:`data`; all
+        index arrays together are applied in one further indexing operation.
+        Coordinates are sliced once.
+
+        :param indexers: a mapping from :code:`DimLike` objects to indices,
+                for dimensions that cannot be passed as keywords
+
+        :return: A new XTensor object
+
+        """
+        basic, arrays, dims, coords = self._isel_plan(indexers, dim_indexers)
+        return XTensor._derive(XTensor._isel_apply(self.data, basic, arrays), dims, coords)
+
+    def _isel_plan(self, indexers: Optional[Mapping[DimLike, Any]], dim_indexers: Mapping[str, Any],
+        ) -> Tuple[List[Any], Dict[int, NDArray[np.intp]], List[str|None], List[Any]]:
+        """
+        Resolve the indexers of :py:meth:`isel`
+
+        :return: the basic indexing key of :code:`data`, the index arrays by
+                axis of its result, and the dims and coordinates of the result
+        """
+        keys: Dict[int, Any] = dict()
+        for dim, key in [*(indexers or dict()).items(), *dim_indexers.items()]:
+            axis = self.get_axis(dim)
+            if axis in keys:
+                raise ValueError(f'Dimension {dim} is indexed more than once')
+            keys[axis] = _index_key(key, self.shape[axis], axis)
+
+        basic: List[Any] = []
+        arrays: Dict[int, NDArray[np.intp]] = dict()
+        dims, coords = [], []
+        for axis in range(self.rank):
+            key = keys.get(axis, slice(None))
+            coord = self._coords[axis]
+
+            if isinstance(key, np.ndarray):
+                basic.append(slice(None))
+                arrays[len(dims)] = key
+            else:
+                basic.append(key)
+                if not isinstance(key, slice): continue
+
+            dims.append(self._dims[axis])
+            coords.append(coord[key] if coord is not None else None)
+
+        return basic, arrays, dims, coords
+
+    @staticmethod
+    def _isel_apply(data: NDArray[Any], basic: List[Any], arrays: Dict[int, NDArray[np.intp]]) -> NDArray[Any]:
+        data = data[tuple(basic)]
+
+        if len(arrays) == 1:
+            (axis, key), = arrays.items()
+            data = data[(slice(None),) * axis + (key,)]
+        elif len(arrays) > 1:
+            data = data[np.ix_(*[arrays[axis] if axis in arrays else np.arange(n)
+                                 for axis, n in enumerate(data.shape)])]
+        return data
 
     def __getitem__(self, slices: TensorIndexer|Tuple[TensorIndexer,...]) -> XTensor:
         """
 
         """
         if isinstance(slices, tuple):
+            dims = [indexer.dimname for indexer in slices]
+            if len(set(dims)) == len(dims):
+                return self.isel({indexer.dimname: indexer.key for indexer in slices})
+
             _Y = slices[0].index(self)
             if len(slices) == 1: 
                 return _Y
             return _Y.__getitem__(tuple(slices[1:]))
         return slices.index(self)
 
+    def tosparse(self) -> SparseXTensor:
+        r"""
+        :return: a :py:class:`xtensors.SparseXTensor` holding the nonzero
+                entries of :code:`data`
+
+        """
+        from ._sparse import tosparse
+        return tosparse(self)
+
+    def to_xarray(self) -> Any:
+        r"""
+        :return: an :code:`xarray.DataArray` sharing :code:`data`, see
+                :py:func:`xtensors.from_xarray`
+
+        """
+        from ._interop import to_xarray
+        return to_xarray(self)
+
+    def to_pandas(self) -> Any:
+        r"""
+        :return: a :code:`pandas.Series` (1D) or :code:`pandas.DataFrame` (2D)
+                sharing :code:`data`, see :py:func:`xtensors.from_pandas`
+
+        """
+        from ._interop import to_pandas
+        return to_pandas(self)
+
+    def __reduce_ex__(self, protocol: Any):
+        if type(self) is not XTensor:
+            return super().__reduce_ex__(protocol)
+        # with protocol 5 the data array is handed to buffer_callback out of
+        # band instead of being copied into the pickle
+        return (_rebuild, (self.data, self._dims, self._coords))
+
     def __repr__(self):
         _repr = 'Tensor\n'
         _repr += f'shape={self.shape}\n'
@@ -324,7 +525,7 @@ class XTensor:
         return _repr
 
     def __neg__(self) -> XTensor:
-        return XTensor(data=-self.data, dims=self._dims, coords=self._coords)
+        return XTensor._derive(-self.data, self._dims, self._coords)
 
     @inject_broadcast(vanilla_broadcaster)
     def __add__(self): return lambda X, Y: X+Y
@@ -0,0 +1,146 @@
+from __future__ import annotations
+'''
+Categorical tensors:
+    Named tensors of labels stored as integer codes into a table of
+    categories, as returned by coordinate functions over a
+    CategoricalCoord. Structural operations select codes and keep the table;
+    labels are only built by an explicit call to labels().
+
+'''
+import numpy as np
+
+from ._base import XTensor
+
+from ._lazycoord import CategoricalCoord
+
+from .basic_utils import permute
+
+from . import _memory
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from typing import Any, Callable, List, Mapping, Optional, Sequence
+    from .typing import AxesPermutation, DimLike
+
+
+class CategoricalXTensor(XTensor):
+    r"""
+    A named tensor whose :code:`data` holds integer codes into
+    :code:`categories`.
+
+    :py:meth:`get`, :py:meth:`slc`, :py:meth:`isel` and
+    :py:func:`xtensors.permute` keep the categories; other operations see the
+    codes, call :py:meth:`labels` first.
+
+    """
+    def __init__(self, codes: Any, categories: Any,
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[Sequence[Any]|NDArray[Any]|None]]=None,
+    ) -> None:
+        """
+        :param codes: integer array of positions in :code:`categories`
+        :param categories: 1D array of labels
+        :param dims: same as :py:class:`xtensors.XTensor`
+        :param coords: same as :py:class:`xtensors.XTensor`
+
+        """
+        super().__init__(codes, dims, coords)
+
+        if self.data.dtype.kind not in 'iu':
+            raise TypeError(f'Codes should be integers, but received {self.data.dtype}')
+        self.categories: NDArray[Any] = np.asarray(categories)
+        if self.categories.ndim != 1:
+            raise ValueError(f'Categories should be 1D, received shape {self.categories.shape}')
+
+    @staticmethod
+    def _wrap(X: XTensor, categories: NDArray[Any]) -> CategoricalXTensor:
+        """
+        Attach already validated :code:`categories` to the codes of :code:`X`,
+        sharing its data and metadata
+        """
+        C = CategoricalXTensor.__new__(CategoricalXTensor)
+        C.data, C._dims, C._coords, C._dim_axis_dict = X.data, X._dims, X._coords, X._dim_axis_dict
+        C.categories = categories
+
+        if _memory._registry is not None: _memory._register(C)
+        return C
+
+    def _buffers(self) -> List[NDArray[Any]]:
+        return [self.data, self.categories]
+
+    @property
+    def codes(self) -> NDArray[np.integer]:
+        """
+        Same as :code:`data`
+        """
+        return self.data
+
+    def labels(self) -> XTensor:
+        r"""
+        :return: an :py:class:`xtensors.XTensor` of the labels, in a newly
+                allocated array
+
+        """
+        return XTensor._derive(self.categories[self.data], self._dims, self._coords)
+
+    def code(self, label: Any) -> int:
+        """
+        :return: the code of :code:`label`, e.g. to compare :code:`codes` with it
+
+        :raises: :code:`KeyError` if :code:`label` is not a category
+        """
+        return CategoricalCoord(np.zeros(0, dtype=np.intp), self.categories).code(label)
+
+    def _codes(self) -> XTensor:
+        return XTensor._derive(self.data, self._dims, self._coords)
+
+    def _map(self, op: Callable[[XTensor], XTensor]) -> CategoricalXTensor:
+        return CategoricalXTensor._wrap(op(self._codes()), self.categories)
+
+    def viewcopy(self) -> CategoricalXTensor:
+        return CategoricalXTensor._wrap(self._codes(), self.categories)
+
+    def permute(self, axes: AxesPermutation) -> CategoricalXTensor:
+        r"""
+        Categorical counterpart of :py:func:`xtensors.permute`
+
+        """
+        return self._map(lambda X: permute(X, axes))
+
+    def slc(self, dim: DimLike, slc: slice) -> CategoricalXTensor:
+        return self._map(lambda X: X.slc(dim, slc))
+
+    def get(self, dim: DimLike, index: int) -> CategoricalXTensor:
+        return self._map(lambda X: X.get(dim, index))
+
+    def isel(self, indexers: Optional[Mapping[DimLike, Any]]=None, /, **dim_indexers: Any) -> CategoricalXTensor:
+        return self._map(lambda X: X.isel(indexers, **dim_indexers))
+
+    def __repr__(self):
+        _repr = 'CategoricalTensor\n'
+        _repr += f'shape={self.shape}\n'
+        _repr += f'dims={self.dims}\n'
+        _repr += f'categories={len(self.categories)}\n'
+
+        _repr += f'coords:\n'
+        for axis, coord in enumerate(self.coords):
+            if coord is None:
+                _repr += f'{axis}: None\n'
+            if coord is not None:
+                _repr += f'{axis}: {coord[0]}..{coord[-1]}\n'
+
+        _repr += self.data.__repr__()
+        return _repr
+
+
+def take_coord(coord: Any, index: NDArray[np.intp], dims: Sequence[str|None],
+        coords: Sequence[Any]) -> XTensor:
+    """
+    :return: the coordinates at positions :code:`index`, as a
+            :py:class:`xtensors.CategoricalXTensor` for a categorical coordinate
+    """
+    if isinstance(coord, CategoricalCoord):
+        return CategoricalXTensor._wrap(XTensor._derive(coord.codes[index], dims, coords), coord.categories)
+    return XTensor._derive(coord[index], dims, coords)
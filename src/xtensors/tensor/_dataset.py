@@ -0,0 +1,399 @@
+from __future__ import annotations
+'''
+Datasets:
+    An XDataset holds variables of the same layout as plain arrays, with a
+    single copy of their dims and coordinates. Batched operations resolve
+    axes, indexers and output metadata once for the layout, then run the
+    per-variable kernels, on a thread pool for large datasets. Variables are
+    saved as one .npy file each, so that they can be loaded as memory maps.
+
+'''
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ._base import XTensor
+
+from .basic_utils._coords import coords_same
+
+from . import _validation
+
+from . import _memory
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from typing import (Any, Callable, Dict, Iterator, List, Literal, Mapping,
+            Optional, Sequence, Tuple, TypeVar)
+    from .typing import Array, DimLike, DimsLike
+
+    T = TypeVar('T')
+    R = TypeVar('R')
+
+
+_WORKERS = os.cpu_count() or 1
+"""number of threads running the kernels of large datasets"""
+
+_PARALLEL = 2**20
+"""minimum number of entries over all variables for the kernels to run on several threads"""
+
+_META = 'dataset.pkl'
+"""file of the dims, coordinates and variable names in a saved dataset"""
+
+
+def _run(func: Callable[[T], R], items: List[T], workers: Optional[int], size: int) -> List[R]:
+    if workers is None:
+        workers = _WORKERS if size >= _PARALLEL else 1
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(func, items))
+
+
+class XDataset:
+    r"""
+    Named variables sharing the dims and coordinates of a single layout, e.g.
+
+    .. code-block:: python
+
+        ds = xt.XDataset({'signal': signal, 'mask': mask}, ['batch', 'time', 'sensor'])
+        means = ds.mean('time')
+        means['signal']     # an XTensor with dims ('batch', 'sensor')
+
+    Variables may have different dtypes. Indexing the dataset by name returns
+    an :py:class:`xtensors.XTensor` sharing the data and coordinates of the
+    dataset.
+
+    """
+    def __init__(self, variables: Mapping[str, Array|XTensor],
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[Sequence[Any]|NDArray[Any]|None]]=None,
+    ) -> None:
+        """
+        :param variables: arrays or tensors by name, all of the same shape
+        :param dims: same as :py:class:`xtensors.XTensor`, taken from the
+                first variable if it is a tensor and :code:`dims` is not given
+        :param coords: same as :py:class:`xtensors.XTensor`, taken from the
+                first variable if it is a tensor and neither :code:`dims` nor
+                :code:`coords` is given
+
+        :raises: :code:`ValueError` if there are no variables, or if they do
+                not match the layout of the dataset
+
+        """
+        if not variables:
+            raise ValueError('A dataset needs at least one variable to define its shape')
+
+        first = next(iter(variables.values()))
+        if isinstance(first, XTensor) and dims is None:
+            dims = first.dims
+            if coords is None: coords = first.coords
+
+        shape = first.shape if isinstance(first, XTensor) else first.__array__().shape
+        self._layout = XTensor(_template(shape), dims, coords)
+
+        self._variables: Dict[str, NDArray[Any]] = dict()
+        for name, value in variables.items():
+            self[name] = value
+
+        if _memory._registry is not None: _memory._register(self) # type: ignore
+
+    @staticmethod
+    def _wrap(variables: Dict[str, NDArray[Any]], shape: Tuple[int,...],
+            dims: Sequence[str|None], coords: Sequence[Any]) -> XDataset:
+        """
+        Build a dataset from already validated arrays and metadata
+        """
+        ds = XDataset.__new__(XDataset)
+        ds._variables = variables
+        ds._layout = XTensor._derive(_template(shape), dims, coords)
+
+        if _memory._registry is not None: _memory._register(ds) # type: ignore
+        return ds
+
+    @property
+    def dims(self) -> Tuple[str|None,...]:
+        """
+        Dimension names shared by the variables
+        """
+        return self._layout.dims
+
+    @property
+    def coords(self) -> Tuple[NDArray[Any]|None,...]:
+        """
+        Coordinates shared by the variables
+        """
+        return self._layout.coords
+
+    @property
+    def shape(self) -> Tuple[int,...]:
+        """
+        Shape shared by the variables
+        """
+        return self._layout.shape
+
+    @property
+    def rank(self) -> int:
+        return self._layout.rank
+
+    def get_axis(self, dim: DimLike) -> int:
+        """
+        Same as :py:meth:`xtensors.XTensor.get_axis`
+        """
+        return self._layout.get_axis(dim)
+
+    def get_axes(self, dims: DimLike|DimsLike|None) -> List[int]:
+        """
+        Same as :py:meth:`xtensors.XTensor.get_axes`
+        """
+        return self._layout.get_axes(dims)
+
+    @property
+    def variables(self) -> Dict[str, NDArray[Any]]:
+        """
+        The arrays of the variables by name, in insertion order
+        """
+        return dict(self._variables)
+
+    @property
+    def _coords(self) -> List[Any]:
+        return self._layout._coords
+
+    def _buffers(self) -> List[NDArray[Any]]:
+        return list(self._variables.values())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes addressed by the arrays of the variables; datasets can be passed
+        to :py:func:`xtensors.memory_report` like tensors
+        """
+        return sum(a.nbytes for a in self._variables.values())
+
+    @property
+    def coords_nbytes(self) -> int:
+        """
+        Same as :py:attr:`xtensors.XTensor.coords_nbytes`, the coordinates
+        being stored once for all variables
+        """
+        return self._layout.coords_nbytes
+
+    def __getitem__(self, name: str) -> XTensor:
+        return XTensor._derive(self._variables[name], self._layout._dims, self._layout._coords)
+
+    def _view(self, data: NDArray[Any]) -> XTensor:
+        """
+        A transient tensor over :code:`data` with the metadata of the layout,
+        which are not validated again
+        """
+        X = XTensor.__new__(XTensor)
+        X.data = data
+        X._dims = self._layout._dims.copy()
+        X._coords = self._layout._coords.copy()
+        X._dim_axis_dict = self._layout._dim_axis_dict.copy()
+        return X
+
+    def __setitem__(self, name: str, value: Array|XTensor) -> None:
+        """
+        Add or replace a variable. Tensors should have the dims and
+        coordinates of the dataset, or no coordinates.
+        """
+        if isinstance(value, XTensor):
+            if value.dims != self.dims:
+                raise ValueError(f'Variable {name} has dims {value.dims}, expected {self.dims}')
+            if _validation._level != 'off' and \
+                    not coords_same(value._coords, self._layout._coords, none_compatible=True):
+                raise ValueError(f'Coordinates of variable {name} differ from the dataset')
+            data = value.data
+        else:
+            data = value.__array__()
+
+        if data.shape != self.shape:
+            raise ValueError(f'Variable {name} has shape {data.shape}, expected {self.shape}')
+        self._variables[name] = data
+
+    def __delitem__(self, name: str) -> None:
+        del self._variables[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._variables
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._variables)
+
+    def __len__(self) -> int:
+        return len(self._variables)
+
+    def _size(self) -> int:
+        return sum(a.size for a in self._variables.values())
+
+    def isel(self, indexers: Optional[Mapping[DimLike, Any]]=None, /, **dim_indexers: Any) -> XDataset:
+        r"""
+        Index every variable as in :py:meth:`xtensors.XTensor.isel`. The
+        indexers and the coordinates of the result are resolved once.
+
+        :return: a new :py:class:`xtensors.XDataset`
+
+        """
+        basic, arrays, dims, coords = self._layout._isel_plan(indexers, dim_indexers)
+        names = list(self._variables)
+        results = _run(lambda name: XTensor._isel_apply(self._variables[name], basic, arrays),
+                       names, None, self._size() if arrays else 0)
+
+        shape = list(self._layout.data[tuple(basic)].shape)
+        for axis, key in arrays.items(): shape[axis] = len(key)
+        return XDataset._wrap(dict(zip(names, results)), tuple(shape), dims, coords)
+
+    def reduce(self, op: Callable[..., Any]|str, dim: DimLike|DimsLike|None=None, *,
+            reverse: bool=False, workers: Optional[int]=None) -> XDataset:
+        r"""
+        Apply a reduction, an arg function or a scan to every variable. The
+        operation is compiled once for the layout of the dataset, see
+        :py:func:`xtensors.compile`.
+
+        :param op: same as :py:func:`xtensors.compile`
+        :param dim: same as :py:func:`xtensors.compile`
+        :param reverse: same as :py:func:`xtensors.compile`
+        :param workers: number of threads, by default several threads for
+                large datasets only
+
+        :return: a new :py:class:`xtensors.XDataset`
+
+        """
+        from ..base._compile import compile
+
+        compiled = compile(op, self._layout._dims, dim=dim, reverse=reverse)
+        names = list(self._variables)
+        results = _run(lambda name: compiled(self._view(self._variables[name])), names, workers, self._size())
+        if not results:
+            results = [compiled(self._layout)]
+
+        Y = results[0]
+        return XDataset._wrap({name: Y.data for name, Y in zip(names, results)}, Y.shape, Y._dims, Y._coords)
+
+    def sum(self, dim: DimLike|DimsLike|None=None, *, workers: Optional[int]=None) -> XDataset:
+        """
+        Same as :code:`reduce('sum', dim)`
+        """
+        return self.reduce('sum', dim, workers=workers)
+
+    def mean(self, dim: DimLike|DimsLike|None=None, *, workers: Optional[int]=None) -> XDataset:
+        """
+        Same as :code:`reduce('mean', dim)`
+        """
+        return self.reduce('mean', dim, workers=workers)
+
+    def std(self, dim: DimLike|DimsLike|None=None, *, workers: Optional[int]=None) -> XDataset:
+        """
+        Same as :code:`reduce('std', dim)`
+        """
+        return self.reduce('std', dim, workers=workers)
+
+    def max(self, dim: DimLike|DimsLike|None=None, *, workers: Optional[int]=None) -> XDataset:
+        """
+        Same as :code:`reduce('max', dim)`
+        """
+        return self.reduce('max', dim, workers=workers)
+
+    def min(self, dim: DimLike|DimsLike|None=None, *, workers: Optional[int]=None) -> XDataset:
+        """
+        Same as :code:`reduce('min', dim)`
+        """
+        return self.reduce('min', dim, workers=workers)
+
+    def map(self, f: Callable[[XTensor], XTensor], *, workers: Optional[int]=None) -> XDataset:
+        r"""
+        Apply :code:`f` to the tensor of every variable.
+
+        :param f: a function returning tensors of the same dims for all
+                variables, whose coordinates are taken from the first result
+        :param workers: number of threads, by default several threads for
+                large datasets only
+
+        :return: a new :py:class:`xtensors.XDataset`
+
+        :raises: :code:`ValueError` if the results do not share a layout
+
+        """
+        names = list(self._variables)
+        if not names:
+            raise ValueError('Cannot map over a dataset without variables')
+        results = _run(lambda name: f(self[name]), names, workers, self._size())
+
+        first = results[0]
+        for name, Y in zip(names, results):
+            if Y.dims != first.dims or Y.shape != first.shape:
+                raise ValueError(f'Result for {name} has dims {Y.dims} and shape {Y.shape}, '
+                                 f'expected {first.dims} and {first.shape}')
+            if _validation._level != 'off' and not coords_same(Y._coords, first._coords):
+                raise ValueError(f'Coordinates of the result for {name} differ from the first result')
+
+        return XDataset._wrap({name: Y.data for name, Y in zip(names, results)},
+                              first.shape, first._dims, first._coords)
+
+    def save(self, path: str) -> None:
+        r"""
+        Save the dataset into the directory :code:`path`, created if needed:
+        one :code:`.npy` file per variable, and the dims, coordinates and
+        variable names in a pickle written last.
+
+        """
+        os.makedirs(path, exist_ok=True)
+        names = list(self._variables)
+        for i, name in enumerate(names):
+            np.save(os.path.join(path, f'{i}.npy'), self._variables[name], allow_pickle=False)
+
+        meta = {'names': names, 'dims': self._layout._dims, 'coords': self._layout._coords}
+        with open(os.path.join(path, _META), 'wb') as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str, mmap_mode: Literal['r', 'r+', 'c']|None='r') -> XDataset:
+        r"""
+        Load a dataset saved with :py:meth:`save`. By default the variables
+        are read-only memory maps, read from disk as they are accessed.
+
+        The metadata are unpickled, so only datasets from trusted sources
+        should be loaded.
+
+        :param path: directory of the dataset
+        :param mmap_mode: as in :code:`np.load`, :code:`None` to read the
+                variables into memory
+
+        :return: a new :py:class:`xtensors.XDataset`
+
+        """
+        with open(os.path.join(path, _META), 'rb') as f:
+            meta = pickle.load(f)
+
+        variables = {name: np.load(os.path.join(path, f'{i}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+                     for i, name in enumerate(meta['names'])}
+        return XDataset(variables, meta['dims'], meta['coords'])
+
+    def __repr__(self):
+        _repr = 'Dataset\n'
+        _repr += f'shape={self.shape}\n'
+        _repr += f'dims={self.dims}\n'
+
+        _repr += f'coords:\n'
+        for axis, coord in enumerate(self.coords):
+            if coord is None:
+                _repr += f'{axis}: None\n'
+            if coord is not None:
+                _repr += f'{axis}: {coord[0]}..{coord[-1]}\n'
+
+        _repr += f'variables:\n'
+        for name, a in self._variables.items():
+            _repr += f'{name}: {a.dtype}\n'
+        return _repr
+
+
+def _template(shape: Tuple[int,...]) -> NDArray[np.bool_]:
+    """
+    :return: an array of :code:`shape` over a single byte, carrying the layout
+    """
+    return np.broadcast_to(np.empty((), dtype=np.bool_), shape)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 from functools import wraps
+import numpy as np
 import numpy.typing as npt
 
 from .broadcast._broadcast import vanilla_broadcaster, cast
 from .basic_utils import mergedims, mergecoords
 
+from ..instrument import kernel
+
+from . import _precision
+from ._out import check_out, wrap_out
+
 
 from typing import TYPE_CHECKING 
 if TYPE_CHECKING:
@@ -28,16 +34,17 @@ def promote_binary_operator(
     '''
     if broadcaster is None: broadcaster = vanilla_broadcaster
     def wrapper(f: BinaryOperator[npt.NDArray]) -> BinaryOperator[XTensor]:
+        _f = kernel(f)
         @wraps(f)
         def wrapped(X: XTensor, Y: XTensor) -> XTensor:
             from ._base import XTensor
             
             _x, _y, dims, coords = broadcaster(X, Y)
-            res_data = f(_x, _y)
+            res_data = _precision.apply(_f, _x, _y)
 
             # if dimcoord_converter:
             #     dims, coords = dimcoord_converter(dims, coords)
-            return XTensor(res_data, dims, coords)
+            return XTensor._derive(res_data, dims, coords)
         return wrapped
     return wrapper
 
@@ -46,12 +53,14 @@ def promote_ternary_operator(
     ) -> Callable[[TernaryOperator[npt.NDArray]], TernaryOperator[XTensor]]:
     '''
     Promote an NDArray ternary operator to XTensor ternary operator using
-    vanilla broadcaster
+    vanilla broadcaster. If the promoted operator is called with :code:`out=`,
+    the NDArray operator is called with the output array as :code:`out`.
     '''
     broadcaster = vanilla_broadcaster
     def wrapper(f: TernaryOperator[npt.NDArray]) -> TernaryOperator[XTensor]:
+        _f = kernel(f)
         @wraps(f)
-        def wrapped(X: XTensor, Y: XTensor, Z: XTensor) -> XTensor:
+        def wrapped(X: XTensor, Y: XTensor, Z: XTensor, *, out: XTensor|np.ndarray|None=None) -> XTensor:
             from ._base import XTensor
 
             largest = X
@@ -63,11 +72,17 @@ def promote_ternary_operator(
             X1 = _cast(X)
             Y1 = _cast(Y)
             Z1 = _cast(Z)
-            res_data = f(X1.data, Y1.data, Z1.data)
 
             dims = mergedims(mergedims(X, Y), Z)
             coords = mergecoords(mergecoords(X, Y), Z)
 
-            return XTensor(res_data, dims, coords)
+            if out is None:
+                res_data = _precision.apply(_f, X1.data, Y1.data, Z1.data)
+                return XTensor._derive(res_data, dims, coords)
+
+            shape = np.broadcast_shapes(X1.shape, Y1.shape, Z1.shape)
+            _out = check_out(out, shape, dims, coords)
+            _f(X1.data, Y1.data, Z1.data, out=_out)
+            return wrap_out(out, _out, dims, coords)
         return wrapped
     return wrapper
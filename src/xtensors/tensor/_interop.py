@@ -0,0 +1,146 @@
+from __future__ import annotations
+'''
+Conversion to and from xarray and pandas. Both are optional dependencies and
+are only imported when a conversion is requested. The underlying arrays are
+shared rather than copied whenever the target library allows it.
+
+'''
+from importlib import import_module
+
+import numpy as np
+
+from ._lazycoord import MultiIndexCoord
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+    from typing import Any, Hashable, List
+    from numpy.typing import NDArray
+    from ._base import XTensor
+
+
+_UNNAMED = '__xtensors_dim_'
+'''prefix of the names given to unnamed dimensions in xarray'''
+
+
+def _import(name: str) -> ModuleType:
+    try:
+        return import_module(name)
+    except ImportError as e:
+        raise ImportError(f'{name} is required for this conversion, install it with `pip install {name}`') from e
+
+
+def _to_name(dim: str|None, axis: int) -> str:
+    return f'{_UNNAMED}{axis}' if dim is None else dim
+
+
+def _from_name(name: Hashable) -> str|None:
+    if name is None: return None
+    name = str(name)
+    if name.startswith(_UNNAMED): return None
+    return name
+
+
+def _multiindex(pd: ModuleType, coord: MultiIndexCoord) -> Any:
+    levels = [np.arange(n) if c is None else np.asarray(c)
+              for c, n in zip(coord.coords, coord.component_shape)]
+    return pd.MultiIndex.from_product(levels, names=coord.names)
+
+
+def _to_index(pd: ModuleType, coord: Any, dim: str|None, n: int) -> Any:
+    if coord is None: return pd.RangeIndex(n, name=dim)
+    if isinstance(coord, MultiIndexCoord): return _multiindex(pd, coord)
+    return pd.Index(np.asarray(coord), name=dim)
+
+
+def to_xarray(X: XTensor) -> Any:
+    """
+    :return: an :code:`xarray.DataArray` sharing :code:`X.data`. Unnamed
+            dimensions get generated names that :py:func:`from_xarray` maps
+            back to :code:`None`. Lazy coordinates are materialized, and a
+            :py:class:`xtensors.MultiIndexCoord` becomes a stacked coordinate
+            with one level per flattened dimension.
+
+    """
+    xr = _import('xarray')
+    pd = _import('pandas')
+
+    dims = [_to_name(dim, axis) for axis, dim in enumerate(X.dims)]
+    coords = {dim: np.asarray(coord) for dim, coord in zip(dims, X.coords)
+              if coord is not None and not isinstance(coord, MultiIndexCoord)}
+    da = xr.DataArray(X.data, dims=dims, coords=coords)
+
+    for dim, coord in zip(dims, X.coords):
+        if isinstance(coord, MultiIndexCoord):
+            da = da.assign_coords(xr.Coordinates.from_pandas_multiindex(_multiindex(pd, coord), dim))
+    return da
+
+
+def from_xarray(da: Any) -> XTensor:
+    """
+    Convert an :code:`xarray.DataArray` to an :py:class:`XTensor`, sharing its
+    data if it is backed by a NumPy array. Only dimension coordinates are kept.
+
+    """
+    from ._base import XTensor
+
+    dims = [_from_name(dim) for dim in da.dims]
+    coords: List[NDArray[Any]|None] = [
+            np.asarray(da.coords[dim].values) if dim in da.coords else None
+            for dim in da.dims]
+
+    return XTensor(np.asarray(da.data), dims, coords)
+
+
+def to_pandas(X: XTensor) -> Any:
+    """
+    :return: a :code:`pandas.Series` for 1D tensors or a
+            :code:`pandas.DataFrame` for 2D tensors, sharing :code:`X.data`.
+            Dimension names become index (and column) names, axes without
+            coordinates get a :code:`RangeIndex`, and a
+            :py:class:`xtensors.MultiIndexCoord` becomes a :code:`MultiIndex`.
+
+    :raises: :code:`ValueError` for tensors of other ranks
+
+    """
+    pd = _import('pandas')
+
+    indices = [_to_index(pd, coord, dim, n) for dim, coord, n in zip(X.dims, X.coords, X.shape)]
+
+    if X.rank == 1:
+        return pd.Series(X.data, index=indices[0], copy=False)
+
+    if X.rank == 2:
+        return pd.DataFrame(X.data, index=indices[0], columns=indices[1], copy=False)
+
+    raise ValueError(f'Only 1D and 2D tensors can be converted to pandas, received rank {X.rank}')
+
+
+def _from_index(index: Any) -> NDArray[Any]|None:
+    pd = _import('pandas')
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        return None
+    return index.to_numpy()
+
+
+def from_pandas(obj: Any) -> XTensor:
+    """
+    Convert a :code:`pandas.Series` or :code:`pandas.DataFrame` to an
+    :py:class:`XTensor`. The data is shared for Series and for DataFrames with
+    a single dtype. Index names become dimension names, and a default
+    :code:`RangeIndex` becomes an axis without coordinates.
+
+    """
+    from ._base import XTensor
+    pd = _import('pandas')
+
+    if isinstance(obj, pd.Series):
+        return XTensor(obj.to_numpy(copy=False), [_from_name(obj.index.name)], [_from_index(obj.index)])
+
+    if isinstance(obj, pd.DataFrame):
+        return XTensor(obj.to_numpy(copy=False),
+                [_from_name(obj.index.name), _from_name(obj.columns.name)],
+                [_from_index(obj.index), _from_index(obj.columns)])
+
+    raise TypeError(f'Expected pandas.Series or pandas.DataFrame, received {type(obj)}')
@@ -0,0 +1,392 @@
+from __future__ import annotations
+'''
+Lazy coordinates:
+    Coordinates that are described by a few parameters and decoded on demand,
+    instead of being stored as a materialized array. They are kept as is by
+    :py:meth:`XTensor.set_coords`; indexing them only decodes the selected
+    elements, and :code:`np.asarray` materializes them.
+
+'''
+from abc import ABC, abstractmethod
+from math import prod
+
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Sequence, Tuple
+    from numpy.typing import NDArray
+
+
+class LazyCoord(ABC):
+    """
+    Base class of lazy coordinates. Subclasses implement :code:`__len__`,
+    :py:meth:`decode` and :py:attr:`dtype`.
+    """
+    ndim = 1
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @property
+    @abstractmethod
+    def dtype(self) -> np.dtype: ...
+
+    @abstractmethod
+    def decode(self, indices: NDArray[np.intp]) -> NDArray[Any]:
+        """
+        :param indices: non-negative positions along the coordinate
+        :return: the coordinate values at :code:`indices`
+        """
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return (len(self),)
+
+    def _arrays(self) -> List[NDArray[Any]]:
+        """
+        :return: the arrays kept by the coordinate
+        """
+        return []
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes of the arrays kept by the coordinate, not of its decoded values
+        """
+        return sum(a.nbytes for a in self._arrays())
+
+    @property
+    def size(self) -> int:
+        return len(self)
+
+    def positions(self, key: Any) -> NDArray[np.intp]:
+        """
+        :return: the positions selected by a slice, an integer array or a boolean mask
+        """
+        n = len(self)
+        if isinstance(key, slice):
+            return np.arange(*key.indices(n))
+
+        key = np.asarray(key)
+        if key.dtype == bool:
+            if key.shape != (n,):
+                raise IndexError(f'Boolean index of shape {key.shape} for coordinate of length {n}')
+            return np.flatnonzero(key)
+
+        key = key.astype(np.intp, copy=False)
+        if key.size and (key.min() < -n or key.max() >= n):
+            raise IndexError(f'Index out of bounds for coordinate of length {n}')
+        return np.where(key < 0, key + n, key)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, (int, np.integer)):
+            n = len(self)
+            if not -n <= key < n:
+                raise IndexError(f'Index {key} out of bounds for coordinate of length {n}')
+            return self.decode(np.array([key % n], dtype=np.intp))[0]
+
+        return self.decode(self.positions(key))
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __array__(self, dtype: Any=None, copy: bool|None=None) -> NDArray[Any]:
+        a = self.decode(np.arange(len(self)))
+        return a if dtype is None else a.astype(dtype, copy=False)
+
+    def equals(self, other: Any, rtol: float=1e-8, atol: float=1e-8) -> bool:
+        """
+        Return whether :code:`other` has the same values, materializing both
+        coordinates. Subclasses compare their parameters when possible.
+
+        :param rtol: relative tolerance of numeric coordinates, as in :code:`np.allclose`
+        :param atol: absolute tolerance of numeric coordinates, as in :code:`np.allclose`
+        """
+        if len(self) != len(other): return False
+        a, b = np.asarray(self), np.asarray(other)
+        if a.dtype.kind in 'iufc' and b.dtype.kind in 'iufc':
+            return bool(np.allclose(a, b, rtol=rtol, atol=atol))
+        return bool(np.array_equal(a, b))
+
+
+class MultiIndexCoord(LazyCoord):
+    """
+    The coordinate of a dimension obtained by flattening several dimensions,
+    as produced by :py:func:`xtensors.flatten`. It stores the names, lengths
+    and coordinates of the flattened dimensions, in C order, and decodes a
+    position into a record of component values.
+
+    :param dims: names of the flattened dimensions
+    :param shape: lengths of the flattened dimensions
+    :param coords: coordinates of the flattened dimensions, :code:`None`
+            standing for positions
+
+    """
+    def __init__(self,
+            dims: Sequence[str|None],
+            shape: Sequence[int],
+            coords: Sequence[NDArray[Any]|None]|None=None) -> None:
+
+        if coords is None: coords = [None] * len(shape)
+        if not len(dims) == len(shape) == len(coords):
+            raise ValueError(f'Received {len(dims)} dimensions, {len(shape)} lengths '
+                             f'and {len(coords)} coordinates')
+        for l, coord in zip(shape, coords):
+            if coord is not None and len(coord) != l:
+                raise ValueError(f'Received coordinates with {len(coord)} elements '
+                                 f'for dimension of length {l}')
+
+        self.dims = tuple(dims)
+        self.component_shape = tuple(int(l) for l in shape)
+        self.coords = tuple(coords)
+
+    def __len__(self) -> int:
+        return prod(self.component_shape)
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Field names of the decoded records: the dimension names, or
+        :code:`dim_<i>` for unnamed dimensions
+        """
+        return [dim if dim is not None else f'dim_{i}' for i, dim in enumerate(self.dims)]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype([
+            (name, np.asarray(coord).dtype if coord is not None else np.dtype(np.intp))
+            for name, coord in zip(self.names, self.coords)])
+
+    def _arrays(self) -> List[NDArray[Any]]:
+        return [coord for coord in self.coords if isinstance(coord, np.ndarray)]
+
+    def decode(self, indices: NDArray[np.intp]) -> NDArray[Any]:
+        records = np.empty(np.shape(indices), dtype=self.dtype)
+        for name, coord, index in zip(
+                self.names, self.coords, np.unravel_index(indices, self.component_shape)):
+            records[name] = index if coord is None else np.asarray(coord)[index]
+        return records
+
+    def equals(self, other: Any, rtol: float=1e-8, atol: float=1e-8) -> bool:
+        if not isinstance(other, MultiIndexCoord):
+            return super().equals(other, rtol, atol)
+
+        from .basic_utils import coords_same
+        return self.dims == other.dims \
+                and self.component_shape == other.component_shape \
+                and coords_same(self.coords, other.coords, rtol=rtol, atol=atol)
+
+    def __repr__(self) -> str:
+        components = ', '.join(f'{name}: {l}' for name, l in zip(self.names, self.component_shape))
+        return f'MultiIndexCoord({components})'
+
+
+class RangeCoord(LazyCoord):
+    """
+    Evenly spaced coordinates :code:`start + step * i` for :code:`i` in
+    :code:`range(n)`, e.g. a regular grid or evenly spaced timestamps with a
+    :code:`datetime64` start and a :code:`timedelta64` step. Slicing returns
+    another :py:class:`RangeCoord`, and two of them are compared by their
+    parameters, both in constant time.
+
+    :param start: first coordinate
+    :param step: difference between consecutive coordinates
+    :param n: number of coordinates
+
+    """
+    def __init__(self, start: Any, step: Any, n: int) -> None:
+        if n < 0:
+            raise ValueError(f'n should be non-negative, received {n}')
+
+        first = np.asarray(start) + np.asarray(step) * 0
+        self.start = first[()]
+        self.step = np.asarray(step)[()]
+        self.n = int(n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.start.dtype
+
+    @property
+    def stop(self) -> Any:
+        """
+        Coordinate following the last one
+        """
+        return self.start + self.step * self.n
+
+    def decode(self, indices: NDArray[np.intp]) -> NDArray[Any]:
+        return (self.start + self.step * np.asarray(indices)).astype(self.dtype, copy=False)
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, slice):
+            return super().__getitem__(key)
+
+        start, stop, step = key.indices(self.n)
+        return RangeCoord(self.start + self.step * start, self.step * step, len(range(start, stop, step)))
+
+    @staticmethod
+    def join(coords: Sequence[RangeCoord]) -> RangeCoord|None:
+        """
+        :return: the concatenation of :code:`coords` if it is still evenly
+                spaced, else :code:`None`
+        """
+        coords = [coord for coord in coords if len(coord) > 0]
+        if not coords: return None
+
+        steps = [coord.step for coord in coords if len(coord) > 1]
+        step = steps[0] if steps else (coords[1].start - coords[0].start if len(coords) > 1 else coords[0].step)
+
+        n = 0
+        for coord in coords:
+            if coord.dtype != coords[0].dtype or (len(coord) > 1 and coord.step != step) \
+                    or coord.start != coords[0].start + step * n:
+                return None
+            n += len(coord)
+        return RangeCoord(coords[0].start, step, n)
+
+    def equals(self, other: Any, rtol: float=1e-8, atol: float=1e-8) -> bool:
+        if not isinstance(other, RangeCoord):
+            return super().equals(other, rtol, atol)
+
+        if self.n != other.n: return False
+        if self.n == 0: return True
+        kinds = {self.dtype.kind, other.dtype.kind}
+        if len(kinds) > 1 and not kinds <= set('iufc'): return False
+
+        if kinds & set('fc'):
+            # the difference is linear in the position, so comparing both
+            # ends is the same as comparing every coordinate
+            last = self.start + self.step * (self.n - 1), other.start + other.step * (other.n - 1)
+            return bool(np.isclose(self.start, other.start, rtol=rtol, atol=atol)
+                        and np.isclose(*last, rtol=rtol, atol=atol))
+
+        return bool(self.start == other.start and (self.n == 1 or self.step == other.step))
+
+    def __repr__(self) -> str:
+        return f'RangeCoord(start={self.start!r}, step={self.step!r}, n={self.n})'
+
+
+class CategoricalCoord(LazyCoord):
+    """
+    Labels stored as integer :code:`codes` into a table of unique
+    :code:`categories`, e.g. class or sensor names. Slicing and integer
+    indexing select codes and share the table, and coordinates with the same
+    table are compared by their codes, without building Python objects per
+    element. Labels are located through a hash index of the table.
+
+    :param codes: 1D integer array of positions in :code:`categories`
+    :param categories: 1D array of unique labels
+
+    """
+    def __init__(self, codes: Any, categories: Any) -> None:
+        codes = np.asarray(codes)
+        categories = np.asarray(categories)
+
+        if codes.ndim != 1 or codes.dtype.kind not in 'iu':
+            raise TypeError(f'Codes should be a 1D integer array, received {codes.dtype} of shape {codes.shape}')
+        if categories.ndim != 1:
+            raise ValueError(f'Categories should be 1D, received shape {categories.shape}')
+        if codes.size and (codes.min() < 0 or codes.max() >= len(categories)):
+            raise ValueError(f'Codes should be within [0, {len(categories)})')
+
+        self.codes = codes
+        self.categories = categories
+        self._index: Dict[Any, int]|None = None
+
+    @classmethod
+    def from_values(cls, values: Any) -> CategoricalCoord:
+        """
+        :return: the coordinate of :code:`values`, with their sorted unique
+                values as categories and the smallest integer dtype for the codes
+        """
+        categories, codes = np.unique(np.asarray(values), return_inverse=True)
+        return cls(codes.astype(np.min_scalar_type(max(len(categories) - 1, 0))), categories)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.categories.dtype
+
+    def _arrays(self) -> List[NDArray[Any]]:
+        return [self.codes, self.categories]
+
+    def decode(self, indices: NDArray[np.intp]) -> NDArray[Any]:
+        return self.categories[self.codes[indices]]
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            return CategoricalCoord(self.codes[key], self.categories)
+        if isinstance(key, (int, np.integer)) or np.ndim(key) != 1:
+            return super().__getitem__(key)
+        return CategoricalCoord(self.codes[self.positions(key)], self.categories)
+
+    def code(self, label: Any) -> int:
+        """
+        :return: the code of :code:`label`
+
+        :raises: :code:`KeyError` if :code:`label` is not a category
+        """
+        if self._index is None:
+            self._index = {label: code for code, label in enumerate(self.categories.tolist())}
+        return self._index[label]
+
+    def locate(self, labels: Any) -> NDArray[np.intp]:
+        """
+        :return: the positions whose label is one of :code:`labels`, in
+                increasing order
+
+        :raises: :code:`KeyError` if a label is not a category
+        """
+        codes = [self.code(label) for label in np.atleast_1d(np.asarray(labels, dtype=object)).tolist()]
+        return np.flatnonzero(np.isin(self.codes, codes))
+
+    def recode(self, categories: NDArray[Any]) -> NDArray[np.intp]|None:
+        """
+        :return: the codes in another table, or :code:`None` if a used
+                category is missing from it
+        """
+        if categories is self.categories or np.array_equal(categories, self.categories):
+            return self.codes
+
+        # categories missing from the table are mapped to -1, an error only if used
+        index = {label: code for code, label in enumerate(categories.tolist())}
+        mapping = np.array([index.get(label, -1) for label in self.categories.tolist()], dtype=np.intp)
+        codes = mapping[self.codes]
+        return None if codes.size and codes.min() < 0 else codes
+
+    @staticmethod
+    def union(coords: Sequence[CategoricalCoord]) -> NDArray[Any]:
+        """
+        :return: the sorted union of the categories of :code:`coords`, or their
+                common table if they share one
+        """
+        first = coords[0].categories
+        if all(coord.categories is first for coord in coords):
+            return first
+        return np.unique(np.concatenate([coord.categories for coord in coords]))
+
+    @staticmethod
+    def join(coords: Sequence[CategoricalCoord]) -> CategoricalCoord:
+        """
+        :return: the concatenation of :code:`coords`, over the union of their categories
+        """
+        categories = CategoricalCoord.union(coords)
+        return CategoricalCoord(np.concatenate([coord.recode(categories) for coord in coords]), categories)
+
+    def equals(self, other: Any, rtol: float=1e-8, atol: float=1e-8) -> bool:
+        if not isinstance(other, CategoricalCoord):
+            return super().equals(other, rtol, atol)
+        if len(self) != len(other): return False
+
+        codes = other.recode(self.categories)
+        return codes is not None and bool(np.array_equal(self.codes, codes))
+
+    def __repr__(self) -> str:
+        return f'CategoricalCoord(n={len(self)}, categories={len(self.categories)})'
@@ -0,0 +1,345 @@
+from __future__ import annotations
+'''
+Masked tensors:
+    Named tensors carrying a boolean validity mask next to their data, in
+    place of NaN sentinels. Reductions pass the mask to NumPy as
+    :code:`where=` so that invalid entries are skipped in the same pass, and
+    elementwise operations combine the masks with a logical AND. Integer
+    tensors can thus have missing values without being cast to float.
+
+'''
+import warnings
+
+import numpy as np
+
+from ._base import XTensor
+
+from .broadcast import vanilla_broadcaster
+
+from .basic_utils import permute, to_xtensor
+from .basic_utils._generalize import generalize_at_0
+from .basic_utils._misc import copy_sig
+
+from . import _memory
+from . import _precision
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+    from .typing import AxesPermutation, DimLike, TensorLike, BinaryOperator
+
+
+_MASKED_REDUCTIONS = {
+    np.sum: np.sum, np.nansum: np.sum,
+    np.mean: np.mean, np.nanmean: np.mean,
+    np.std: np.std, np.nanstd: np.std,
+    np.max: np.max, np.nanmax: np.max,
+    np.min: np.min, np.nanmin: np.min,
+    np.all: np.all, np.any: np.any,
+}
+
+_NAN_FUNCS = {np.nansum, np.nanmean, np.nanstd, np.nanmax, np.nanmin, np.nanargmax, np.nanargmin}
+
+
+def _extreme(dtype: np.dtype, largest: bool) -> Any:
+    """
+    :return: the largest (or smallest) value of :code:`dtype`, used as the
+            initial value of masked max and min
+    """
+    if dtype.kind == 'f':
+        return np.inf if largest else -np.inf
+    if dtype.kind in 'iu':
+        info = np.iinfo(dtype)
+        return info.max if largest else info.min
+    if dtype.kind == 'b':
+        return largest
+    raise TypeError(f'Masked max and min are not supported for dtype {dtype}')
+
+
+def inject_masked_operator(f: Callable[[MaskedXTensor], BinaryOperator[np.ndarray]]):
+    def wrapped(self: MaskedXTensor, other: TensorLike, /) -> MaskedXTensor:
+        if not isinstance(other, XTensor):
+            try:
+                other = to_xtensor(other)
+            except TypeError:
+                return NotImplemented
+        return self._apply(f(self), other)
+    return wrapped
+
+
+class MaskedXTensor(XTensor):
+    r"""
+    A named tensor with a boolean :code:`mask` of the same shape as
+    :code:`data`, :code:`True` where the entry is valid (as for NumPy's
+    :code:`where=`). Values at invalid entries are unspecified.
+
+    :py:func:`xtensors.sum`, :py:func:`xtensors.mean`, :py:func:`xtensors.std`,
+    :py:func:`xtensors.max`, :py:func:`xtensors.min`, :py:func:`xtensors.all`,
+    :py:func:`xtensors.any`, their :code:`nan` variants, the arg functions and
+    the ufuncs skip invalid entries; a reduced entry is valid if at least one
+    of its inputs is. Elementwise operations, :py:meth:`get`, :py:meth:`slc`,
+    :py:meth:`isel` and :py:func:`xtensors.permute` carry the mask along.
+    Other operations see :code:`data` as is, call :py:meth:`filled` first.
+
+    """
+    def __init__(self, data: Any, mask: Any,
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[Sequence[Any]|NDArray[Any]|None]]=None,
+    ) -> None:
+        """
+        :param data: same as :py:class:`xtensors.XTensor`
+        :param mask: a boolean array broadcastable to the shape of
+                :code:`data`, or an :py:class:`xtensors.XTensor` whose
+                dimensions are a subset of :code:`dims`, broadcast by name.
+                Broadcast masks are stored as read-only views.
+        :param dims: same as :py:class:`xtensors.XTensor`
+        :param coords: same as :py:class:`xtensors.XTensor`
+
+        """
+        super().__init__(data, dims, coords)
+
+        if isinstance(mask, XTensor):
+            axes = [mask.get_axis(dim) if dim in mask.dims else None for dim in self.dims]
+            if len([axis for axis in axes if axis is not None]) != mask.rank:
+                raise ValueError(f'Mask dimensions {mask.dims} are not a subset of {self.dims}')
+            mask = permute(mask, axes).data
+
+        mask = np.asarray(mask)
+        if mask.dtype != np.bool_:
+            raise TypeError(f'Mask should be boolean, but received {mask.dtype}')
+        self.mask: NDArray[np.bool_] = np.broadcast_to(mask, self.shape) if mask.shape != self.shape else mask
+
+    @staticmethod
+    def _wrap(X: XTensor, mask: NDArray[np.bool_]) -> MaskedXTensor:
+        """
+        Attach an already validated :code:`mask` to :code:`X`, sharing its
+        data and metadata
+        """
+        M = MaskedXTensor.__new__(MaskedXTensor)
+        M.data, M._dims, M._coords, M._dim_axis_dict = X.data, X._dims, X._coords, X._dim_axis_dict
+        M.mask = mask
+
+        if _memory._registry is not None: _memory._register(M)
+        return M
+
+    def _buffers(self) -> List[NDArray[Any]]:
+        return [self.data, self.mask]
+
+    def _unmasked(self) -> XTensor:
+        return XTensor._derive(self.data, self._dims, self._coords)
+
+    def _mask_tensor(self) -> XTensor:
+        return XTensor._derive(self.mask, self._dims, self._coords)
+
+    def _map(self, op: Callable[[XTensor], XTensor]) -> MaskedXTensor:
+        """
+        Apply a structural operation (indexing, permutation) to both the data
+        and the mask
+        """
+        return MaskedXTensor._wrap(op(self._unmasked()), op(self._mask_tensor()).data)
+
+    def filled(self, fill_value: Any=0) -> XTensor:
+        r"""
+        :return: an :py:class:`xtensors.XTensor` with invalid entries replaced
+                by :code:`fill_value`, in a newly allocated array
+
+        """
+        data = np.where(self.mask, self.data, fill_value)
+        return XTensor._derive(data, self._dims, self._coords)
+
+    def count(self) -> int:
+        """
+        Number of valid entries
+        """
+        return int(np.count_nonzero(self.mask))
+
+    def viewcopy(self) -> MaskedXTensor:
+        return MaskedXTensor._wrap(self._unmasked(), self.mask)
+
+    def permute(self, axes: AxesPermutation) -> MaskedXTensor:
+        r"""
+        Masked counterpart of :py:func:`xtensors.permute`
+
+        """
+        return self._map(lambda X: permute(X, axes))
+
+    def slc(self, dim: DimLike, slc: slice) -> MaskedXTensor:
+        return self._map(lambda X: X.slc(dim, slc))
+
+    def get(self, dim: DimLike, index: int) -> MaskedXTensor:
+        return self._map(lambda X: X.get(dim, index))
+
+    def isel(self, indexers: Optional[Mapping[DimLike, Any]]=None, /, **dim_indexers: Any) -> MaskedXTensor:
+        return self._map(lambda X: X.isel(indexers, **dim_indexers))
+
+    def _valid(self, np_func: Callable[..., Any]) -> NDArray[np.bool_]:
+        # the nan variants also skip NaN entries of float data
+        if np_func in _NAN_FUNCS and self.data.dtype.kind in 'fc':
+            return self.mask & ~np.isnan(self.data)
+        return self.mask
+
+    def reduce(self, np_func: Callable[..., Any], axes: Sequence[int],
+            dtype: np.dtype|None=None) -> MaskedXTensor:
+        r"""
+        Reduce over :code:`axes`, skipping invalid entries. Supported functions
+        are :code:`np.sum`, :code:`np.mean`, :code:`np.std`, :code:`np.max`,
+        :code:`np.min`, :code:`np.all`, :code:`np.any` and the :code:`nan`
+        variants.
+
+        :param dtype: accumulator dtype of :code:`np.sum`, :code:`np.mean`
+                and :code:`np.std`
+
+        """
+        try:
+            func = _MASKED_REDUCTIONS[np_func]
+        except KeyError as e:
+            raise NotImplementedError(
+                    f'{np_func.__name__} is not supported for MaskedXTensor, call filled() first') from e
+
+        axes = tuple(axes)
+        valid = self._valid(np_func)
+
+        kwargs: Dict[str, Any] = dict()
+        if func in (np.max, np.min):
+            kwargs['initial'] = _extreme(self.data.dtype, largest=func is np.min)
+        elif dtype is not None and func in (np.sum, np.mean, np.std):
+            kwargs['dtype'] = dtype
+
+        # groups without valid entries produce NaN and are masked out
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            _y = func(self.data, axis=axes, where=valid, **kwargs)
+
+        remaining = [axis for axis in range(self.rank) if axis not in axes]
+        X = XTensor._derive(_precision.store(np.asarray(_y), self.data.dtype),
+                [self._dims[axis] for axis in remaining], [self._coords[axis] for axis in remaining])
+        return MaskedXTensor._wrap(X, np.any(valid, axis=axes))
+
+    def arg(self, np_func: Callable[..., Any], axis: int) -> MaskedXTensor:
+        r"""
+        :code:`np.argmax`, :code:`np.argmin` and their :code:`nan` variants
+        over :code:`axis`, skipping invalid entries. The result is invalid
+        where all entries are.
+
+        """
+        if np_func in (np.argmax, np.nanargmax): func, largest = np.max, False
+        elif np_func in (np.argmin, np.nanargmin): func, largest = np.min, True
+        else:
+            raise NotImplementedError(f'{np_func.__name__} is not supported for MaskedXTensor')
+
+        valid = self._valid(np_func)
+        extreme = func(self.data, axis=axis, where=valid, keepdims=True,
+                       initial=_extreme(self.data.dtype, largest))
+
+        # the first valid entry equal to the extreme, without filling a copy
+        # of the data
+        hit = valid & (self.data == extreme)
+        if np_func in (np.argmax, np.argmin) and self.data.dtype.kind in 'fc':
+            nan = np.isnan(extreme)
+            if nan.any():
+                hit |= valid & nan & np.isnan(self.data)
+
+        X = XTensor._derive(np.argmax(hit, axis=axis),
+                [dim for a, dim in enumerate(self._dims) if a != axis],
+                [coord for a, coord in enumerate(self._coords) if a != axis])
+        return MaskedXTensor._wrap(X, np.any(valid, axis=axis))
+
+    def _apply(self, f: BinaryOperator[np.ndarray], other: XTensor) -> MaskedXTensor:
+        _x, _y, dims, coords = vanilla_broadcaster(self._unmasked(), XTensor._derive(other.data, other.dims, other.coords))
+        data = _precision.apply(f, _x, _y)
+
+        if isinstance(other, MaskedXTensor):
+            _mx, _my, _, _ = vanilla_broadcaster(self._mask_tensor(), other._mask_tensor())
+            mask = np.logical_and(_mx, _my)
+            if mask.shape != data.shape: mask = np.broadcast_to(mask, data.shape)
+        else:
+            _mx, _, _, _ = vanilla_broadcaster(self._mask_tensor(),
+                    XTensor._derive(np.broadcast_to(True, other.shape), other.dims, other.coords))
+            mask = np.broadcast_to(_mx, data.shape)
+
+        return MaskedXTensor._wrap(XTensor._derive(data, dims, coords), mask)
+
+    def __repr__(self):
+        _repr = 'MaskedTensor\n'
+        _repr += f'shape={self.shape}\n'
+        _repr += f'dims={self.dims}\n'
+        _repr += f'valid={self.count()}\n'
+
+        _repr += f'coords:\n'
+        for axis, coord in enumerate(self.coords):
+            if coord is None:
+                _repr += f'{axis}: None\n'
+            if coord is not None:
+                _repr += f'{axis}: {coord[0]}..{coord[-1]}\n'
+
+        _repr += np.ma.MaskedArray(self.data, ~self.mask).__repr__()
+        return _repr
+
+    def __neg__(self) -> MaskedXTensor:
+        return MaskedXTensor._wrap(-self._unmasked(), self.mask)
+
+    @inject_masked_operator
+    def __add__(self): return lambda X, Y: X+Y
+
+    @inject_masked_operator
+    def __radd__(self): return lambda X, Y: Y+X
+
+    @inject_masked_operator
+    def __sub__(self): return lambda X, Y: X-Y
+
+    @inject_masked_operator
+    def __rsub__(self): return lambda X, Y: Y-X
+
+    @inject_masked_operator
+    def __mul__(self): return lambda X, Y: X*Y
+
+    @inject_masked_operator
+    def __rmul__(self): return lambda X, Y: Y*X
+
+    @inject_masked_operator
+    def __truediv__(self): return lambda X, Y: X/Y
+
+    @inject_masked_operator
+    def __rtruediv__(self): return lambda X, Y: Y/X
+
+    @inject_masked_operator
+    def __pow__(self): return lambda X, Y: X**Y
+
+    @inject_masked_operator
+    def __rpow__(self): return lambda X, Y: Y**X
+
+    @inject_masked_operator
+    def __eq__(self): return lambda X, Y: X==Y
+
+    @inject_masked_operator
+    def __lt__(self): return lambda X, Y: X<Y
+
+    @inject_masked_operator
+    def __gt__(self): return lambda X, Y: X>Y
+
+    @inject_masked_operator
+    def __le__(self): return lambda X, Y: X<=Y
+
+    @inject_masked_operator
+    def __ge__(self): return lambda X, Y: X>=Y
+
+
+def _masked(X: TensorLike, mask: TensorLike|None=None) -> MaskedXTensor: ...
+
+@copy_sig(_masked)
+@generalize_at_0
+def masked(X: XTensor, mask: Any=None) -> MaskedXTensor:
+    """
+    Attach a validity mask to a tensor, sharing its data.
+
+    :param X: target tensor
+    :param mask: boolean mask, :code:`True` where valid, see
+            :py:class:`xtensors.MaskedXTensor`. By default, the entries of
+            :code:`X` that are not NaN are valid.
+
+    """
+    if mask is None:
+        mask = ~np.isnan(X.data) if X.data.dtype.kind in 'fc' else np.broadcast_to(True, X.shape)
+    return MaskedXTensor(X.data, mask, X.dims, X.coords)
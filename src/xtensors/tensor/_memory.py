@@ -0,0 +1,206 @@
+from __future__ import annotations
+'''
+Memory accounting:
+    Views (slices, permutations, viewcopy, broadcasts) share the buffer of
+    the array they were taken from, found by following the :code:`.base`
+    chain of their arrays. memory_report counts every buffer once, however
+    many tensors view it; the registry keeps weak references to the tensors
+    created while tracking is enabled, so that it never extends their lifetime.
+
+'''
+import weakref
+from contextlib import contextmanager
+
+import numpy as np
+
+from typing import TYPE_CHECKING, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, List
+    from numpy.typing import NDArray
+    from ._base import XTensor
+
+
+# live tensors by id; tensors define __eq__ and are not hashable
+_registry: weakref.WeakValueDictionary[int, XTensor]|None = None
+
+
+class TensorMemory(NamedTuple):
+    """
+    Memory of a single tensor in a :py:class:`xtensors.MemoryReport`
+    """
+    nbytes: int
+    """bytes addressed by the arrays of the tensor, as :py:attr:`XTensor.nbytes`"""
+    owned: int
+    """bytes of the arrays that own their buffer"""
+    viewed: int
+    """bytes addressed through views of other buffers"""
+    coords: int
+    """bytes of the coordinates, as :py:attr:`XTensor.coords_nbytes`"""
+    shares_with: Tuple[int,...]
+    """positions of the other tensors of the report sharing a data buffer with this one"""
+
+
+class MemoryReport(NamedTuple):
+    """
+    Result of :py:func:`xtensors.memory_report`
+    """
+    tensors: Tuple[TensorMemory,...]
+    """one entry per tensor, in order"""
+    total: int
+    """bytes of the distinct buffers behind the tensors and their coordinates"""
+
+    def __str__(self) -> str:
+        lines = [f'{"":>4} {"nbytes":>12} {"owned":>12} {"viewed":>12} {"coords":>10}  shares with']
+        for i, t in enumerate(self.tensors):
+            lines.append(f'{i:>4} {t.nbytes:>12} {t.owned:>12} {t.viewed:>12} {t.coords:>10}  '
+                         + ', '.join(map(str, t.shares_with)))
+        lines.append(f'total {self.total} bytes')
+        return '\n'.join(lines)
+
+
+def _root(a: NDArray[Any]) -> NDArray[Any]:
+    """
+    :return: the array owning the buffer viewed by :code:`a`, or the outermost
+            array over a foreign buffer (e.g. a memory map or shared memory)
+    """
+    while isinstance(a.base, np.ndarray):
+        a = a.base
+    return a
+
+
+def _coord_arrays(coord: Any) -> List[NDArray[Any]]:
+    from ._lazycoord import LazyCoord
+
+    if coord is None: return []
+    if isinstance(coord, LazyCoord): return coord._arrays()
+    return [coord]
+
+
+class _Buffers:
+    """
+    Distinct buffers behind a set of arrays, keyed by the id of their root array
+    """
+    def __init__(self) -> None:
+        self.roots: Dict[int, NDArray[Any]] = dict()
+        self.foreign: List[NDArray[Any]] = []
+
+    def add(self, a: NDArray[Any]) -> int:
+        """
+        :return: the key of the buffer of :code:`a`
+        """
+        root = _root(a)
+        key = id(root)
+        if key not in self.roots:
+            # roots over foreign buffers may still overlap each other
+            if root.base is not None:
+                for other in self.foreign:
+                    if np.shares_memory(root, other):
+                        return id(other)
+                self.foreign.append(root)
+            self.roots[key] = root
+        return key
+
+    def add_tensor(self, X: XTensor) -> List[int]:
+        """
+        :return: the keys of the data buffers of :code:`X`; its coordinates are added as well
+        """
+        for coord in X._coords:
+            for a in _coord_arrays(coord): self.add(a)
+        return [self.add(a) for a in X._buffers()]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(root.nbytes for root in self.roots.values())
+
+
+def memory_report(*tensors: XTensor) -> MemoryReport:
+    """
+    Account for the memory held by :code:`tensors`. Views of the same buffer
+    are counted once in :code:`total`, and tensors whose data share a buffer
+    are listed in each other's :code:`shares_with`.
+
+    :return: a :py:class:`xtensors.MemoryReport`
+
+    """
+    buffers = _Buffers()
+    users: Dict[int, List[int]] = dict()
+
+    entries = []
+    for i, X in enumerate(tensors):
+        for key in buffers.add_tensor(X):
+            users.setdefault(key, []).append(i)
+
+        owned = sum(a.nbytes for a in X._buffers() if a.base is None)
+        entries.append((owned, X.nbytes - owned, X.coords_nbytes))
+
+    shares: List[set] = [set() for _ in tensors]
+    for indices in users.values():
+        for i in indices:
+            shares[i].update(j for j in indices if j != i)
+
+    return MemoryReport(
+        tuple(TensorMemory(owned + viewed, owned, viewed, coords, tuple(sorted(shares[i])))
+              for i, (owned, viewed, coords) in enumerate(entries)),
+        buffers.nbytes)
+
+
+def _register(X: XTensor) -> None:
+    _registry[id(X)] = X
+
+
+def get_memory_tracking() -> bool:
+    """
+    :return: whether new tensors are registered for :py:func:`xtensors.resident_nbytes`
+    """
+    return _registry is not None
+
+
+def set_memory_tracking(enabled: bool) -> None:
+    """
+    Enable or disable the registry of live tensors globally. Disabling it
+    forgets the registered tensors.
+
+    """
+    global _registry
+    if enabled and _registry is None:
+        _registry = weakref.WeakValueDictionary()
+    elif not enabled:
+        _registry = None
+
+
+@contextmanager
+def memory_tracking(enabled: bool=True) -> Iterator[None]:
+    """
+    Temporarily enable the registry of live tensors, e.g.
+
+    .. code-block:: python
+
+        with xt.memory_tracking():
+            Y = model(X)
+            print(xt.resident_nbytes())
+
+    """
+    global _registry
+    previous = _registry
+    set_memory_tracking(enabled)
+    try:
+        yield
+    finally:
+        _registry = previous
+
+
+def resident_nbytes() -> int:
+    """
+    :return: the :code:`total` of :py:func:`xtensors.memory_report` over the
+            registered tensors that are still alive
+
+    :raises: :code:`RuntimeError` if memory tracking is disabled
+
+    """
+    if _registry is None:
+        raise RuntimeError('Memory tracking is disabled, see xtensors.memory_tracking')
+    buffers = _Buffers()
+    for X in list(_registry.values()):
+        buffers.add_tensor(X)
+    return buffers.nbytes
@@ -0,0 +1,78 @@
+from __future__ import annotations
+'''
+Output buffers:
+    Operations accepting :code:`out=` compute the expected shape, dimension
+    names and coordinates of their result, check the buffer against them with
+    check_out, let NumPy write into the returned array, and return the result
+    with wrap_out.
+
+'''
+import numpy as np
+
+from . import _validation
+from .basic_utils import coords_same
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Sequence
+    from numpy.typing import NDArray
+    from ._base import XTensor
+    from .typing import Coords, Dims
+
+
+def check_out(out: XTensor|NDArray|None, shape: Sequence[int], dims: Dims, coords: Coords) -> NDArray|None:
+    """
+    Check an :code:`out=` argument against the expected result. An
+    :code:`ndarray` should have the expected shape; an :code:`XTensor` should
+    also have the expected dimension names, and compatible coordinates if the
+    validation level is :code:`full`.
+
+    :return: the array to be passed to NumPy as :code:`out`, or None if :code:`out` is None
+
+    :raises: :code:`ValueError` if :code:`out` does not match the result,
+            :code:`TypeError` if it is neither an :code:`XTensor` nor an :code:`ndarray`
+
+    """
+    from ._base import XTensor
+    from ._sparse import SparseXTensor
+
+    if out is None: return None
+
+    if isinstance(out, XTensor):
+        if isinstance(out, SparseXTensor):
+            raise TypeError('SparseXTensor cannot be used as an output buffer')
+
+        if out.shape != tuple(shape):
+            raise ValueError(f'Output buffer has shape {out.shape}, expected {tuple(shape)}')
+
+        if list(out.dims) != list(dims):
+            raise ValueError(f'Output buffer has dimensions {out.dims}, expected {tuple(dims)}')
+
+        # comparing coordinates allocates temporaries, so it is left out of
+        # steady-state loops unless validation is full
+        if _validation._level == 'full' and \
+                not coords_same(list(out.coords), list(coords), none_compatible=True):
+            raise ValueError('Output buffer has incompatible coordinates')
+
+        return out.data
+
+    if not isinstance(out, np.ndarray):
+        raise TypeError(f'Output buffer should be XTensor or np.ndarray, but received {type(out)}')
+
+    if out.shape != tuple(shape):
+        raise ValueError(f'Output buffer has shape {out.shape}, expected {tuple(shape)}')
+
+    return out
+
+
+def wrap_out(out: XTensor|NDArray, data: NDArray, dims: Dims, coords: Coords) -> XTensor:
+    """
+    :return: :code:`out` itself if it is an :code:`XTensor`, so that its
+            metadata is reused, else a new :code:`XTensor` wrapping :code:`data`
+
+    """
+    from ._base import XTensor
+
+    if isinstance(out, XTensor): return out
+    return XTensor._derive(data, dims, coords)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+'''
+Precision policy:
+    storage    -- floating dtype of the results of binary operations, ufuncs
+                  and reductions
+    accumulate -- floating dtype in which sums, means and standard deviations
+                  of floating tensors are accumulated before being cast back
+    counter    -- integer dtype of counters, e.g. confusion matrices
+
+    Fields left as None keep NumPy's own type promotion.
+
+'''
+from contextlib import contextmanager
+from math import prod
+
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterator
+    from numpy.typing import DTypeLike
+
+
+class Precision:
+    """
+    A set of dtypes used by xtensors operations, see :py:func:`xtensors.precision`
+    """
+    __slots__ = ('storage', 'accumulate', 'counter')
+
+    def __init__(self, storage: DTypeLike=None, accumulate: DTypeLike=None, counter: DTypeLike=None) -> None:
+        self.storage = None if storage is None else np.dtype(storage)
+        self.accumulate = None if accumulate is None else np.dtype(accumulate)
+        self.counter = None if counter is None else np.dtype(counter)
+
+        if self.storage is not None and self.storage.kind != 'f':
+            raise ValueError(f'Storage dtype should be floating, but received {self.storage}')
+        if self.accumulate is not None and self.accumulate.kind != 'f':
+            raise ValueError(f'Accumulator dtype should be floating, but received {self.accumulate}')
+        if self.counter is not None and self.counter.kind not in 'iu':
+            raise ValueError(f'Counter dtype should be integral, but received {self.counter}')
+
+    def __repr__(self) -> str:
+        return f'Precision(storage={self.storage}, accumulate={self.accumulate}, counter={self.counter})'
+
+
+_policy = Precision()
+
+_BLOCK = 2**16
+"""number of elements of the blocks of elementwise results cast to the storage dtype"""
+
+
+def get_precision() -> Precision:
+    """
+    :return: the current precision policy
+    """
+    return _policy
+
+
+def set_precision(storage: DTypeLike=None, accumulate: DTypeLike=None, counter: DTypeLike=None) -> None:
+    """
+    Set the precision policy globally. Calling it without arguments restores
+    NumPy's default type promotion.
+
+    :param storage: floating dtype of results, e.g. :code:`np.float32`
+    :param accumulate: floating dtype of accumulators in reductions, e.g. :code:`np.float64`
+    :param counter: integer dtype of counters, e.g. :code:`np.int32`
+
+    """
+    global _policy
+    _policy = Precision(storage, accumulate, counter)
+
+
+@contextmanager
+def precision(storage: DTypeLike=None, accumulate: DTypeLike=None, counter: DTypeLike=None) -> Iterator[Precision]:
+    """
+    Temporarily set the precision policy, e.g.
+
+    .. code-block:: python
+
+        with xt.precision(storage=np.float32, accumulate=np.float64):
+            m = xt.mean(X, 'batch')     # accumulated in float64, stored as float32
+
+    The policy is global to the process and not thread-local.
+
+    """
+    global _policy
+    previous = _policy
+    _policy = Precision(storage, accumulate, counter)
+    try:
+        yield _policy
+    finally:
+        _policy = previous
+
+
+def store(a: Any, dtype: np.dtype|None=None) -> Any:
+    """
+    Cast a floating result to the storage dtype of the current policy
+
+    :param dtype: dtype of the input of a result accumulated in the
+            accumulator dtype; without a storage dtype, a floating result is
+            cast back to it
+    """
+    storage = _policy.storage
+    if storage is None:
+        if dtype is None or dtype.kind != 'f': return a
+        storage = dtype
+
+    dtype = getattr(a, 'dtype', None)
+    if dtype is None or dtype.kind != 'f' or dtype == storage: return a
+    return np.asarray(a).astype(storage)
+
+
+def apply(f: Callable[..., Any], *arrays: Any) -> Any:
+    """
+    Call the elementwise function :code:`f` on broadcastable arrays and cast a
+    floating result to the storage dtype. A result of another floating dtype
+    is computed in blocks along its longest axis and written into an array of
+    the storage dtype, so that it is never materialized in full.
+    """
+    storage = _policy.storage
+    if storage is None: return f(*arrays)
+
+    views = np.broadcast_arrays(*arrays)
+    shape = views[0].shape
+    size = prod(shape)
+    if size <= _BLOCK:
+        return store(f(*arrays))
+
+    # the dtype of the result, computed on a single element
+    dtype = np.asarray(f(*(a[(slice(0, 1),) * a.ndim] for a in views))).dtype
+    if dtype.kind != 'f' or dtype == storage:
+        return f(*arrays)
+
+    axis = max(range(len(shape)), key=lambda i: shape[i])
+    step = max(1, _BLOCK * shape[axis] // size)
+    out = np.empty(shape, dtype=storage)
+    for start in range(0, shape[axis], step):
+        key = (slice(None),) * axis + (slice(start, start + step),)
+        out[key] = f(*(a[key] for a in views))
+    return out
+
+
+def storage_dtype(dtype: np.dtype) -> np.dtype|None:
+    """
+    :return: the dtype that an elementwise function of an array of the given
+            dtype should be computed in, or None to leave it to NumPy
+
+    """
+    storage = _policy.storage
+    if storage is None or dtype.kind not in 'biuf': return None
+    return storage
+
+
+def accumulator(dtype: np.dtype) -> np.dtype|None:
+    """
+    :return: the accumulator dtype for reducing an array of the given dtype,
+            or None to leave it to NumPy
+
+    """
+    accumulate = _policy.accumulate
+    if accumulate is None or dtype.kind != 'f': return None
+    return accumulate
+
+
+def count(a: Any) -> Any:
+    """
+    Cast counts to the counter dtype of the current policy
+
+    :raises: :code:`OverflowError` if a count does not fit in the counter dtype
+    """
+    counter = _policy.counter
+    if counter is None or a.dtype == counter: return a
+
+    if a.size and a.max() > np.iinfo(counter).max:
+        raise OverflowError(f'Counts up to {a.max()} do not fit in {counter}')
+    return a.astype(counter)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+'''
+Shared-memory tensors:
+    shared(X) copies the data of X once into a multiprocessing.shared_memory
+    segment and yields a small, picklable SharedXTensor handle. Processes that
+    receive the handle attach to the segment by name and get a read-only
+    XTensor with the same dims and coords, without copying the data.
+
+'''
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ._base import XTensor
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, Sequence, Tuple
+    from numpy.typing import NDArray
+
+
+# segments attached by this process, reused by later attaches
+_attached: Dict[str, shared_memory.SharedMemory] = dict()
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    try:
+        # the segment is unlinked by its owner, not by the attaching process
+        return shared_memory.SharedMemory(name=name, track=False) # type: ignore
+    except TypeError:
+        # python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedXTensor:
+    """
+    A picklable handle to an :py:class:`XTensor` whose data lives in shared
+    memory, created with :py:func:`xtensors.shared`.
+    """
+    def __init__(self, name: str, dtype: str, shape: Tuple[int,...],
+            dims: Sequence[str|None], coords: Sequence[NDArray[Any]|None]) -> None:
+        self.name = name
+        '''name of the shared memory segment'''
+        self.dtype = dtype
+        self.shape = tuple(shape)
+        self.dims = tuple(dims)
+        self.coords = tuple(coords)
+
+    def attach(self) -> XTensor:
+        """
+        :return: a read-only :py:class:`XTensor` backed by the shared memory
+                segment. Attaching again in the same process reuses the
+                mapping.
+
+        """
+        try:
+            shm = _attached[self.name]
+        except KeyError:
+            shm = _attached[self.name] = _open(self.name)
+
+        data = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf)
+        data.flags.writeable = False
+        return XTensor._derive(data, self.dims, self.coords)
+
+    def detach(self) -> None:
+        """
+        Release this process's mapping of the segment. Tensors returned by
+        :py:meth:`attach` should no longer be referenced.
+        """
+        shm = _attached.pop(self.name, None)
+        if shm is not None: shm.close()
+
+    def __repr__(self) -> str:
+        return f'SharedXTensor(name={self.name!r}, dtype={self.dtype}, shape={self.shape}, dims={self.dims})'
+
+
+@contextmanager
+def shared(X: XTensor) -> Iterator[SharedXTensor]:
+    """
+    Copy the data of :code:`X` into shared memory for the duration of the
+    context, e.g.
+
+    .. code-block:: python
+
+        with xt.shared(X) as handle:
+            with ProcessPoolExecutor() as pool:
+                results = list(pool.map(work, [handle] * n))
+
+        def work(handle):
+            X = handle.attach()     # read-only, no copy
+            ...
+
+    Only the handle, including the coordinates, is pickled when sent to
+    workers. The segment is unlinked
+    when the context exits, after which workers can no longer attach to it.
+
+    On Python < 3.13, attaching registers the segment with the resource
+    tracker of the attaching process, so workers should be started by the
+    owning process (e.g. with :code:`multiprocessing` or
+    :code:`concurrent.futures`) to share its tracker.
+
+    """
+    data = np.ascontiguousarray(X.data)
+    shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    try:
+        buffer: NDArray[Any] = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+        buffer[...] = data
+        del buffer
+
+        handle = SharedXTensor(shm.name, data.dtype.str, data.shape, X.dims, X.coords)
+        try:
+            yield handle
+        finally:
+            handle.detach()
+    finally:
+        shm.close()
+        shm.unlink()
@@ -3,7 +3,8 @@ from abc import abstractmethod
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from typing import Union
+    from typing import Any, Sequence, Union
+    from numpy.typing import NDArray
     from ._base import XTensor
 
 
@@ -12,11 +13,12 @@ class MetaTensorSlice:
     def __init__(self, dimname: str):
         self._dimname = dimname
 
-    def __getitem__(self, slc: Union[int, slice]) -> TensorIndexer:
+    def __getitem__(self, slc: Union[int, slice, Sequence[int], NDArray[Any]]) -> TensorIndexer:
         if isinstance(slc, slice):
             return TensorSlice(self.dimname, slc.start, slc.stop, slc.step)
-        else:
-            return SingleIndex(self.dimname, slc)
+        if hasattr(slc, '__len__'):
+            return ArrayIndex(self.dimname, slc)
+        return SingleIndex(self.dimname, slc)
         
     @property
     def dimname(self) -> str: return self._dimname
@@ -27,9 +29,19 @@ class MetaTensorSlice:
 
 
 class TensorIndexer:
+    _dimname: str
+
     @abstractmethod
     def index(self, X: XTensor) -> XTensor: ...
 
+    @property
+    def dimname(self) -> str: return self._dimname
+
+    @property
+    @abstractmethod
+    def key(self) -> Any:
+        '''The index along the dimension, as accepted by XTensor.isel'''
+
 
 class TensorSlice(TensorIndexer):
     def __init__(self, dimname: str, start, stop, step):
@@ -37,19 +49,10 @@ class TensorSlice(TensorIndexer):
         self._slice = slice(start, stop, step)
 
     def index(self, X: XTensor) -> XTensor:
-        Y = X.viewcopy()
-        axis = Y.get_axis(self._dimname)
-
-        coord = X.get_coord(axis)
-        coord = None if coord is None else coord[self._slice]
-
-        slices = [slice(None, None, None) for _ in range(X.rank)]
-        slices[axis] = self._slice
+        return X.slc(self._dimname, self._slice)
 
-        Y.data = X.data[tuple(slices)]
-
-        Y.set_coord(axis, coord=coord)
-        return Y
+    @property
+    def key(self) -> slice: return self._slice
 
 
 class SingleIndex(TensorIndexer):
@@ -60,5 +63,20 @@ class SingleIndex(TensorIndexer):
     def index(self, X: XTensor) -> XTensor:
         return X.get(self._dimname, self.ind)
 
+    @property
+    def key(self) -> int: return self.ind
+
+
+class ArrayIndex(TensorIndexer):
+    def __init__(self, dimname: str, ind: Sequence[int]|NDArray[Any]):
+        self._dimname = dimname
+        self.ind = ind
+
+    def index(self, X: XTensor) -> XTensor:
+        return X.isel({self._dimname: self.ind})
+
+    @property
+    def key(self) -> Sequence[int]|NDArray[Any]: return self.ind
+
 
 
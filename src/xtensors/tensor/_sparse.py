@@ -0,0 +1,460 @@
+from __future__ import annotations
+'''
+Sparse tensors:
+    Named tensors stored in coordinate (COO) format, i.e. an integer index
+    array of shape (rank, nnz) and a value array of shape (nnz,). Entries that
+    are not stored are zero.
+
+'''
+from functools import reduce as _reduce
+from operator import mul
+
+import numpy as np
+
+from ._base import XTensor, _index_key
+
+from . import _memory
+
+from .broadcast._broadcast import TensorBroadcastError
+
+from .basic_utils import mergedims, mergecoords, permutation_well_defined, to_xtensor
+from .basic_utils._generalize import generalize_at_0
+from .basic_utils._misc import strip, copy_sig
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+    from .typing import AxesPermutation, DimLike, TensorLike, BinaryOperator
+
+
+_SPARSE_REDUCTIONS = {
+    np.sum: np.add,
+    np.max: np.maximum,
+    np.min: np.minimum,
+}
+
+
+def inject_sparse_operator(f: Callable[[SparseXTensor], BinaryOperator[np.ndarray]]):
+    def wrapped(self: SparseXTensor, other: TensorLike, /) -> XTensor:
+        if not isinstance(other, XTensor):
+            try:
+                other = to_xtensor(other)
+            except TypeError:
+                return NotImplemented
+        return self._apply(f(self), other)
+    return wrapped
+
+
+class SparseXTensor(XTensor):
+    r"""
+    A named tensor in coordinate (COO) format. Only the nonzero entries are
+    stored, as an integer array :code:`indices` of shape :code:`(rank, nnz)` and
+    a 1D array :code:`values` of length :code:`nnz`.
+
+    Elementwise operations with scalars and dense tensors, :py:func:`xtensors.sum`,
+    :py:func:`xtensors.max`, :py:func:`xtensors.min`,
+    :py:func:`xtensors.permute`, :py:func:`xtensors.dimslast`,
+    :py:func:`xtensors.dimsfirst`, :py:meth:`get` and :py:meth:`slc` never
+    densify the tensor. Other operations require an explicit
+    :py:meth:`todense`.
+
+    """
+    def __init__(self, indices: NDArray[np.integer]|Sequence[Sequence[int]],
+        values: NDArray[Any]|Sequence[Any],
+        shape: Sequence[int],
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[Sequence[Any]|NDArray[Any]|None]]=None,
+    ) -> None:
+        """
+        :param indices: integer array of shape :code:`(rank, nnz)`, each column
+                being the (unique) index of a stored entry
+        :param values: 1D array of length :code:`nnz`
+        :param shape: shape of the (dense) tensor
+        :param dims: same as :py:class:`xtensors.XTensor`
+        :param coords: same as :py:class:`xtensors.XTensor`
+
+        """
+        self._shape: Tuple[int,...] = tuple(int(n) for n in shape)
+        self.indices: NDArray[np.intp] = np.asarray(indices, dtype=np.intp)
+        self.values: NDArray[Any] = np.asarray(values)
+
+        if self.values.ndim != 1:
+            raise ValueError(f'Values should be 1D, but received shape {self.values.shape}')
+
+        if self.indices.shape != (len(self._shape), len(self.values)):
+            raise ValueError(
+                    f'Indices of shape {self.indices.shape} do not match {len(self.values)} values '+
+                    f'for tensor with shape {self._shape}')
+
+        if self.indices.size > 0:
+            if np.any(self.indices < 0) or np.any(self.indices.max(axis=1) >= self._shape):
+                raise ValueError(f'Indices out of bounds for tensor with shape {self._shape}')
+
+        self._dim_axis_dict: Dict[str,int] = dict()
+
+        self._dims: List[str|None]
+        self._coords: List[NDArray[Any]|None]
+
+        self.set_dims(dims)
+        self.set_coords(coords)
+
+        if _memory._registry is not None: _memory._register(self)
+
+    @classmethod
+    def from_scipy(cls, matrix: Any,
+        dims: Optional[Sequence[str|None]]=None,
+        coords: Optional[Sequence[Sequence[Any]|NDArray[Any]|None]]=None,
+    ) -> SparseXTensor:
+        r"""
+        Create a 2D sparse tensor from a :code:`scipy.sparse` matrix or array.
+
+        """
+        coo = matrix.tocoo()
+        return cls(np.stack([coo.row, coo.col]), coo.data, coo.shape, dims, coords)
+
+    def to_scipy(self) -> Any:
+        r"""
+        :return: a :code:`scipy.sparse.coo_array` sharing :code:`values`
+
+        :raises: :code:`ValueError` if the tensor is not 2D
+
+        """
+        if self.rank != 2:
+            raise ValueError(f'Only 2D tensors can be converted to scipy.sparse, got rank={self.rank}')
+        from scipy import sparse
+        return sparse.coo_array((self.values, (self.indices[0], self.indices[1])), shape=self.shape)
+
+    @property
+    def data(self) -> np.ndarray:
+        raise TypeError('SparseXTensor does not hold a dense array, call todense() first')
+
+    @property
+    def shape(self) -> Tuple[int,...]:
+        return self._shape
+
+    def _buffers(self) -> List[NDArray[Any]]:
+        return [self.indices, self.values]
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored entries
+        """
+        return len(self.values)
+
+    @property
+    def density(self) -> float:
+        """
+        Fraction of stored entries, :code:`nnz / size`
+        """
+        size = _reduce(mul, self.shape, 1)
+        return self.nnz / size if size > 0 else 0.
+
+    def todense(self) -> XTensor:
+        r"""
+        :return: an :py:class:`xtensors.XTensor` with the same dims and coords
+                and a newly allocated dense array
+
+        """
+        if self.rank == 0:
+            return XTensor(np.array(self.values.sum(), dtype=self.values.dtype))
+
+        data = np.zeros(self.shape, dtype=self.values.dtype)
+        data[tuple(self.indices)] = self.values
+        return XTensor(data, self.dims, self.coords)
+
+    def tosparse(self) -> SparseXTensor:
+        return self
+
+    def viewcopy(self) -> SparseXTensor:
+        return SparseXTensor(self.indices, self.values, self.shape, self.dims, self.coords)
+
+    def item(self) -> float:
+        return self.todense().item()
+
+    def permute(self, axes: AxesPermutation) -> SparseXTensor:
+        r"""
+        Sparse counterpart of :py:func:`xtensors.permute`
+
+        """
+        if not permutation_well_defined(axes, self.rank):
+            raise ValueError(f'Invalid permutation {axes} for tensor of rank {self.rank}')
+
+        rows: List[NDArray[np.intp]] = []
+        shape: List[int] = []
+        dims: List[str|None] = []
+        coords: List[NDArray[Any]|None] = []
+
+        for axis in axes:
+            if axis is None:
+                rows.append(np.zeros(self.nnz, dtype=np.intp))
+                shape.append(1)
+                dims.append(None)
+                coords.append(None)
+            else:
+                rows.append(self.indices[axis])
+                shape.append(self.shape[axis])
+                dims.append(self.dims[axis])
+                coords.append(self.coords[axis])
+
+        indices = np.stack(rows) if rows else np.empty((0, self.nnz), dtype=np.intp)
+        return SparseXTensor(indices, self.values, shape, dims, coords)
+
+    def slc(self, dim: DimLike, slc: slice) -> SparseXTensor:
+        axis = self.get_axis(dim)
+        return self._take(axis, np.arange(self.shape[axis])[slc], slc)
+
+    def _take(self, axis: int, positions: NDArray[np.intp], key: Any) -> SparseXTensor:
+        positions = np.where(positions < 0, positions + self.shape[axis], positions)
+        newpos = np.full(self.shape[axis], -1, dtype=np.intp)
+        newpos[positions] = np.arange(len(positions))
+        if np.count_nonzero(newpos >= 0) != len(positions):
+            raise NotImplementedError('Repeated indices are not supported for SparseXTensor')
+
+        mapped = newpos[self.indices[axis]]
+        keep = mapped >= 0
+
+        indices = self.indices[:,keep]
+        indices[axis] = mapped[keep]
+
+        shape = list(self.shape)
+        shape[axis] = len(positions)
+
+        coords = list(self.coords)
+        coord = coords[axis]
+        if coord is not None:
+            coords[axis] = coord[key]
+
+        return SparseXTensor(indices, self.values[keep], shape, self.dims, coords)
+
+    def isel(self, indexers: Optional[Mapping[DimLike, Any]]=None, /, **dim_indexers: Any) -> SparseXTensor:
+        r"""
+        Same as :py:meth:`xtensors.XTensor.isel`; dimensions are indexed one
+        after another without densifying. Index arrays should not contain
+        repeated indices.
+
+        """
+        keys: Dict[int, Any] = dict()
+        for dim, key in [*(indexers or dict()).items(), *dim_indexers.items()]:
+            axis = self.get_axis(dim)
+            if axis in keys:
+                raise ValueError(f'Dimension {dim} is indexed more than once')
+            keys[axis] = _index_key(key, self.shape[axis], axis)
+
+        # from the last axis, so that removing an axis does not shift the others
+        Y = self
+        for axis in sorted(keys, reverse=True):
+            key = keys[axis]
+            if isinstance(key, np.ndarray):
+                Y = Y._take(axis, key, key)
+            elif isinstance(key, slice):
+                Y = Y.slc(axis, key)
+            else:
+                Y = Y.get(axis, key)
+        return Y
+
+    def get(self, dim: DimLike, index: int) -> SparseXTensor:
+        axis = self.get_axis(dim)
+        if index < 0: index = index + self.shape[axis]
+        if index < 0 or index >= self.shape[axis]:
+            raise IndexError(f'Index {index} out of bounds for axis {axis} with size {self.shape[axis]}')
+
+        keep = self.indices[axis] == index
+        indices = np.delete(self.indices[:,keep], axis, axis=0)
+
+        return SparseXTensor(indices, self.values[keep],
+                strip(self.shape, [axis]),
+                strip(self.dims, [axis]), strip(self.coords, [axis]))
+
+    def reduce(self, np_func: Callable[..., Any], axes: Sequence[int]) -> XTensor:
+        r"""
+        Reduce over :code:`axes` without densifying. Supported functions are
+        :code:`np.sum`, :code:`np.max` and :code:`np.min`.
+
+        :return: a :py:class:`SparseXTensor`, or a 0-d :py:class:`XTensor` if all
+                axes are reduced
+
+        """
+        try:
+            ufunc = _SPARSE_REDUCTIONS[np_func]
+        except KeyError as e:
+            raise NotImplementedError(
+                    f'{np_func.__name__} is not supported for SparseXTensor, call todense() first') from e
+
+        remaining = [axis for axis in range(self.rank) if axis not in axes]
+        shape_r = [self.shape[axis] for axis in remaining]
+        groupsize = _reduce(mul, [self.shape[axis] for axis in axes], 1)
+
+        if len(remaining) > 0:
+            keys = np.ravel_multi_index(tuple(self.indices[remaining]), shape_r)
+        else:
+            keys = np.zeros(self.nnz, dtype=np.intp)
+
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+
+        if self.nnz > 0:
+            starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+            values = ufunc.reduceat(self.values[order], starts)
+            if ufunc is not np.add:
+                # groups with implicit entries also reduce over zeros
+                counts = np.diff(np.append(starts, self.nnz))
+                values = np.where(counts < groupsize, ufunc(values, 0), values)
+            keys = keys[starts]
+        else:
+            values = self.values[:0]
+
+        dims = strip(self.dims, axes)
+        coords = strip(self.coords, axes)
+
+        if len(remaining) == 0:
+            return XTensor(np.array(values[0] if len(values) > 0 else values.dtype.type(0)), dims, coords)
+
+        indices = np.array(np.unravel_index(keys, shape_r), dtype=np.intp).reshape(len(shape_r), -1)
+        return SparseXTensor(indices, values, shape_r, dims, coords)
+
+    def _apply(self, f: BinaryOperator[np.ndarray], other: XTensor) -> XTensor:
+        dims = mergedims(list(self.dims), list(other.dims))
+        coords = mergecoords(list(self.coords), list(other.coords))
+
+        if isinstance(other, SparseXTensor):
+            return self._apply_sparse(f, other, dims, coords)
+
+        try:
+            shape = np.broadcast_shapes(self.shape, other.shape)
+        except ValueError as e:
+            raise TensorBroadcastError(
+                    f'Broadcast impossible with shapes and dims <{self.dims},{self.shape}> and <{other.dims},{other.shape}>') from e
+
+        if shape != self.shape:
+            # the sparse operand itself would have to be broadcast
+            return XTensor(f(self.todense().data, other.data), dims, coords)
+
+        _y = np.broadcast_to(other.data, self.shape)[tuple(self.indices)]
+        values = f(self.values, _y)
+
+        fill = f(np.zeros((), dtype=self.values.dtype), other.data)
+        if not np.any(fill):
+            return SparseXTensor(self.indices, values, self.shape, dims, coords)
+
+        res = np.array(np.broadcast_to(fill, self.shape))
+        res[tuple(self.indices)] = values
+        return XTensor(res, dims, coords)
+
+    def _apply_sparse(self, f: BinaryOperator[np.ndarray], other: SparseXTensor,
+            dims: List[str|None], coords: List[NDArray[Any]|None]) -> XTensor:
+
+        if self.shape != other.shape or self.rank == 0:
+            return XTensor(f(self.todense().data, other.todense().data), dims, coords)
+
+        keys_x = np.ravel_multi_index(tuple(self.indices), self.shape)
+        keys_y = np.ravel_multi_index(tuple(other.indices), other.shape)
+
+        keys, inverse = np.unique(np.concatenate([keys_x, keys_y]), return_inverse=True)
+
+        _x = np.zeros(len(keys), dtype=self.values.dtype)
+        _y = np.zeros(len(keys), dtype=other.values.dtype)
+        _x[inverse[:self.nnz]] = self.values
+        _y[inverse[self.nnz:]] = other.values
+
+        values = f(_x, _y)
+        fill = f(np.zeros((), dtype=self.values.dtype), np.zeros((), dtype=other.values.dtype))
+
+        if not np.any(fill):
+            indices = np.array(np.unravel_index(keys, self.shape), dtype=np.intp)
+            return SparseXTensor(indices, values, self.shape, dims, coords)
+
+        res = np.full(self.shape, fill)
+        res.flat[keys] = values
+        return XTensor(res, dims, coords)
+
+    def __repr__(self):
+        _repr = 'SparseTensor\n'
+        _repr += f'shape={self.shape}\n'
+        _repr += f'dims={self.dims}\n'
+        _repr += f'nnz={self.nnz}\n'
+
+        _repr += f'coords:\n'
+        for axis, coord in enumerate(self.coords):
+            if coord is None:
+                _repr += f'{axis}: None\n'
+            if coord is not None:
+                _repr += f'{axis}: {coord[0]}..{coord[-1]}\n'
+
+        _repr += f'indices={self.indices.__repr__()}\n'
+        _repr += f'values={self.values.__repr__()}'
+        return _repr
+
+    def __neg__(self) -> SparseXTensor:
+        return SparseXTensor(self.indices, -self.values, self.shape, self.dims, self.coords)
+
+    @inject_sparse_operator
+    def __add__(self): return lambda X, Y: X+Y
+
+    @inject_sparse_operator
+    def __radd__(self): return lambda X, Y: Y+X
+
+    @inject_sparse_operator
+    def __sub__(self): return lambda X, Y: X-Y
+
+    @inject_sparse_operator
+    def __rsub__(self): return lambda X, Y: Y-X
+
+    @inject_sparse_operator
+    def __mul__(self): return lambda X, Y: X*Y
+
+    @inject_sparse_operator
+    def __rmul__(self): return lambda X, Y: Y*X
+
+    @inject_sparse_operator
+    def __truediv__(self): return lambda X, Y: X/Y
+
+    @inject_sparse_operator
+    def __rtruediv__(self): return lambda X, Y: Y/X
+
+    @inject_sparse_operator
+    def __pow__(self): return lambda X, Y: X**Y
+
+    @inject_sparse_operator
+    def __rpow__(self): return lambda X, Y: Y**X
+
+    @inject_sparse_operator
+    def __eq__(self): return lambda X, Y: X==Y
+
+    @inject_sparse_operator
+    def __lt__(self): return lambda X, Y: X<Y
+
+    @inject_sparse_operator
+    def __gt__(self): return lambda X, Y: X>Y
+
+    @inject_sparse_operator
+    def __le__(self): return lambda X, Y: X<=Y
+
+    @inject_sparse_operator
+    def __ge__(self): return lambda X, Y: X>=Y
+
+    def __array__(self): return self.todense().data
+
+
+def _tosparse(X: TensorLike) -> SparseXTensor: ...
+
+@copy_sig(_tosparse)
+@generalize_at_0
+def tosparse(X: XTensor) -> SparseXTensor:
+    """
+    Convert a tensor to :py:class:`xtensors.SparseXTensor`, keeping its
+    nonzero entries.
+
+    :param X: target tensor
+
+    """
+    if isinstance(X, SparseXTensor): return X
+
+    if X.rank == 0:
+        nonzero = np.flatnonzero(X.data)
+        return SparseXTensor(np.empty((0, len(nonzero)), dtype=np.intp), X.data.reshape(1)[nonzero], ())
+
+    indices = np.nonzero(X.data)
+    return SparseXTensor(np.array(indices, dtype=np.intp), X.data[indices], X.shape, X.dims, X.coords)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+'''
+Validation levels:
+    full     -- every XTensor, including the ones derived internally from
+                other tensors, runs the checks in set_dims and set_coords
+    boundary -- tensors constructed by the user are checked; tensors derived
+                inside the library (slices, permutations, broadcast and
+                reduction results) reuse the metadata of their inputs as is
+    off      -- like boundary, and coordinates are no longer compared when
+                tensors are broadcast or stacked together
+
+'''
+from contextlib import contextmanager
+
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+    ValidationLevel = Literal['full', 'boundary', 'off']
+
+
+_LEVELS = ('full', 'boundary', 'off')
+
+_level: ValidationLevel = 'full'
+
+
+def get_validation() -> ValidationLevel:
+    """
+    :return: the current validation level
+    """
+    return _level
+
+
+def set_validation(level: ValidationLevel) -> None:
+    """
+    Set the validation level globally.
+
+    :param level: one of :code:`full` (default), :code:`boundary` or :code:`off`
+
+    """
+    global _level
+    if level not in _LEVELS:
+        raise ValueError(f'Invalid validation level: {level}, should be one of {_LEVELS}')
+    _level = level
+
+
+@contextmanager
+def validation(level: ValidationLevel) -> Iterator[None]:
+    """
+    Temporarily set the validation level, e.g.
+
+    .. code-block:: python
+
+        with xt.validation('off'):
+            for X in batches:
+                Y = xt.sum(X * W, 'feature')
+
+    The level is global to the process and not thread-local.
+
+    """
+    previous = _level
+    set_validation(level)
+    try:
+        yield
+    finally:
+        set_validation(previous)
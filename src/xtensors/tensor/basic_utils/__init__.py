@@ -2,10 +2,12 @@ from ._base import to_xtensor
 
 from ._axes import (
         permute, newdims, align, shapes_broadcastable,
-        permutation_well_defined, shape, stack, rank, index)
+        permutation_well_defined, shape, rank, index)
+
+from ._stack import stack, concat
 
 from ._dims import (
-        mergedims, flatten, dimsfirst, dimslast,
+        mergedims, flatten, unflatten, dimsfirst, dimslast,
         name_dim_if_absent, dims)
 
 from ._coords import mergecoords, coords_same
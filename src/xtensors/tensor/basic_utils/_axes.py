@@ -5,7 +5,6 @@ import numpy as np
 
 from ._generalize import generalize_at_0, generalize_at_1
 
-from ._coords import coords_same
 
 from ._misc import copy_sig
 
@@ -39,6 +38,12 @@ def permute(X: XTensor, axes: AxesPermutation) -> XTensor:
 
     """
     from .._base import XTensor
+    from .._sparse import SparseXTensor
+    from .._masked import MaskedXTensor
+    from .._categorical import CategoricalXTensor
+
+    if isinstance(X, (SparseXTensor, MaskedXTensor, CategoricalXTensor)):
+        return X.permute(axes)
 
     data_ = X.data
     axes = axes.copy()
@@ -62,8 +67,7 @@ def permute(X: XTensor, axes: AxesPermutation) -> XTensor:
 
     data_ = data_.transpose(*axes_refined)
 
-    Y = XTensor(data_, dims=newdims, coords=newcoords)
-    return Y
+    return XTensor._derive(data_, newdims, newcoords)
 
 
 def _newdims(X: TensorLike, *,
@@ -133,41 +137,18 @@ def align(X: XTensor, Y: XTensor) -> Tuple[XTensor, XTensor]:
 
     """
     if len(X.shape) > len(Y.shape):
-        return X, newdims(Y, dims=[None for _ in range(len(Y.shape), len(X.shape))])
+        return X, _pad_left(Y, len(X.shape) - len(Y.shape))
     
     if len(X.shape) < len(Y.shape):
-        return newdims(X, dims=[None for _ in range(len(X.shape), len(Y.shape))]), Y
+        return _pad_left(X, len(Y.shape) - len(X.shape)), Y
 
     return X, Y
 
 
-def stack(x: Sequence[XTensor],
-        newdim: str|None=None, 
-        position: Literal['left', 'right']='left') -> XTensor:
-    """
-    Stack a sequence of tensors along a new axis
-    
-    :param x: sequence of tensors
-    :param newdim: the name of the new dimension
-    :param position: :code:`left` or :code:`right`, where the new dimension is padded
-
-    """
+def _pad_left(X: XTensor, n: int) -> XTensor:
     from .._base import XTensor
-
-    for X in x:
-        if not X.shape == x[0].shape:
-            raise ValueError('All tensors should have the same shape for stacking')
-
-        if not X.dims == x[0].dims:
-            raise ValueError('All tensors should have the same dimension names for stacking')
-    
-        if not coords_same(list(X.coords), list(x[0].coords)):
-            raise ValueError('All tensors should have the same coordinatees for stacking')
-
-    axis = 0 if position == 'left' else -1
-    data = np.stack([X.data for X in x], axis=axis)
-
-    return XTensor(data, dims=[newdim]+list(x[0].dims), coords=[None]+list(x[0].coords))
+    _y = X.data.reshape(*[1 for _ in range(n)], *X.shape)
+    return XTensor._derive(_y, [None]*n + list(X.dims), [None]*n + list(X.coords))
 
 
 def shapes_broadcastable(a: Sequence[int], b: Sequence[int]) -> bool:
@@ -194,6 +175,11 @@ def index(X: XTensor, *indices: Tuple[DimLike, int], ignore_if_absent: bool=Fals
                             :code:`X` will be ignored without raising errors.
 
     """
+    if all(isinstance(ind[0], str) for ind in indices):
+        # named dimensions do not shift, so all indices are applied at once
+        return X.isel({ind[0]: ind[1] for ind in indices
+                       if not (ignore_if_absent and ind[0] not in X.dims)})
+
     Y = X.viewcopy()
 
     for ind in indices:
@@ -19,11 +19,11 @@ def to_xtensor(x: TensorLike) -> XTensor:
     if isinstance(x, XTensor): return x
     
     try:
-        return XTensor(x.__array__()) # type: ignore
+        return XTensor._derive(x.__array__()) # type: ignore
     except AttributeError: pass
 
     if isinstance(x, Real):
-        return XTensor(np.array(x))
+        return XTensor._derive(np.array(x))
 
     if isinstance(x, Sequence):
         return XTensor(np.array(list(x)))
@@ -2,6 +2,9 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import numpy as np
 
+from .. import _validation
+from .._lazycoord import LazyCoord
+
 if TYPE_CHECKING:
     from .._base import XTensor
     from ..typing import Coords
@@ -28,7 +31,8 @@ def mergecoords(X: XTensor|Coords, Y: XTensor|Coords, rtol: float=1e-8, atol: fl
 
     coords_y: Coords = [None for _ in range(rank_y, rank_x)] + coords_y
     
-    if not coords_same(coords_x, coords_y, rtol=rtol, atol=atol, none_compatible=True):
+    if _validation._level != 'off' and \
+            not coords_same(coords_x, coords_y, rtol=rtol, atol=atol, none_compatible=True):
         raise ValueError('Coordinates incompatible')
 
     for coord_x, coord_y in zip(coords_x, coords_y):
@@ -50,11 +54,18 @@ def coords_same(coords1: Coords, coords2: Coords, /, *,
     for coord1, coord2 in zip(coords1, coords2):
         if coord1 is None or coord2 is None: 
             condition = (coord1 is None and coord2 is None) or none_compatible
+        elif coord1 is coord2:
+            # shared by tensors derived from the same one
+            condition = True
+        elif isinstance(coord1, LazyCoord):
+            condition = coord1.equals(coord2, rtol, atol)
+        elif isinstance(coord2, LazyCoord):
+            condition = coord2.equals(coord1, rtol, atol)
         else:
             try: 
                 condition = np.allclose(coord1, coord2, rtol=rtol, atol=atol)
             except TypeError:
-                condition = (coord1 == coord2)
+                condition = len(coord1) == len(coord2) and bool(np.array_equal(coord1, coord2))
 
         if not condition: return False
 
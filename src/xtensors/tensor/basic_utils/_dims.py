@@ -92,28 +92,94 @@ def flatten(X: XTensor, /,
     :param dim_out: name of the new dimension
     :param position: :code:`left` or :code:`right`, where the new dimension is placed
 
+    If any of the flattened dimensions has coordinates, the new dimension gets
+    a :py:class:`MultiIndexCoord` of them; otherwise it has no coordinates.
+
     """
 
     from .._base import XTensor
+    from .._lazycoord import MultiIndexCoord
     x = X.data
-    # axes = [X.get_axis(dim) for dim in dims]
     axes = X.get_axes(dims)
 
     remaining_dims = [dim for axis, dim in enumerate(X.dims) if axis not in axes]
     remaining_coords = [coord for axis, coord in enumerate(X.coords) if axis not in axes]
 
-    # TODO: implement coordinate meshgrid
+    # decoded on demand instead of materializing the meshgrid
     coord_out = None
+    if any(X.coords[axis] is not None for axis in axes):
+        coord_out = MultiIndexCoord(
+                [X.dims[axis] for axis in axes],
+                [X.shape[axis] for axis in axes],
+                [X.coords[axis] for axis in axes])
 
     x_flat = xtnp.flatten(x, axes, position=position)
 
     if position == 'left':
-        Y = XTensor(x_flat, [dim_out]+remaining_dims, [coord_out] + remaining_coords)
-        return Y
+        return XTensor(x_flat, [dim_out]+remaining_dims, [coord_out] + remaining_coords)
+
+    else:
+        return XTensor(x_flat, remaining_dims+[dim_out], remaining_coords+[coord_out])
+
+
+def _unflatten(X: TensorLike, /, dim: DimLike, dims: Sequence[str|None]|None=None,
+               shape: Sequence[int]|None=None) -> XTensor: ...
+
+@copy_sig(_unflatten)
+@generalize_at_0
+def unflatten(X: XTensor, /,
+        dim: DimLike, dims: Sequence[str|None]|None=None,
+        shape: Sequence[int]|None=None) -> XTensor:
+    """
+    Split a dimension into several ones, the inverse of :py:func:`flatten`.
+    The data is reshaped in place, so the result is a view of :code:`X` when
+    its memory layout allows it.
+
+    :param X: target tensor
+    :param dim: the dimension to be split
+    :param dims: names of the new dimensions, by default those recorded in
+            the :py:class:`MultiIndexCoord` of :code:`dim`
+    :param shape: lengths of the new dimensions, one of which may be
+            :code:`-1`, by default those recorded in the
+            :py:class:`MultiIndexCoord` of :code:`dim`
+
+    The coordinates of the flattened dimensions are restored when
+    :code:`dim` has a :py:class:`MultiIndexCoord` of the same shape.
 
+    """
+    from .._base import XTensor
+    from .._lazycoord import MultiIndexCoord
+
+    axis = X.get_axis(dim)
+    coord = X.coords[axis]
+    multi = coord if isinstance(coord, MultiIndexCoord) else None
+
+    if dims is None or shape is None:
+        if multi is None:
+            raise ValueError(f'Dimension {dim} has no multi-index coordinate, '
+                             'both dims and shape should be given')
+        if dims is None: dims = multi.dims
+        if shape is None: shape = multi.component_shape
+
+    if len(dims) != len(shape):
+        raise ValueError(f'Received {len(dims)} dimensions and {len(shape)} lengths')
+
+    new_shape = X.shape[:axis] + tuple(shape) + X.shape[axis+1:]
+    try:
+        x = X.data.reshape(new_shape)
+    except ValueError:
+        raise ValueError(f'Cannot split dimension {dim} of length {X.shape[axis]} '
+                         f'into shape {tuple(shape)}') from None
+
+    shape = x.shape[axis:axis+len(dims)]
+    if multi is not None and tuple(shape) == multi.component_shape:
+        new_coords = list(multi.coords)
     else:
-        Y = XTensor(x_flat, remaining_dims+[dim_out], remaining_coords+[coord_out])
-        return Y
+        new_coords = [None] * len(dims)
+
+    return XTensor._derive(x,
+            list(X.dims[:axis]) + list(dims) + list(X.dims[axis+1:]),
+            list(X.coords[:axis]) + new_coords + list(X.coords[axis+1:]))
 
 
 def _name_dim_if_absent(
@@ -0,0 +1,189 @@
+from __future__ import annotations
+'''
+Streaming stack and concat:
+    Pieces are consumed one at a time from any iterable and written into an
+    output buffer whose leading axis grows geometrically (or is preallocated
+    from a size hint), so that the pieces and the result are never held in
+    memory twice as with np.stack on a list.
+
+'''
+import numpy as np
+
+from ._base import to_xtensor
+from ._coords import coords_same
+
+from .. import _validation
+from .._lazycoord import CategoricalCoord, RangeCoord
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Literal, Tuple
+    from numpy.typing import NDArray
+    from .._base import XTensor
+    from ..typing import DimLike, TensorLike
+
+
+class _GrowingBuffer:
+    """
+    An array whose leading axis is appended to
+    """
+    def __init__(self, first: NDArray[Any], capacity: int) -> None:
+        self.size = 0
+        self.buffer = np.empty((max(capacity, first.shape[0]),) + first.shape[1:], dtype=first.dtype)
+        self.append(first)
+
+    def append(self, x: NDArray[Any]) -> None:
+        dtype = np.result_type(self.buffer.dtype, x.dtype)
+        if dtype != self.buffer.dtype:
+            self.buffer = self.buffer.astype(dtype)
+
+        n = x.shape[0]
+        if self.size + n > self.buffer.shape[0]:
+            self._resize(max(2 * self.buffer.shape[0], self.size + n))
+
+        self.buffer[self.size:self.size+n] = x
+        self.size += n
+
+    def _resize(self, capacity: int) -> None:
+        shape = (capacity,) + self.buffer.shape[1:]
+        try:
+            # reallocates in place, without a second buffer if possible
+            self.buffer.resize(shape)
+        except ValueError:
+            # the buffer is referenced elsewhere
+            buffer = np.empty(shape, dtype=self.buffer.dtype)
+            buffer[:self.size] = self.buffer[:self.size]
+            self.buffer = buffer
+
+    def result(self) -> NDArray[Any]:
+        if self.size < self.buffer.shape[0]:
+            self._resize(self.size)
+        return self.buffer
+
+
+class _MetadataChecker:
+    """
+    Check that pieces share dimension names, shapes and coordinates, comparing
+    each distinct coordinate object only once.
+    """
+    def __init__(self, first: XTensor, skip_axis: int|None) -> None:
+        self.dims = first.dims
+        self.shape = [l for axis, l in enumerate(first.shape) if axis != skip_axis]
+        self.coords = first.coords
+        self.skip_axis = skip_axis
+        self.check_coords = _validation._level != 'off'
+        # coordinate objects already found equal to the first piece's, kept
+        # alive so that their ids are not reused
+        self._seen: Dict[int, Any] = {id(coord): coord for coord in first.coords if coord is not None}
+
+    def check(self, X: XTensor, action: str) -> None:
+        if X.dims != self.dims:
+            raise ValueError(f'All tensors should have the same dimension names for {action}, '
+                             f'received {X.dims} and {self.dims}')
+
+        shape = [l for axis, l in enumerate(X.shape) if axis != self.skip_axis]
+        if shape != self.shape:
+            raise ValueError(f'All tensors should have the same shape for {action}, '
+                             f'received {X.shape} and {tuple(self.shape)}')
+
+        if not self.check_coords: return
+
+        for axis, (coord, ref) in enumerate(zip(X.coords, self.coords)):
+            if axis == self.skip_axis or id(coord) in self._seen: continue
+            if not coords_same([coord], [ref]):
+                raise ValueError(f'All tensors should have the same coordinates for {action}')
+            if coord is not None:
+                self._seen[id(coord)] = coord
+
+
+def _concat_coords(coords: List[Any]) -> Any:
+    if any(coord is None for coord in coords): return None
+
+    if all(isinstance(coord, RangeCoord) for coord in coords):
+        joined = RangeCoord.join(coords)
+        if joined is not None: return joined
+
+    if all(isinstance(coord, CategoricalCoord) for coord in coords):
+        return CategoricalCoord.join(coords)
+
+    return np.concatenate([np.asarray(coord) for coord in coords])
+
+
+def _first(x: Iterable[TensorLike], action: str) -> Tuple[XTensor, Any]:
+    it = iter(x)
+    try:
+        return to_xtensor(next(it)), it
+    except StopIteration:
+        raise ValueError(f'No tensors to {action}') from None
+
+
+def stack(x: Iterable[TensorLike],
+        newdim: str|None=None,
+        position: Literal['left', 'right']='left', *,
+        size_hint: int|None=None) -> XTensor:
+    """
+    Stack tensors along a new axis. The tensors are consumed one by one, so
+    :code:`x` can be a generator.
+
+    :param x: iterable of tensors with the same dimension names, shapes and coordinates
+    :param newdim: the name of the new dimension
+    :param position: :code:`left` or :code:`right`, where the new dimension is padded
+    :param size_hint: the expected number of tensors, used to preallocate the result
+
+    """
+    from .._base import XTensor
+
+    first, rest = _first(x, 'stack')
+    checker = _MetadataChecker(first, None)
+
+    buffer = _GrowingBuffer(first.data[None], size_hint or 1)
+    for X in rest:
+        X = to_xtensor(X)
+        checker.check(X, 'stacking')
+        buffer.append(X.data[None])
+
+    data = buffer.result()
+
+    if position == 'left':
+        return XTensor._derive(data, [newdim] + list(first.dims), [None] + list(first.coords))
+
+    return XTensor._derive(np.moveaxis(data, 0, -1),
+            list(first.dims) + [newdim], list(first.coords) + [None])
+
+
+def concat(x: Iterable[TensorLike], dim: DimLike, *, size_hint: int|None=None) -> XTensor:
+    """
+    Concatenate tensors along an existing dimension. The tensors are consumed
+    one by one, so :code:`x` can be a generator.
+
+    :param x: iterable of tensors with the same dimension names, and the same
+            shapes and coordinates except along :code:`dim`
+    :param dim: the dimension to concatenate along
+    :param size_hint: the expected length of the result along :code:`dim`,
+            used to preallocate the result
+
+    The coordinates along :code:`dim` are concatenated if every tensor has
+    coordinates along :code:`dim`, and dropped otherwise.
+
+    """
+    from .._base import XTensor
+
+    first, rest = _first(x, 'concatenate')
+    axis = first.get_axis(dim)
+    checker = _MetadataChecker(first, axis)
+
+    coords: List[Any] = [first.coords[axis]]
+    buffer = _GrowingBuffer(np.moveaxis(first.data, axis, 0), size_hint or first.shape[axis])
+    for X in rest:
+        X = to_xtensor(X)
+        checker.check(X, 'concatenation')
+        coords.append(X.coords[axis])
+        buffer.append(np.moveaxis(X.data, axis, 0))
+
+    data = np.moveaxis(buffer.result(), 0, axis)
+
+    new_coords = list(first.coords)
+    new_coords[axis] = _concat_coords(coords)
+
+    return XTensor._derive(data, first.dims, new_coords)
@@ -12,6 +12,8 @@ from ._dimcast import unilateral_dimcast, trivial_dimcast
 
 from ._template import Template
 
+from ...instrument import instrumented
+
 
 if TYPE_CHECKING:
     from typing import Callable, Literal, Sequence, Tuple
@@ -80,6 +82,7 @@ _unilateral_broadcaster = broadcaster_wrapper(
 )
 
 @copy_sig(_unilateral_broadcaster)
+@instrumented('broadcast.unilateral')
 def unilateral_broadcaster(X: XTensor, Y: XTensor):
     """
     This broadcaster takes the second tensor and permutes its dimensions to match
@@ -96,6 +99,7 @@ _vanilla_broadcaster = broadcaster_wrapper(
 )
 
 @copy_sig(_vanilla_broadcaster)
+@instrumented('broadcast.vanilla')
 def vanilla_broadcaster(X: XTensor, Y: XTensor):
     """
     Vanilla broadcaster: the same as what's used in torch's named tensors.
@@ -111,6 +115,7 @@ def template_broadcaster(dims: Sequence[str|int], channels: Sequence[Literal['x'
 
     template = Template.from_dims_channels(dims, channels)
     
+    @instrumented('broadcast.template')
     def _broadcast(X: XTensor, Y: XTensor):
         X1 = template.cast_and_update(X, 'x')
         Y1 = template.cast_and_update(Y, 'y')
@@ -136,7 +141,13 @@ def cast(broadcaster: Broadcaster, X: XTensor, Y: XTensor|None=None):
     """
     Broadcast the second tensor with :code:`broadcaster(X, Y)`. If :code:`Y` is
     :code:`None` or not provided, a casting function is returned instead.
+
+    The result is always a plain :py:class:`xtensors.XTensor` of
+    :code:`Y.data`; subclasses carrying extra buffers (masks, categories)
+    should be unwrapped by the caller.
     """
+    from .._base import XTensor
+
     if Y is None:
         def _cast(Y1: XTensor, /):
             x, _y, dims, coords = broadcaster(X, Y1)
@@ -144,7 +155,7 @@ def cast(broadcaster: Broadcaster, X: XTensor, Y: XTensor|None=None):
             coords = [(coord if _y.shape[axis] > 1 else None) 
                     for axis, coord in enumerate(coords)]
 
-            return Y1.__class__(_y, dims, coords)
+            return XTensor._derive(_y, dims, coords)
         return _cast
     return cast(broadcaster, X)(Y)
 